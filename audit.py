@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Offline audits of stored channel history, with an exact-duplicate cache
+Histories repeat themselves ('lol', 'gg', greetings, copypasta), so every distinct text is
+scanned once with find_matches and its matches are shared by its copies. Distinct texts are
+no faster than on the per-message path; they can only be spread over a thread pool sharing
+one filter snapshot, which scales on free-threaded Python
+Run `python audit.py --file history.jsonl` to audit recorded messages
+"""
+
+import argparse
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from lexicon import Match
+from word_filter import FilterSnapshot, WordFilter
+
+# Distinct texts handed to a worker at a time
+BATCH_CHUNK_SIZE = 512
+
+
+def _scan_chunk(word_filter: WordFilter, snapshot: FilterSnapshot, texts: List[str]) -> List[List[Match]]:
+    """find_matches for each text, all with the same snapshot"""
+    return [word_filter.find_matches(text, snapshot) for text in texts]
+
+
+def scan_deduplicated(word_filter: WordFilter, messages: Iterable[str], workers: int = 1,
+               chunk_size: int = BATCH_CHUNK_SIZE) -> List[List[Match]]:
+    """
+    The matches of every message, exactly as find_matches reports them
+    Copies of a text get their own Match records, so callers may adjust them freely
+    """
+    messages = list(messages)
+    slots: Dict[str, int] = {}
+    texts = []
+    for message in messages:
+        if message not in slots:
+            slots[message] = len(texts)
+            texts.append(message)
+
+    # One snapshot for the whole audit, so words added mid-audit never split it
+    snapshot = word_filter.snapshot
+    chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+    if workers > 1 and len(chunks) > 1:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            scanned = list(pool.map(lambda chunk: _scan_chunk(word_filter, snapshot, chunk), chunks))
+    else:
+        scanned = [_scan_chunk(word_filter, snapshot, chunk) for chunk in chunks]
+    unique = [matches for chunk in scanned for matches in chunk]
+
+    results = []
+    shared = set()
+    for message in messages:
+        slot = slots[message]
+        if slot in shared:
+            results.append([Match(match.text, match.replacement, match.start, match.end, match.word, match.edits)
+                            for match in unique[slot]])
+        else:
+            shared.add(slot)
+            results.append(unique[slot])
+    return results
+
+
+def audit(word_filter: WordFilter, messages: Iterable[str], workers: int = 1,
+          chunk_size: int = BATCH_CHUNK_SIZE) -> Iterator[Tuple[int, List[Match]]]:
+    """(index, matches) for every message with at least one bad word"""
+    for index, matches in enumerate(scan_deduplicated(word_filter, messages, workers, chunk_size)):
+        if matches:
+            yield index, matches
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Audit stored messages with the word filter")
+    parser.add_argument('--file', required=True, help="messages as JSON lines with a 'content' field")
+    parser.add_argument('--workers', type=int, default=1, help="scanning threads (useful on free-threaded Python)")
+    parser.add_argument('--limit', type=int, default=20, help="flagged messages to list")
+    parser.add_argument('--json', action='store_true', help="print the report as JSON")
+    args = parser.parse_args()
+
+    with open(args.file, 'r') as f:
+        messages = [json.loads(line).get('content') or '' for line in f if line.strip()]
+
+    word_filter = WordFilter()
+    started = time.perf_counter()
+    flagged = list(audit(word_filter, messages, args.workers))
+    elapsed = time.perf_counter() - started
+
+    report = {
+        'messages': len(messages),
+        'distinct': len(set(messages)),
+        'flagged': len(flagged),
+        'seconds': elapsed,
+        'messages_per_second': len(messages) / elapsed if elapsed else 0.0,
+        'words': {},
+    }
+    for _, matches in flagged:
+        for match in matches:
+            report['words'][match.word] = report['words'].get(match.word, 0) + 1
+
+    if args.json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+        return
+
+    print("🗂️  History Audit")
+    print("=" * 60)
+    print(f"   Messages:  {report['messages']:10d}  ({report['distinct']} distinct)")
+    print(f"   Flagged:   {report['flagged']:10d}")
+    print(f"   Speed:     {report['messages_per_second']:10.0f} msg/s  ({elapsed:.2f}s)")
+    top = sorted(report['words'].items(), key=lambda item: -item[1])[:10]
+    if top:
+        print("\n🔝 Most matched words")
+        for word, count in top:
+            print(f"   {count:6d}  {word}")
+    if flagged:
+        print("\n🚩 Flagged messages")
+        for index, matches in flagged[:args.limit]:
+            print(f"   #{index}: {word_filter.rewrite(messages[index], matches)[0]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,471 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the word filter
+Run every section with `python benchmark.py` or pick some, e.g. `python benchmark.py memory`
+"""
+
+import argparse
+import json
+import os
+import random
+import resource
+import string
+import subprocess
+import sys
+import threading
+import time
+from typing import Callable, Dict, List
+
+from audit import scan_deduplicated
+from config import BAD_WORD_REPLACEMENTS
+from corpus import AMBIGUOUS_MESSAGES, CLEAN_MESSAGES, MULTICHAR_MESSAGES, PHRASE_MESSAGES, PROFANE_MESSAGES
+from expanded_word_list import ALL_EXPANDED_WORDS
+from fingerprint import FingerprintIndex
+from overlap import STRATEGIES
+from word_filter import WordFilter
+
+ENGINES = ['compiled', 'regex']
+
+
+def synthetic_lexicon(size: int, seed: int = 42) -> Dict[str, str]:
+    """Generate a reproducible word list of the given size"""
+    rng = random.Random(seed)
+    replacements = [f"replacement {i}" for i in range(50)]
+    words = {}
+    while len(words) < size:
+        word = ''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 10)))
+        words[word] = rng.choice(replacements)
+    return words
+
+
+def time_per_message(func: Callable[[str], object], messages: List[str], rounds: int) -> float:
+    """Average seconds per call of func over the messages"""
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for message in messages:
+            func(message)
+    return (time.perf_counter() - started) / (rounds * len(messages))
+
+
+def bench_throughput(args):
+    """Messages per second for each engine on the sample corpus"""
+    messages = CLEAN_MESSAGES + PROFANE_MESSAGES
+    print("\n⚡ Throughput (sample corpus)")
+    for engine in ENGINES:
+        word_filter = WordFilter(engine=engine)
+        seconds = time_per_message(word_filter.filter_message, messages, args.rounds)
+        print(f"   {engine:>10}: {seconds * 1e6:9.1f} µs/msg  {1 / seconds:10.0f} msg/s")
+
+
+def bench_early_exit(args):
+    """Boolean checks: full filter_message versus short-circuiting contains_bad_word"""
+    filler = ' '.join(CLEAN_MESSAGES)
+    long_messages = [(message + ' ' + filler * 3)[:1900] for message in PROFANE_MESSAGES]
+    print("\n🏁 Early exit (profane word near the start of ~1,900 character messages)")
+    for engine in ENGINES:
+        word_filter = WordFilter(engine=engine)
+        rounds = args.rounds if engine == 'compiled' else 1
+        full = time_per_message(lambda m: word_filter.filter_message(m)[1], long_messages, rounds)
+        short = time_per_message(word_filter.contains_bad_word, long_messages, rounds)
+        print(f"   {engine:>10}: filter_message {full * 1e6:9.1f} µs  contains_bad_word {short * 1e6:9.1f} µs  ({full / short:.1f}x)")
+
+
+def bench_overlap(args):
+    """Cost of each overlap resolution strategy and how many candidates the trie walk produces"""
+    messages = CLEAN_MESSAGES + PROFANE_MESSAGES
+    print("\n🧩 Overlap resolution (compiled engine, sample corpus)")
+    for strategy in STRATEGIES:
+        word_filter = WordFilter(engine='compiled', resolution=strategy)
+        seconds = time_per_message(word_filter.filter_message, messages, args.rounds)
+        longest = strategy == 'longest-leftmost'
+        candidates = sum(len(list(word_filter.lexicon.scan(m, longest_only=longest))) for m in messages)
+        print(f"   {strategy:>16}: {seconds * 1e6:8.1f} µs/msg  {candidates:4d} candidates")
+
+
+def bench_substitutions(args):
+    """Recall and cost of multi-character substitutions: regex alternations versus the trie transducer"""
+    messages = CLEAN_MESSAGES + MULTICHAR_MESSAGES
+    print(f"\n🔤 Multi-character substitutions ({len(MULTICHAR_MESSAGES)} messages, {len(CLEAN_MESSAGES)} clean)")
+    for engine in ENGINES:
+        word_filter = WordFilter(engine=engine)
+        recall = sum(word_filter.contains_bad_word(m) for m in MULTICHAR_MESSAGES) / len(MULTICHAR_MESSAGES)
+        false_positives = sum(word_filter.contains_bad_word(m) for m in CLEAN_MESSAGES)
+        rounds = args.rounds if engine == 'compiled' else max(1, args.rounds // 4)
+        seconds = time_per_message(word_filter.filter_message, messages, rounds)
+        print(f"   {engine:>10}: recall {recall:6.1%}  false positives {false_positives}  {seconds * 1e6:9.1f} µs/msg")
+
+
+def bench_phrases(args):
+    """Cost of enabling ALL_EXPANDED_WORDS, and recall on phrases with obfuscated gaps"""
+    messages = CLEAN_MESSAGES + PROFANE_MESSAGES
+    lexicons = [('config.py', BAD_WORD_REPLACEMENTS), ('+ expanded', {**ALL_EXPANDED_WORDS, **BAD_WORD_REPLACEMENTS})]
+    print(f"\n🧩 Phrases ({len(PHRASE_MESSAGES)} phrase messages, expanded word list on and off)")
+    for engine in ENGINES:
+        for label, words in lexicons:
+            word_filter = WordFilter(bad_words=words, engine=engine)
+            recall = sum(word_filter.contains_bad_word(m) for m in PHRASE_MESSAGES) / len(PHRASE_MESSAGES)
+            rounds = args.rounds if engine == 'compiled' else max(1, args.rounds // 4)
+            seconds = time_per_message(word_filter.filter_message, messages, rounds)
+            print(f"   {engine:>10} {label:>11} ({len(words):4d} words): phrase recall {recall:6.1%}  {seconds * 1e6:9.1f} µs/msg")
+
+
+def bench_scripts(args):
+    """Script routing: messages only pay for the partitions of the scripts they contain"""
+    word_filter = WordFilter()
+    stats = word_filter.get_statistics()
+    samples = {
+        'latin': "Kal movie dekhne chalein? The reviews say it is really good",
+        'devanagari': "कल फ़िल्म देखने चलें? सुना है समीक्षाएँ बहुत अच्छी हैं",
+        'tamil': "நாளை படம் பார்க்கப் போகலாமா? விமர்சனங்கள் நன்றாக உள்ளன",
+        'mixed': "Kal movie dekhne chalein? कल फ़िल्म देखने चलें?",
+    }
+    print(f"\n🌐 Script routing ({stats['script_partitions']} partitions, {stats['total_patterns']} words)")
+    for label, message in samples.items():
+        seconds = time_per_message(word_filter.filter_message, [message], args.rounds * 20)
+        per_100 = seconds / len(message) * 100
+        print(f"   {label:>10}: {seconds * 1e6:8.1f} µs/msg  {per_100 * 1e6:8.1f} µs per 100 characters")
+
+
+def bench_false_positives(args):
+    """False positive rate on clean messages with and without the safe phrase allow-list"""
+    messages = CLEAN_MESSAGES + AMBIGUOUS_MESSAGES
+    print(f"\n🛡️  False positives ({len(messages)} clean messages, {len(AMBIGUOUS_MESSAGES)} with harmless lexicon words)")
+    for engine in ENGINES:
+        for label, word_filter in (
+            ('allow-list off', WordFilter(engine=engine, safe_phrases=[], context_rules={})),
+            ('allow-list on', WordFilter(engine=engine)),
+        ):
+            false_positives = sum(word_filter.contains_bad_word(m) for m in messages)
+            recall = sum(word_filter.contains_bad_word(m) for m in PROFANE_MESSAGES) / len(PROFANE_MESSAGES)
+            rounds = args.rounds if engine == 'compiled' else max(1, args.rounds // 4)
+            seconds = time_per_message(word_filter.filter_message, messages, rounds)
+            print(f"   {engine:>10} {label:>14}: false positive rate {false_positives / len(messages):6.1%}  "
+                  f"recall {recall:6.1%}  {seconds * 1e6:9.1f} µs/msg")
+
+
+def bench_edits(args):
+    """Edit handling: full rescan of the new content versus the windowed incremental rescan"""
+    word_filter = WordFilter()
+    filler = ' '.join(CLEAN_MESSAGES)
+    print(f"\n✏️  Edit rescans (one word edited, window ±{word_filter.lexicon.max_span} characters)")
+    for length in (200, 1000, 1900):
+        old = (filler * 20)[:length]
+        middle = old.index(' ', length // 2)
+        new = old[:middle] + " fucking" + old[middle:]
+        old_matches = word_filter.find_matches(old)
+        expected = [tuple(match) for match in word_filter.find_matches(new)]
+        assert [tuple(match) for match in word_filter.rescan_edit(old, new, old_matches)] == expected
+
+        rounds = args.rounds * 10
+        full = time_per_message(word_filter.find_matches, [new], rounds)
+        incremental = time_per_message(lambda m: word_filter.rescan_edit(old, m, old_matches), [new], rounds)
+        print(f"   {length:5d} chars: full rescan {full * 1e6:8.1f} µs  incremental {incremental * 1e6:8.1f} µs  ({full / incremental:.1f}x)")
+
+
+def bench_fields(args):
+    """Messages with embeds and attachments: one filter_message call per field versus one scan_fields pass"""
+    word_filter = WordFilter()
+    rng = random.Random(3)
+    messages = [
+        [rng.choice(CLEAN_MESSAGES), rng.choice(CLEAN_MESSAGES), rng.choice(PROFANE_MESSAGES), 'IMG_2041.png', 'notes.txt']
+        for _ in range(50)
+    ]
+    per_field = lambda fields: [word_filter.filter_message(field) for field in fields]
+    assert all(per_field(fields) == word_filter.filter_fields(fields) for fields in messages)
+
+    print(f"\n🗂️  Multi-field scans ({len(messages[0])} fields per message: content, embed title and description, 2 filenames)")
+    separate = time_per_message(per_field, messages, args.rounds)
+    batched = time_per_message(word_filter.filter_fields, messages, args.rounds)
+    print(f"   per field {separate * 1e6:8.1f} µs/msg  scan_fields {batched * 1e6:8.1f} µs/msg  ({separate / batched:.1f}x)")
+
+
+def bench_fingerprints(args):
+    """Copypasta raids: scanning every copy versus looking copies up in the fingerprint index"""
+    word_filter = WordFilter()
+    raid = "Copy this message to every channel or your account gets banned tonight, fuck the mods " * 3
+    rng = random.Random(5)
+    copies = [raid if rng.random() < 0.5 else raid.replace("tonight", rng.choice(["today", "now", "asap"])) for _ in range(200)]
+    clean = [' '.join(rng.sample(CLEAN_MESSAGES, 3)) for _ in range(200)]
+
+    index = FingerprintIndex()
+    index.add(raid, word_filter.filter_message(raid)[0])
+    for _ in range(index.min_copies):
+        index.match(raid)
+
+    print(f"\n🧬 Fingerprints (copypasta raid of {len(raid)} characters, half of the copies edited)")
+    scanned = time_per_message(word_filter.filter_message, copies, args.rounds)
+    looked_up = time_per_message(index.match, copies, args.rounds)
+    caught = sum(index.match(copy) is not None for copy in copies)
+    print(f"   raid copies: scan {scanned * 1e6:8.1f} µs/msg  index {looked_up * 1e6:8.1f} µs/msg  "
+          f"({scanned / looked_up:.1f}x, {caught / len(copies):.0%} caught)")
+    clean_lookup = time_per_message(index.match, clean, args.rounds)
+    print(f"   clean traffic during the raid: index lookup overhead {clean_lookup * 1e6:8.1f} µs/msg")
+    stats = index.get_statistics()
+    print(f"   {stats['entries']} fingerprints, lookup p50 {stats['lookup_p50_us']:.1f} µs  p99 {stats['lookup_p99_us']:.1f} µs")
+
+
+def typo_corpus(words: List[str], seed: int = 7) -> List[str]:
+    """Messages with one random typo (transposition, vowel insertion or deletion) per word"""
+    rng = random.Random(seed)
+    messages = []
+    for word in words:
+        edit = rng.choice(['transpose', 'insert', 'delete'] if len(word) >= 5 else ['transpose', 'insert'])
+        if edit == 'transpose':
+            i = rng.randrange(1, len(word) - 1)
+            typo = word[:i] + word[i + 1] + word[i] + word[i + 2:]
+        elif edit == 'insert':
+            i = rng.randrange(2, len(word))
+            typo = word[:i] + rng.choice('aeiou') + word[i:]
+        else:
+            i = rng.randrange(1, len(word) - 1)
+            typo = word[:i] + word[i + 1:]
+        messages.append(f"honestly you are such a {typo} today")
+    return messages
+
+
+def bench_fuzzy(args):
+    """Recall on typo'd profanity versus throughput, with and without the fuzzy tier"""
+    fuzzy_filter = WordFilter(fuzzy=True)
+    lexicon = fuzzy_filter.lexicon
+    targets = sorted({lexicon.words[i] for ids in fuzzy_filter.fuzzy_index.index.values() for i in ids})
+    typos = typo_corpus(targets)
+    messages = CLEAN_MESSAGES + typos
+
+    print(f"\n🔎 Fuzzy tier ({len(typos)} typo'd messages, {len(CLEAN_MESSAGES)} clean)")
+    for label, word_filter in (('off', WordFilter(fuzzy=False)), ('on', fuzzy_filter)):
+        recall = sum(word_filter.contains_bad_word(m) for m in typos) / len(typos)
+        false_positives = sum(word_filter.contains_bad_word(m) for m in CLEAN_MESSAGES)
+        seconds = time_per_message(word_filter.filter_message, messages, max(1, args.rounds // 4))
+        print(f"   fuzzy {label:>3}: recall {recall:6.1%}  false positives {false_positives}  {seconds * 1e6:8.1f} µs/msg")
+
+
+def bench_phonetic(args):
+    """Recall on respelled romanized Hindi versus throughput, with and without the phonetic tier"""
+    spellings = [
+        'behenchod', 'bhenchod', 'bahenchod', 'bhainchod', 'maderchod', 'madharchod', 'chootiya',
+        'chhutiya', 'gaandoo', 'haraamee', 'kameena', 'lowda', 'randee', 'bhadva', 'haramkor', 'ch00t',
+    ]
+    messages = [f"abe {spelling} kya kar raha hai" for spelling in spellings]
+    phonetic_filter = WordFilter(phonetic=True)
+    stats = phonetic_filter.get_statistics()
+
+    print(f"\n🗣️  Phonetic tier ({len(messages)} respelled messages, {stats['phonetic_keys']} keys)")
+    for label, word_filter in (('off', WordFilter(phonetic=False)), ('on', phonetic_filter)):
+        recall = sum(word_filter.contains_bad_word(m) for m in messages) / len(messages)
+        false_positives = sum(word_filter.contains_bad_word(m) for m in CLEAN_MESSAGES)
+        seconds = time_per_message(word_filter.filter_message, CLEAN_MESSAGES + messages, max(1, args.rounds // 4))
+        print(f"   phonetic {label:>3}: recall {recall:6.1%}  false positives {false_positives}  {seconds * 1e6:8.1f} µs/msg")
+
+
+def _rewrite_by_concatenation(message: str, matches) -> str:
+    """The original rewrite loop: one slice-and-concatenate per match, right to left"""
+    for original, replacement, start_pos, end_pos in reversed(matches):
+        message = message[:start_pos] + replacement + message[end_pos:]
+    return message
+
+
+def bench_rewrite(args):
+    """Rewrite stage alone on spam messages with many hits near the 2,000 character limit"""
+    print("\n✍️  Rewrite stage (many-hit messages near 2,000 characters)")
+    word_filter = WordFilter()
+    for hits_per_message in (10, 50, 200):
+        chunk_size = 1990 // hits_per_message
+        chunk = ("f*ck " + "x" * chunk_size)[:chunk_size - 1] + " "
+        message = (chunk * hits_per_message)[:1990]
+        matches = word_filter._find_bad_words_in_text(message)
+        assert word_filter._rewrite(message, matches) == _rewrite_by_concatenation(message, matches)
+
+        rounds = args.rounds * 50
+        concat = time_per_message(lambda m: _rewrite_by_concatenation(m, matches), [message], rounds)
+        builder = time_per_message(lambda m: word_filter._rewrite(m, matches), [message], rounds)
+        print(f"   {len(matches):4d} hits: concatenation {concat * 1e6:8.1f} µs  segment builder {builder * 1e6:8.1f} µs  ({concat / builder:.1f}x)")
+
+
+def interpreter_mode() -> str:
+    """'free-threaded' when this interpreter runs without the GIL, otherwise 'GIL'"""
+    is_gil_enabled = getattr(sys, '_is_gil_enabled', None)
+    return 'free-threaded' if is_gil_enabled is not None and not is_gil_enabled() else 'GIL'
+
+
+def thread_counts(limit: int) -> List[int]:
+    """1, 2, 4, ... up to and including limit"""
+    counts = [1]
+    while counts[-1] * 2 < limit:
+        counts.append(counts[-1] * 2)
+    if limit > 1:
+        counts.append(limit)
+    return counts
+
+
+def bench_threads(args):
+    """
+    Scaling of one shared filter across threads: every thread filters the whole corpus,
+    so perfect scaling keeps the time flat and efficiency at 100%
+    Only a free-threaded interpreter (python3.13t and later) can scale past one core
+    """
+    messages = CLEAN_MESSAGES + PROFANE_MESSAGES
+    rounds = max(1, args.rounds // 2)
+    print(f"\n🧵 Threads ({interpreter_mode()} interpreter, {os.cpu_count()} CPUs, up to {args.threads} threads)")
+    for engine in ENGINES:
+        word_filter = WordFilter(engine=engine)
+        expected = [word_filter.filter_message(message) for message in messages]
+        baseline = None
+        for count in thread_counts(args.threads):
+            barrier = threading.Barrier(count + 1)
+            mismatches = []
+
+            def worker():
+                barrier.wait()
+                for _ in range(rounds):
+                    results = [word_filter.filter_message(message) for message in messages]
+                    if results != expected:
+                        mismatches.append(count)
+
+            threads = [threading.Thread(target=worker) for _ in range(count)]
+            for thread in threads:
+                thread.start()
+            barrier.wait()
+            started = time.perf_counter()
+            for thread in threads:
+                thread.join()
+            elapsed = time.perf_counter() - started
+
+            rate = count * rounds * len(messages) / elapsed
+            baseline = baseline or rate
+            status = '' if not mismatches else f"  ❌ {len(mismatches)} inconsistent passes"
+            print(f"   {engine:>10} x{count:<3}: {rate:10.0f} msg/s  speedup {rate / baseline:5.2f}x  "
+                  f"efficiency {rate / baseline / count:6.1%}{status}")
+
+
+def history_corpus(count: int, distinct: int = 5000, seed: int = 11) -> List[str]:
+    """
+    A channel history: distinct texts built from the sample corpus, repeated with a
+    Zipf-like skew, so a few short texts are very common and most appear once or twice
+    """
+    rng = random.Random(seed)
+    vocabulary = ' '.join(CLEAN_MESSAGES + PROFANE_MESSAGES).split()
+    pool = CLEAN_MESSAGES + PROFANE_MESSAGES + ['lol', 'gg', 'ok', 'thanks!', 'good morning']
+    while len(pool) < distinct:
+        pool.append(' '.join(rng.choice(vocabulary) for _ in range(rng.randint(2, 25))))
+    rng.shuffle(pool)
+    weights = [1 / (rank + 1) ** 1.1 for rank in range(len(pool))]
+    return rng.choices(pool, weights, k=count)
+
+
+def distinct_corpus(count: int, seed: int = 13) -> List[str]:
+    """Texts drawn like history_corpus but never repeated, so the audit has nothing to dedupe"""
+    rng = random.Random(seed)
+    vocabulary = ' '.join(CLEAN_MESSAGES + PROFANE_MESSAGES).split()
+    texts = dict.fromkeys(CLEAN_MESSAGES + PROFANE_MESSAGES)
+    while len(texts) < count:
+        texts[' '.join(rng.choice(vocabulary) for _ in range(rng.randint(2, 25)))] = None
+    return list(texts)[:count]
+
+
+def bench_audit(args):
+    """
+    Offline audit of a large history: the per-message path versus the deduplicated scan
+    Each distinct text is scanned once, so the gain on a history is the repetition in it;
+    texts scanned/s is the throughput per unique text, which only threads can raise
+    """
+    word_filter = WordFilter()
+    corpora = [
+        ('Zipf history', history_corpus(args.messages)),
+        ('all distinct', distinct_corpus(args.messages)),
+    ]
+    for label, messages in corpora:
+        unique = len(set(messages))
+        print(f"\n🗂️  Audit, {label} ({len(messages)} messages, {unique} distinct)")
+
+        started = time.perf_counter()
+        expected = [word_filter.find_matches(message) for message in messages]
+        single = time.perf_counter() - started
+        # Texts scanned per second: every message on the per-message path, each distinct text once when deduplicated
+        print(f"   {'per message':>14}: {len(messages) / single:10.0f} msg/s  {len(messages) / single:8.0f} texts scanned/s")
+
+        for workers in sorted({1, args.threads}):
+            started = time.perf_counter()
+            results = scan_deduplicated(word_filter, messages, workers)
+            elapsed = time.perf_counter() - started
+            same = all(
+                [(m.start, m.end, m.word) for m in found] == [(m.start, m.end, m.word) for m in wanted]
+                for found, wanted in zip(results, expected)
+            )
+            print(f"   {f'dedup x{workers}':>14}: {len(messages) / elapsed:10.0f} msg/s  {unique / elapsed:8.0f} texts scanned/s  "
+                  f"speedup {single / elapsed:5.1f}x  {'✅ same matches' if same else '❌ results differ'}")
+
+
+def _child_memory(engine: str, words: int):
+    """Build a filter in this (fresh) process and print its peak RSS growth as JSON"""
+    lexicon = synthetic_lexicon(words)
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    started = time.perf_counter()
+    word_filter = WordFilter(bad_words=lexicon, engine=engine)
+    if engine == 'regex':
+        word_filter.patterns  # force the lazy compile
+    build_time = time.perf_counter() - started
+    word_filter.filter_message(PROFANE_MESSAGES[0])
+    after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps({'rss_kb': after - before, 'build_time': build_time}))
+
+
+def bench_memory(args):
+    """Peak RSS growth per 10k words for each engine, each measured in a fresh process"""
+    print(f"\n🧠 Memory ({args.words} synthetic words)")
+    for engine in ENGINES:
+        result = subprocess.run(
+            [sys.executable, __file__, '--child-memory', engine, '--words', str(args.words)],
+            capture_output=True, text=True, check=True
+        )
+        report = json.loads(result.stdout.strip().splitlines()[-1])
+        per_10k = report['rss_kb'] * 10000 / args.words / 1024
+        print(f"   {engine:>10}: {per_10k:8.1f} MB peak RSS per 10k words  (build {report['build_time']:.2f}s)")
+
+
+SECTIONS = {
+    'throughput': bench_throughput,
+    'early_exit': bench_early_exit,
+    'overlap': bench_overlap,
+    'substitutions': bench_substitutions,
+    'phrases': bench_phrases,
+    'scripts': bench_scripts,
+    'false_positives': bench_false_positives,
+    'edits': bench_edits,
+    'fields': bench_fields,
+    'fingerprints': bench_fingerprints,
+    'rewrite': bench_rewrite,
+    'fuzzy': bench_fuzzy,
+    'phonetic': bench_phonetic,
+    'threads': bench_threads,
+    'audit': bench_audit,
+    'memory': bench_memory,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Word filter benchmark suite")
+    parser.add_argument('sections', nargs='*', help=f"sections to run: {', '.join(SECTIONS)} (default: all)")
+    parser.add_argument('--rounds', type=int, default=20, help="passes over the corpus for timing sections")
+    parser.add_argument('--threads', type=int, default=min(os.cpu_count() or 1, 16),
+                        help="most threads for the threads section (default: CPU count, at most 16)")
+    parser.add_argument('--messages', type=int, default=50000, help="history size for the audit section")
+    parser.add_argument('--words', type=int, default=10000, help="synthetic lexicon size for the memory section")
+    parser.add_argument('--child-memory', metavar='ENGINE', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child_memory:
+        _child_memory(args.child_memory, args.words)
+        return
+
+    unknown = [name for name in args.sections if name not in SECTIONS]
+    if unknown:
+        parser.error(f"unknown section(s): {', '.join(unknown)}")
+
+    print("🤖 Word Filter Benchmark Suite")
+    print("=" * 60)
+    for name in args.sections or SECTIONS:
+        SECTIONS[name](args)
+
+
+if __name__ == "__main__":
+    main()
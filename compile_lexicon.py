@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Lexicon compiler: merges the word sources, validates every entry and emits the compiled lexicon
+Reports entries the filter silently drops, duplicates and conflicts between sources, entries that
+another entry already covers, and the size, build time and scan cost of the result
+Run `python compile_lexicon.py` for the report, add `--output lexicon.pickle` to write the artifact
+"""
+
+import argparse
+import json
+import os
+import pickle
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+from config import BAD_WORD_REPLACEMENTS, MIN_WORD_LENGTH, USE_EXPANDED_WORDS
+from corpus import CLEAN_MESSAGES, PROFANE_MESSAGES
+from expanded_word_list import ALL_EXPANDED_WORDS
+from lexicon import Lexicon
+from phonetic import PhoneticIndex
+from word_filter import WordFilter
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Bumped whenever the pickled Lexicon layout changes
+ARTIFACT_VERSION = 1
+
+
+def load_sources(expanded: bool = False, custom_path: str = None) -> List[Tuple[str, Dict[str, str]]]:
+    """The word sources in the order the bot applies them; later sources win on conflicts"""
+    sources = [('config.py', dict(BAD_WORD_REPLACEMENTS))]
+    if expanded:
+        sources.insert(0, ('expanded_word_list.py', dict(ALL_EXPANDED_WORDS)))
+    custom_path = custom_path or os.path.join(BASE_DIR, 'custom_bad_words.json')
+    if os.path.exists(custom_path):
+        with open(custom_path, 'r') as f:
+            sources.append((os.path.basename(custom_path), json.load(f)))
+    return sources
+
+
+def merge_sources(sources: List[Tuple[str, Dict[str, str]]], min_word_length: int = MIN_WORD_LENGTH) -> Tuple[Dict[str, str], Dict[str, List]]:
+    """
+    Merge and dedupe the sources the way the bot does, collecting every problem on the way
+    Returns (merged_words, issues)
+    """
+    issues = {
+        'too_short': [],       # (word, source) the filter skips below MIN_WORD_LENGTH
+        'no_letters': [],      # (word, source) made of digits and symbols only
+        'duplicates': [],      # (word, first_source, later_source) with the same replacement
+        'conflicts': [],       # (word, first_source, later_source, old, new) with different replacements
+        'case_collisions': [], # (word, other) equal after lowercasing; only one of them is kept
+        'phrases': [],         # (phrase, source) entries spanning several words
+    }
+    merged = {}
+    origin = {}
+    lowered = {}
+    for source, words in sources:
+        for word, replacement in words.items():
+            if len(word) < min_word_length:
+                issues['too_short'].append((word, source))
+                continue
+            if not any(char.isalpha() for char in word):
+                issues['no_letters'].append((word, source))
+            if ' ' in word.strip():
+                issues['phrases'].append((word, source))
+
+            if word in merged:
+                if merged[word] == replacement:
+                    issues['duplicates'].append((word, origin[word], source))
+                else:
+                    issues['conflicts'].append((word, origin[word], source, merged[word], replacement))
+            else:
+                other = lowered.setdefault(word.lower(), word)
+                if other != word:
+                    issues['case_collisions'].append((word, other))
+            merged[word] = replacement
+            origin[word] = source
+    return merged, issues
+
+
+def find_overlaps(lexicon: Lexicon, phonetic_index: Optional[PhoneticIndex] = None) -> Dict[str, List[Tuple[str, str]]]:
+    """
+    Scan every entry with the compiled lexicon itself
+    'redundant': (entry, other) where the whole entry already reads as another word with the
+    same replacement, e.g. '5h1t' as 'shit'; removing it changes nothing
+    'mutual': (entry, other) that each read as the other with the same replacement ('ass' and
+    'azz'); either one can go, so neither is named as the redundant one
+    'variants': the same but with a different replacement, so the entry only picks the replacement
+    'contains': (entry, other) where another entry matches inside it at word boundaries
+    'unmatchable': (entry, '') that the scan does not find in its own text
+    'phonetic': (entry, other) romanized spellings stored under the same phonetic key as
+    another entry with the same replacement; only needed while PHONETIC_MATCHING is off
+    """
+    overlaps = {'redundant': [], 'mutual': [], 'variants': [], 'contains': [], 'unmatchable': [], 'phonetic': []}
+    for word_id, word in enumerate(lexicon.words):
+        replacement = lexicon.replacements[word_id]
+        found_self = False
+        for match in lexicon.scan(word):
+            if match.word == word:
+                found_self = found_self or (match.start, match.end) == (0, len(word))
+            elif (match.start, match.end) == (0, len(word)):
+                kind = 'redundant' if match.replacement == replacement else 'variants'
+                overlaps[kind].append((word, match.word))
+            else:
+                overlaps['contains'].append((word, match.word))
+        if not found_self:
+            overlaps['unmatchable'].append((word, ''))
+
+    # Two entries that cover each other are reported once as a pair, in lexicon order
+    order = {word: word_id for word_id, word in enumerate(lexicon.words)}
+    pairs = set(overlaps['redundant'])
+    overlaps['mutual'] = [
+        (word, other) for word, other in overlaps['redundant']
+        if (other, word) in pairs and order[word] < order[other]
+    ]
+    overlaps['redundant'] = [(word, other) for word, other in overlaps['redundant'] if (other, word) not in pairs]
+    if phonetic_index is not None:
+        overlaps['phonetic'] = list(phonetic_index.duplicates)
+    return overlaps
+
+
+def estimate_scan_cost(word_filter: WordFilter, rounds: int = 20) -> Dict[str, float]:
+    """Average find_matches time on the sample corpus, per message and per 100 characters"""
+    messages = CLEAN_MESSAGES + PROFANE_MESSAGES
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for message in messages:
+            word_filter.find_matches(message)
+    elapsed = time.perf_counter() - started
+    characters = sum(len(message) for message in messages) * rounds
+    return {
+        'us_per_message': elapsed / (rounds * len(messages)) * 1e6,
+        'us_per_100_chars': elapsed / characters * 100 * 1e6,
+    }
+
+
+def compile_lexicon(sources: List[Tuple[str, Dict[str, str]]], regex: bool = False) -> Tuple[WordFilter, Dict]:
+    """Merge, validate and compile the sources; returns the filter and the full report"""
+    merged, issues = merge_sources(sources)
+
+    started = time.perf_counter()
+    word_filter = WordFilter(bad_words=merged)
+    build_seconds = time.perf_counter() - started
+
+    report = {
+        'sources': {source: len(words) for source, words in sources},
+        'words': len(merged),
+        'issues': issues,
+        'overlaps': find_overlaps(word_filter.lexicon, word_filter.phonetic_index),
+        'partitions': {script: len(lexicon) for script, lexicon in word_filter.script_lexicons.items()},
+        'lexicon': word_filter.lexicon.get_statistics(),
+        'build_ms': build_seconds * 1000,
+        'scan': estimate_scan_cost(word_filter),
+    }
+    if regex:
+        # The regex engine compiles several patterns per word on first use
+        started = time.perf_counter()
+        report['regex_patterns'] = sum(len(patterns) for patterns in word_filter.patterns.values())
+        report['regex_build_ms'] = (time.perf_counter() - started) * 1000
+    return word_filter, report
+
+
+def write_artifact(word_filter: WordFilter, path: str):
+    """Pickle the compiled lexicon together with the word list it was built from"""
+    with open(path, 'wb') as f:
+        pickle.dump({
+            'version': ARTIFACT_VERSION,
+            'bad_words': dict(word_filter.bad_words),
+            'lexicon': word_filter.lexicon,
+        }, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def load_artifact(path: str) -> Lexicon:
+    """Load a compiled lexicon written by write_artifact"""
+    with open(path, 'rb') as f:
+        artifact = pickle.load(f)
+    if artifact.get('version') != ARTIFACT_VERSION:
+        raise ValueError(f"Lexicon artifact {path} has version {artifact.get('version')}, expected {ARTIFACT_VERSION}")
+    return artifact['lexicon']
+
+
+def print_report(report: Dict, verbose: bool = False):
+    """Human readable compiler report"""
+    sources = ', '.join(f"{source} {count}" for source, count in report['sources'].items())
+    print(f"\n📚 Sources: {sources}")
+    print(f"   Merged entries:    {report['words']:8d}")
+
+    labels = {
+        'too_short': f"entries shorter than {MIN_WORD_LENGTH} characters (never matched)",
+        'no_letters': "entries without any letter",
+        'duplicates': "entries duplicated across sources",
+        'conflicts': "entries with conflicting replacements",
+        'case_collisions': "entries colliding after lowercasing",
+        'phrases': "multi-word phrases",
+        'redundant': "entries already covered by another entry",
+        'mutual': "pairs of entries covering each other (keep either)",
+        'variants': "spelling variants of another entry",
+        'contains': "entries containing another entry",
+        'unmatchable': "entries that never match their own text",
+        'phonetic': "romanized spellings sharing another entry's phonetic key (needed with the tier off)",
+    }
+    print("\n🔍 Validation")
+    for group in ('issues', 'overlaps'):
+        for kind, items in report[group].items():
+            print(f"   {len(items):6d} {labels[kind]}")
+            shown = items if verbose else items[:5]
+            for item in shown:
+                print(f"            {' / '.join(str(part) for part in item if part)}")
+            if len(items) > len(shown):
+                print(f"            ... {len(items) - len(shown)} more (--verbose)")
+
+    lexicon = report['lexicon']
+    scan = report['scan']
+    print("\n📦 Compiled lexicon")
+    for script, words in report['partitions'].items():
+        print(f"   {script.capitalize() + ' partition:':19}{words:8d} words")
+    print(f"   Trie nodes:        {lexicon['nodes']:8d}")
+    print(f"   Trie edges:        {lexicon['edges']:8d}")
+    print(f"   Size:              {lexicon['bytes'] / 1024:8.1f} KB")
+    print(f"   Build time:        {report['build_ms']:8.1f} ms")
+    if 'regex_patterns' in report:
+        print(f"   Regex patterns:    {report['regex_patterns']:8d} (compiled in {report['regex_build_ms']:.0f} ms)")
+    print(f"   Scan cost:         {scan['us_per_message']:8.1f} µs/msg  ({scan['us_per_100_chars']:.1f} µs per 100 characters)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Merge, validate and compile the bad word lexicon")
+    parser.add_argument('--expanded', action='store_true', default=USE_EXPANDED_WORDS,
+                        help="include ALL_EXPANDED_WORDS from expanded_word_list.py (default: USE_EXPANDED_WORDS)")
+    parser.add_argument('--custom', help="custom word list JSON (default: custom_bad_words.json)")
+    parser.add_argument('--output', help="write the compiled lexicon artifact to this path")
+    parser.add_argument('--regex', action='store_true', help="also compile the regex engine's patterns and count them")
+    parser.add_argument('--strict', action='store_true', help="exit with status 1 on conflicts or unmatchable entries")
+    parser.add_argument('--verbose', action='store_true', help="list every flagged entry")
+    parser.add_argument('--json', action='store_true', help="print the report as JSON")
+    args = parser.parse_args()
+
+    word_filter, report = compile_lexicon(load_sources(args.expanded, args.custom), args.regex)
+    if args.json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+    else:
+        print("🛠️  Lexicon Compiler")
+        print("=" * 60)
+        print_report(report, args.verbose)
+
+    if args.output:
+        write_artifact(word_filter, args.output)
+        if not args.json:
+            print(f"\n✅ Wrote {args.output} ({os.path.getsize(args.output) / 1024:.1f} KB)")
+
+    if args.strict and (report['issues']['conflicts'] or report['overlaps']['unmatchable']):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
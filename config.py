@@ -10,8 +10,10 @@ BAD_WORD_REPLACEMENTS = {
     'fucking': 'fluffing',
     'fucked': 'fluffed',
     'fucker': 'fluffer',
+    'motherfucker': 'motherfluffer',
     'fck': 'fluff',
     'fuk': 'fluff',
+    'phuck': 'fluff',
     'fock': 'fluff',
     'fvck': 'fluff',
     
@@ -171,6 +173,21 @@ BAD_WORD_REPLACEMENTS = {
     'lanjakoduku': 'silly person',
     'rascal': 'troublemaker',
     
+    # Native script spellings; each script gets its own lexicon partition
+    # Hindi (Devanagari)
+    'मादरचोद': 'buddy', 'बहनचोद': 'friend', 'भेनचोद': 'friend', 'चूतिया': 'silly person', 'चुतिया': 'silly person',
+    'भोसड़ीके': 'friend', 'भोसडीके': 'friend', 'गांडू': 'buddy', 'गाँडू': 'buddy', 'हरामी': 'silly person',
+    'हरामखोर': 'silly person', 'कमीना': 'silly person', 'रंडी': 'friend', 'लौड़ा': 'banana', 'लंड': 'banana',
+    'चूत': 'flower', 'भड़वा': 'buddy',
+    # Punjabi (Gurmukhi)
+    'ਪੈਨਚੋਦ': 'friend', 'ਭੈਣਚੋਦ': 'friend', 'ਫੁੱਦੀ': 'flower', 'ਗਾਂਡੂ': 'buddy',
+    # Bengali
+    'মাগি': 'friend', 'খানকি': 'friend', 'বোকাচোদা': 'silly person', 'চুদবো': 'silly', 'শুয়োরের বাচ্চা': 'silly person',
+    # Tamil
+    'புண்டை': 'friend', 'தேவடியா': 'friend', 'ஓத்தா': 'friend', 'கூதி': 'friend',
+    # Telugu
+    'దెంగు': 'silly', 'లంజ': 'friend', 'లంజకొడుకు': 'silly person', 'పూకు': 'flower', 'గుద్ద': 'booty',
+    
     # ========== EXPANDED COMPREHENSIVE BAD WORDS (400+ Additional) ==========
     # Based on comprehensive online profanity databases and modern slang
     
@@ -306,20 +323,26 @@ BAD_WORD_REPLACEMENTS = {
     'molly': 'person name', 'acid': 'chemistry', 'shrooms': 'mushrooms', 'hash': 'food dish',
 }
 
-# Characters commonly used for obfuscation (including Indian romanization)
+# Also load ALL_EXPANDED_WORDS from expanded_word_list.py (entries above take precedence);
+# it includes modern slang such as 'based' and 'ratio', so review it before enabling
+USE_EXPANDED_WORDS = False
+
+# Characters commonly used for obfuscation (including Indian romanization). Letter variants of
+# another length ('ch' for 'c', 'ee' for 'i') are not followed as substitutions, they turn everyday
+# words into lexicon words; the phonetic tier reads romanized spellings instead
 OBFUSCATION_CHARS = {
     'a': ['@', '4', 'á', 'à', 'â', 'ā', 'ă', 'aa'],
     'e': ['3', 'é', 'è', 'ê', 'ē', 'ě', 'ee'],
     'i': ['1', '!', 'í', 'ì', 'î', 'ī', 'ii', 'ee'],
     'o': ['0', 'ó', 'ò', 'ô', 'ō', 'ő', 'oo', 'au'],
-    'u': ['ú', 'ù', 'û', 'ū', 'ů', 'oo', 'ou'],
+    'u': ['ú', 'ù', 'û', 'ū', 'ů', 'oo'],
     's': ['5', '$', 'š', 'ss', 'z'],
     't': ['7', '+', 'th', 'tt'],
     'l': ['1', '|', 'll'],
     'g': ['9', '6', 'gh', 'gg'],
     'c': ['(', '<', 'ch', 'k', 'ck'],
     'k': ['|<', 'c', 'ck', 'kh'],
-    'n': ['|\|', 'nn', 'nh'],
+    'n': ['|\\|', 'nn', 'nh'],
     'b': ['8', '|3', 'bh', 'bb'],
     'd': ['|)', 'dh', 'dd'],
     'f': ['|=', 'ph', 'ff'],
@@ -351,7 +374,79 @@ SEPARATORS = ['.', '-', '_', '*', ' ', '|', '/', '\\', '+', '=', '~', '^']
 
 # Bot configuration
 WEBHOOK_CACHE_SIZE = 50  # Maximum number of webhooks to cache
+EDIT_SCAN_CACHE_SIZE = 5000  # Recent messages whose matches are kept for edit rescans
+
+# Nickname and username filtering needs the privileged members intent
+FILTER_MEMBER_NAMES = False
+MAX_NICKNAME_LENGTH = 32  # Discord limit
 LOG_LEVEL = 'INFO'  # Logging level
+INTERACTION_DEADLINE = 3  # seconds Discord waits for a slash command to acknowledge its interaction
+
+# Matching engine: 'compiled' walks a compact trie of the lexicon,
+# 'regex' runs the original per-word regex patterns
+FILTER_ENGINE = 'compiled'
+
+# How overlapping matches are settled: 'first', 'longest-leftmost', 'priority' or 'most-specific'
+OVERLAP_RESOLUTION = 'longest-leftmost'
+
+# Optional per-word priorities for the 'priority' strategy (higher wins, default 0)
+WORD_PRIORITIES = {
+    'motherfucker': 10,
+    'fucking': 5,
+    'asshole': 5,
+}
+
+# Fuzzy matching tier for typos like 'fukc' or 'shiet' (off by default, it adds scan time)
+FUZZY_MATCHING = False
+FUZZY_TIME_BUDGET_MS = 2  # per message, the tier stops early once it is spent
+
+# Lexicon words containing one of these roots get fuzzy variants; fuzzing everyday
+# words like 'pig' or 'trash' would mostly produce false positives
+FUZZY_ROOTS = [
+    'fuck', 'shit', 'bitch', 'cunt', 'dick', 'asshole', 'bastard', 'whore', 'slut',
+    'nigg', 'fagg', 'madarchod', 'behanchod', 'chutiya', 'bhosad', 'gandu', 'randi',
+    'penchod', 'harami', 'kamina'
+]
+
+# Phonetic tier for romanized Indian languages: each entry containing one of these roots is
+# stored under a spelling-independent key, so 'bhenchod', 'behanchod' and 'bahenchod' all match
+# one entry. 'sala' and 'sali' are left out, their keys collide with 'salah' and 'sally'
+# Common variants ('gaandu', 'chutia') keep their own entries, so turning the tier off only
+# loses the rarer respellings
+PHONETIC_MATCHING = True
+PHONETIC_ROOTS = [
+    'chod', 'chut', 'chud', 'gand', 'lund', 'laud', 'randi', 'bhos', 'bhad', 'haram',
+    'hij', 'kutt', 'gadha', 'pagal', 'kamin', 'kamee', 'badma', 'phudd', 'pench', 'punda',
+    'koothi', 'ommala', 'deng', 'lanj',
+]
+
+# Known-safe phrases containing a bad word; a match inside one of them is left alone
+SAFE_PHRASES = [
+    'moby dick', 'dick tracy', 'bloody mary', "hell's kitchen", 'hell or high water',
+    'crack a smile', 'crack a joke', 'crack an egg', 'crack the code', 'crack the case',
+    'pot of gold', 'pot of tea', 'pot of coffee', 'pot luck', 'pot roast',
+    'hash brown', 'hash browns', 'hash table', 'hash map', 'hash function',
+    'coke zero', 'diet coke', 'weed the garden', 'stick figure', 'stick shift',
+    'pig latin', 'guinea pig', 'killer whale', 'blue whale', 'holy cow', 'cash cow',
+    'folic acid', 'amino acid', 'acid rain', 'giant panda', 'gentle giant',
+]
+
+# Per-word context rules: a bad word is left alone right after one of its 'before'
+# words or right before one of its 'after' words (e.g. 'cooking pot', 'pot plant')
+CONTEXT_RULES = {
+    'pot': {'before': ['cooking', 'coffee', 'tea', 'flower', 'crock', 'melting', 'honey', 'soup', 'stock'],
+            'after': ['plant', 'belly', 'hole', 'pie', 'lid', 'noodle', 'noodles']},
+    'crack': {'before': ['wise'], 'after': ['open', 'down', 'on', 'up', 'jokes', 'of']},
+    'hash': {'before': ['sha', 'crypto', 'corned', 'password', 'file'], 'after': ['tag', 'tags', 'key', 'code', 'value']},
+    'coke': {'before': ['cherry', 'vanilla'], 'after': ['can', 'bottle', 'float', 'machine']},
+    'weed': {'before': ['sea', 'garden'], 'after': ['killer', 'whacker', 'control', 'out']},
+    'stick': {'before': ['hockey', 'glue', 'walking', 'drum', 'memory', 'usb', 'pogo', 'joy', 'chop'],
+              'after': ['to', 'with', 'around', 'together', 'insect']},
+    'nuts': {'before': ['pine', 'cashew', 'mixed', 'salted', 'roasted', 'wing'], 'after': ['and bolts']},
+    'acid': {'before': ['lactic', 'citric', 'stomach', 'battery', 'nucleic'], 'after': ['reflux', 'test']},
+    'cow': {'before': ['dairy', 'sacred', 'mad'], 'after': ['milk', 'bell', 'herd']},
+    'pig': {'before': ['pot-bellied', 'roast', 'suckling'], 'after': ['farm', 'iron', 'pen']},
+}
 
 # Regex flags for case-insensitive matching
 REGEX_FLAGS = 'IGNORECASE'
@@ -363,9 +458,25 @@ MIN_WORD_LENGTH = 3
 MAX_MESSAGE_LENGTH = 2000
 
 # Rate limiting settings
-MAX_MESSAGES_PER_MINUTE = 60
+MAX_MESSAGES_PER_MINUTE = 60  # per author; past it their flagged messages are only deleted
 WEBHOOK_RATE_LIMIT_DELAY = 1  # seconds between webhook requests
 
+# Flood protection: past this many reposts a channel switches to flood mode for a while,
+# and flagged messages are deleted without a webhook repost
+FLOOD_CHANNEL_REPOSTS_PER_MINUTE = 30
+FLOOD_MODE_SECONDS = 60
+FLOOD_ACTION = 'purge'  # 'purge' bulk deletes flagged messages in batches, 'delete' deletes them one by one
+FLOOD_PURGE_DELAY = 2  # seconds flagged messages are collected before a bulk purge
+FLOOD_SWEEP_INTERVAL = 60  # seconds between sweeps of idle rate limit buckets
+
+# Duplicate spam: flagged messages are fingerprinted so copies are actioned without a rescan
+FINGERPRINT_ENABLED = True
+FINGERPRINT_WINDOW_SECONDS = 600  # fingerprints not seen again within this are forgotten
+FINGERPRINT_MAX_ENTRIES = 5000
+FINGERPRINT_MIN_SIMILARITY = 0.6  # estimated shingle overlap (Jaccard) for a near duplicate
+FINGERPRINT_MIN_LENGTH = 40  # shorter messages are only matched as exact copies
+FINGERPRINT_MIN_COPIES = 3  # copies of a flagged message before near duplicates are deleted unscanned
+
 # Channel types to monitor (excludes DMs)
 MONITORED_CHANNEL_TYPES = [
     'text',
@@ -374,3 +485,38 @@ MONITORED_CHANNEL_TYPES = [
     'private_thread',
     'news_thread'
 ]
+
+# Hot reload settings (word tables and JSON lists are reloaded without a restart)
+HOT_RELOAD_ENABLED = True
+HOT_RELOAD_INTERVAL = 5  # seconds between file change checks
+HOT_RELOAD_FILES = ['config.py', 'custom_bad_words.json', 'whitelist.json']
+
+# Dry run: log what would be filtered without deleting or reposting anything
+DRY_RUN = False
+
+# Shadow mode: a candidate filter runs next to the active one on a sample of messages,
+# in a worker thread, and only records disagreements and latency deltas
+SHADOW_MODE_ENABLED = False
+SHADOW_FILTER_OPTIONS = {'engine': 'regex'}  # WordFilter keyword arguments for the candidate
+SHADOW_SAMPLE_RATE = 0.05  # fraction of messages compared
+SHADOW_MAX_PENDING = 32  # comparisons in flight before new samples are skipped
+SHADOW_LOG_FILE = 'shadow_log.jsonl'
+
+# Cross-message detection of words spelled out one fragment per message ('f', 'u', 'c', 'k')
+SPLIT_DETECTION_ENABLED = True
+SPLIT_MAX_FRAGMENT_LENGTH = 4  # longer messages are regular messages and end any fragment run
+SPLIT_WINDOW_MESSAGES = 8  # fragments kept per channel and author
+SPLIT_TTL_SECONDS = 30  # fragments older than this no longer join up
+SPLIT_MAX_BUFFERS = 10000  # channel/author buffers kept before the least recently used is dropped
+# Everyday short replies; a run made only of these is conversation ('go', 'ok' is not 'gook')
+SPLIT_COMMON_FRAGMENTS = [
+    'a', 'i', 'k', 'u', 'ok', 'kk', 'gg', 'go', 'no', 'so', 'ya', 'ye', 'yo', 'oh', 'ah', 'hi', 'ty', 'np',
+    'ez', 'gl', 'hf', 'wp', 'me', 'is', 'it', 'on', 'in', 'to', 'at', 'up', 'we', 'he', 'do', 'an', 'or',
+    'my', 'ur', 'lol', 'yes', 'yep', 'nah', 'hey', 'idk', 'omg', 'brb', 'afk', 'the', 'and', 'not', 'you',
+]
+
+# Retroactive history sweeps (/sweep_history): flagged messages already in a channel are deleted, not reposted
+SWEEP_CHECKPOINT_FILE = 'sweep_checkpoints.json'  # progress per channel, so a restart resumes sweeps
+SWEEP_PAGE_SIZE = 100  # messages fetched and scanned per history request
+SWEEP_MAX_CHANNELS = 2  # channels swept at the same time
+SWEEP_DELETES_PER_MINUTE = 20  # delete requests per guild, leaving the live filter its share
@@ -0,0 +1,99 @@
+"""
+Sample messages shared by the benchmark suite and tests
+"""
+
+# Everyday chat that should pass through the filter untouched
+CLEAN_MESSAGES = [
+    "This is a normal message",
+    "Good morning everyone, hope you slept well",
+    "Can someone share the notes from class today?",
+    "The meeting got moved to 3pm, see you there",
+    "Namaste, how are you doing today?",
+    "I just finished reading that book you recommended",
+    "Does anyone know a good pizza place around here?",
+    "We won the match 3-1, what a game",
+    "Please check the pinned message for the rules",
+    "Happy birthday! Have an amazing day",
+    "My cat keeps knocking things off the table lol",
+    "The new update fixed the lag issues for me",
+    "Anyone up for a round of chess later?",
+    "Tu kaisa hai bhai, sab theek?",
+    "Thanks for the help with my homework yesterday",
+    "Let's meet at the site",
+    "I cut my hand on a sheet of paper",
+    "We met on the net",
+    "Great speech today",
+    "Bob and the tot were at the wedding, what a cad he was",
+    "Don't choke, it's only a coot",
+]
+
+# Messages with plain and obfuscated profanity in English and Indian languages
+PROFANE_MESSAGES = [
+    "What the fuck is going on?",
+    "What the f*ck is happening?",
+    "That's f.u.c.k.i.n.g awesome!",
+    "This sh1t is crazy",
+    "Don't be such a b-i-t-c-h",
+    "F U C K this situation",
+    "Holy sh*t that's amazing",
+    "What a d@mn good day",
+    "Stop being so b1tchy",
+    "That's fuuuuucking incredible",
+    "FuCk ThIs CrAp",
+    "What the h3ll is that?",
+    "Tu madarchod hai yaar",
+    "Don't be such a r@ndi",
+    "That guy is such a g@@ndu",
+    "Har4mi insaan hai",
+    "Such a b@dm@@sh person",
+    "Kutta kamina hai wo",
+    "What a pench0d guy",
+    "Bhosadi ke bacche",
+]
+
+# Profanity written with multi-character substitutions ('|=' for 'f', '|)' for 'd', ...)
+MULTICHAR_MESSAGES = [
+    "|=uck off",
+    "kami|\\|a hai",
+    "b|-|osadike",
+    "ma|)archod",
+    "what a |)ick move",
+    "|<utta kahin ka",
+    "tu gandu hai",
+]
+
+# Multi-word phrases from the expanded word list, with the gaps between tokens obfuscated
+PHRASE_MESSAGES = [
+    "he said blow your load lol",
+    "blow_your_load",
+    "Blow.Your.Load",
+    "bl0w y0ur l0ad",
+    "maa-ka-bhosada",
+    "ullu  ka  pattha",
+    "that camel toe though",
+    "barely.legal content",
+]
+
+# Clean messages that contain a lexicon word in a harmless sense (the Scunthorpe problem)
+AMBIGUOUS_MESSAGES = [
+    "Leave the soup pot on the stove",
+    "We are doing a pot luck on Friday",
+    "Finally managed to crack the code",
+    "Use a hash table for constant time lookups",
+    "Grab me a coke zero from the fridge",
+    "I'm reading Moby Dick for class",
+    "Can you weed the garden this weekend?",
+    "Season four of Hell's Kitchen was the best",
+    "Ordered hash browns with my eggs",
+    "Crack a smile, it's Friday",
+    "A sacred cow of the team is the standup",
+    "Bring some mixed nuts for the trip",
+    "The guinea pig escaped again",
+    "Stick to the plan and we will be fine",
+    "Killer whale sightings are up this year",
+    "Folic acid is in most multivitamins",
+    "There's a pot of gold at the end of the rainbow",
+    "Let's crack on with the meeting",
+    "He drew a stick figure on the whiteboard",
+    "My grandma makes a great pot roast",
+]
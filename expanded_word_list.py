@@ -167,5 +167,6 @@ MODERN_SLANG = {
 # Combine all expanded words
 ALL_EXPANDED_WORDS = {**EXPANDED_BAD_WORDS, **MODERN_SLANG}
 
-print(f"Total expanded words: {len(ALL_EXPANDED_WORDS)}")
-print(f"Sample words: {list(ALL_EXPANDED_WORDS.keys())[:20]}")
\ No newline at end of file
+if __name__ == "__main__":
+    print(f"Total expanded words: {len(ALL_EXPANDED_WORDS)}")
+    print(f"Sample words: {list(ALL_EXPANDED_WORDS.keys())[:20]}")
\ No newline at end of file
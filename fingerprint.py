@@ -0,0 +1,183 @@
+"""
+Duplicate-spam fingerprinting
+Flagged messages are indexed by a hash of their normalized content and by a bottom-k MinHash
+sketch of their character shingles, so copies of a copypasta raid are actioned without a rescan
+"""
+
+import heapq
+import re
+import time
+import zlib
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Set
+
+from config import (
+    FINGERPRINT_WINDOW_SECONDS, FINGERPRINT_MAX_ENTRIES, FINGERPRINT_MIN_SIMILARITY, FINGERPRINT_MIN_LENGTH,
+    FINGERPRINT_MIN_COPIES
+)
+from lexicon import fold_case
+from metrics import LatencyTracker
+from normalization import fold_confusables
+
+SHINGLE_LENGTH = 5
+SKETCH_SIZE = 32
+
+WORD_RE = re.compile(r'\w+')
+
+
+def normalize(content: str) -> str:
+    """Fold look-alikes and case and keep only the words, single spaced"""
+    folded, _ = fold_confusables(content)
+    return ' '.join(WORD_RE.findall(fold_case(folded)))
+
+
+def sketch(normalized: str) -> List[int]:
+    """
+    Bottom-k MinHash sketch: the smallest shingle hashes of the normalized text
+    CRC32 rather than hash(), so sketches do not depend on the process's hash seed
+    """
+    encoded = normalized.encode()
+    shingles = {zlib.crc32(encoded[i:i + SHINGLE_LENGTH]) for i in range(len(encoded) - SHINGLE_LENGTH + 1)}
+    return heapq.nsmallest(SKETCH_SIZE, shingles or {zlib.crc32(encoded)})
+
+
+def similarity(first: List[int], second: List[int]) -> float:
+    """Estimated Jaccard similarity of the shingle sets behind two sketches"""
+    first_set, second_set = set(first), set(second)
+    union = heapq.nsmallest(SKETCH_SIZE, first_set | second_set)
+    return sum(value in first_set and value in second_set for value in union) / len(union)
+
+
+class Fingerprint:
+    """A flagged message kept in the index"""
+    __slots__ = ('key', 'sketch', 'content', 'filtered', 'copies', 'seen')
+
+    def __init__(self, key: int, sketch: List[int], content: str, filtered: str, seen: float):
+        self.key = key
+        self.sketch = sketch
+        self.content = content
+        self.filtered = filtered
+        self.copies = 0
+        self.seen = seen
+
+
+class FingerprintIndex:
+    """Time-windowed, size-bounded index of flagged messages for exact and near-duplicate lookups"""
+
+    def __init__(self, window: Optional[float] = None, max_entries: Optional[int] = None,
+                 min_similarity: Optional[float] = None, min_length: Optional[int] = None,
+                 min_copies: Optional[int] = None, clock: Callable[[], float] = time.monotonic):
+        self.window = window or FINGERPRINT_WINDOW_SECONDS
+        self.max_entries = max_entries or FINGERPRINT_MAX_ENTRIES
+        self.min_similarity = min_similarity or FINGERPRINT_MIN_SIMILARITY
+        self.min_length = min_length or FINGERPRINT_MIN_LENGTH
+        self.min_copies = min_copies or FINGERPRINT_MIN_COPIES
+        self.clock = clock
+
+        # Normalized content hash -> Fingerprint, least recently seen first
+        self.entries: OrderedDict = OrderedDict()
+        # Sketch value -> keys of the raids (entries seen min_copies times) whose sketch holds it
+        self.raids: Dict[int, Set[int]] = {}
+        self.lexicon = None
+        self.lookup_latency = LatencyTracker(size=1000)
+        self.exact_hits = 0
+        self.near_hits = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def _count_copy(self, entry: Fingerprint):
+        """Count one more copy of an entry; at min_copies it joins the raid index"""
+        entry.copies += 1
+        if entry.copies == self.min_copies:
+            for value in entry.sketch:
+                self.raids.setdefault(value, set()).add(entry.key)
+
+    def _forget(self, entry: Fingerprint):
+        """Remove an evicted entry from the raid index"""
+        if entry.copies < self.min_copies:
+            return
+        for value in entry.sketch:
+            keys = self.raids.get(value)
+            if keys is not None:
+                keys.discard(entry.key)
+                if not keys:
+                    del self.raids[value]
+
+    def _sweep(self, now: float):
+        """Drop entries not seen within the window; they sit at the front of the LRU order"""
+        while self.entries:
+            entry = next(iter(self.entries.values()))
+            if now - entry.seen <= self.window:
+                break
+            self._forget(self.entries.popitem(last=False)[1])
+
+    def reset(self, lexicon=None):
+        """Forget every fingerprint; results are only valid for the lexicon that produced them"""
+        self.entries.clear()
+        self.raids.clear()
+        self.lexicon = lexicon
+
+    def match(self, content: str) -> Optional[Fingerprint]:
+        """
+        Find a flagged message this content copies
+        An entry with the same content is an exact copy and carries its filtered text. Near copies
+        (same normalized text, or similar shingles) are only returned for messages of at least
+        min_length characters copying a message seen min_copies times, i.e. a raid; while no raid
+        is going on a lookup is a single hash
+        """
+        started = time.perf_counter()
+        now = self.clock()
+        self._sweep(now)
+        found = None
+        normalized = normalize(content)
+        long_enough = len(normalized) >= self.min_length
+        entry = self.entries.get(hash(normalized))
+        if entry is None and long_enough and self.raids:
+            values = sketch(normalized)
+            candidates = set()
+            for value in values:
+                candidates.update(self.raids.get(value, ()))
+            entry = max(
+                (self.entries[key] for key in candidates),
+                key=lambda candidate: similarity(candidate.sketch, values), default=None
+            )
+            if entry is not None and similarity(entry.sketch, values) < self.min_similarity:
+                entry = None
+
+        if entry is not None:
+            self._count_copy(entry)
+            entry.seen = now
+            self.entries.move_to_end(entry.key)
+            if entry.content == content:
+                self.exact_hits += 1
+                found = entry
+            elif long_enough and entry.copies > self.min_copies:
+                self.near_hits += 1
+                found = entry
+        self.lookup_latency.record(time.perf_counter() - started)
+        return found
+
+    def add(self, content: str, filtered: str):
+        """Index a message the filter flagged, with its filtered text"""
+        normalized = normalize(content)
+        key = hash(normalized)
+        if key in self.entries:
+            return
+        entry = self.entries[key] = Fingerprint(key, sketch(normalized), content, filtered, self.clock())
+        self._count_copy(entry)
+        if len(self.entries) > self.max_entries:
+            self._forget(self.entries.popitem(last=False)[1])
+
+    def get_statistics(self) -> Dict[str, float]:
+        """Index size, hit counts and lookup latency"""
+        latency = self.lookup_latency.summary()
+        return {
+            'entries': len(self.entries),
+            'raids': sum(entry.copies >= self.min_copies for entry in self.entries.values()),
+            'lookups': latency['count'],
+            'exact_hits': self.exact_hits,
+            'near_hits': self.near_hits,
+            'lookup_p50_us': latency['p50_ms'] * 1000,
+            'lookup_p99_us': latency['p99_ms'] * 1000,
+        }
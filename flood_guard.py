@@ -0,0 +1,131 @@
+"""
+Flood and raid protection
+Token buckets per author (messages) and per channel (webhook reposts) decide when the bot
+stops reposting flagged messages and only deletes them, one by one or in bulk purges
+"""
+
+import logging
+import time
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+from config import (
+    MAX_MESSAGES_PER_MINUTE, FLOOD_CHANNEL_REPOSTS_PER_MINUTE, FLOOD_MODE_SECONDS, FLOOD_ACTION,
+    FLOOD_SWEEP_INTERVAL
+)
+
+logger = logging.getLogger(__name__)
+
+FLOOD_ACTIONS = ('delete', 'purge')
+
+
+class TokenBuckets:
+    """Token buckets keyed by id, stored as (tokens, last_update) pairs in one dict"""
+
+    def __init__(self, per_minute: float, burst: Optional[float] = None):
+        self.capacity = float(burst or per_minute)
+        self.refill = per_minute / 60.0  # tokens per second
+        self.buckets: Dict[Hashable, Tuple[float, float]] = {}
+
+    def __len__(self) -> int:
+        return len(self.buckets)
+
+    def take(self, key: Hashable, now: float) -> bool:
+        """Take one token from the key's bucket; False when it is empty"""
+        tokens, updated = self.buckets.get(key, (self.capacity, now))
+        tokens = min(self.capacity, tokens + (now - updated) * self.refill)
+        if tokens < 1.0:
+            self.buckets[key] = (tokens, now)
+            return False
+        self.buckets[key] = (tokens - 1.0, now)
+        return True
+
+    def sweep(self, now: float):
+        """Drop buckets that have refilled completely; a missing bucket reads as full"""
+        idle = self.capacity / self.refill
+        for key in [key for key, (_, updated) in self.buckets.items() if now - updated >= idle]:
+            del self.buckets[key]
+
+
+class FloodGuard:
+    """Decides per message whether the bot can afford the full delete and repost"""
+
+    def __init__(self, user_rate: Optional[float] = None, channel_rate: Optional[float] = None,
+                 flood_seconds: Optional[float] = None, action: Optional[str] = None,
+                 sweep_interval: Optional[float] = None, clock: Callable[[], float] = time.monotonic):
+        self.users = TokenBuckets(user_rate or MAX_MESSAGES_PER_MINUTE)
+        self.channels = TokenBuckets(channel_rate or FLOOD_CHANNEL_REPOSTS_PER_MINUTE)
+        self.flood_seconds = flood_seconds or FLOOD_MODE_SECONDS
+        self.action = action or FLOOD_ACTION
+        if self.action not in FLOOD_ACTIONS:
+            raise ValueError(f"Unknown flood action {self.action!r}, expected one of {FLOOD_ACTIONS}")
+        self.sweep_interval = sweep_interval or FLOOD_SWEEP_INTERVAL
+        self.clock = clock
+
+        # channel or author id -> time its flood mode ends
+        self.flooded_channels: Dict[int, float] = {}
+        self.flooded_authors: Dict[int, float] = {}
+        # channel_id -> flagged messages waiting for the next bulk purge
+        self.pending: Dict[int, List] = {}
+        self.last_sweep = clock()
+        self.cheap_actions = 0
+        self.floods = 0
+
+    def _flood(self, flooded: Dict[int, float], key: int, now: float, what: str):
+        """Start or extend flood mode for a channel or an author"""
+        if flooded.get(key, 0.0) <= now:
+            self.floods += 1
+            logger.warning(f"Flood mode on for {what} {key}: flagged messages are deleted without a repost")
+        flooded[key] = now + self.flood_seconds
+
+    def _sweep(self, now: float):
+        """Forget idle buckets and ended floods, at most once per sweep interval"""
+        if now - self.last_sweep < self.sweep_interval:
+            return
+        self.last_sweep = now
+        self.users.sweep(now)
+        self.channels.sweep(now)
+        for flooded in (self.flooded_channels, self.flooded_authors):
+            for key in [key for key, until in flooded.items() if until <= now]:
+                del flooded[key]
+
+    def observe(self, author_id: int):
+        """Count a message against its author's bucket; call once per incoming message"""
+        now = self.clock()
+        self._sweep(now)
+        if not self.users.take(author_id, now):
+            self._flood(self.flooded_authors, author_id, now, "author")
+
+    def allow_repost(self, channel_id: int, author_id: int) -> bool:
+        """Whether a flagged message gets the full delete and repost; takes a channel token if so"""
+        now = self.clock()
+        if self.flooded_channels.get(channel_id, 0.0) > now or self.flooded_authors.get(author_id, 0.0) > now:
+            self.cheap_actions += 1
+            return False
+        if not self.channels.take(channel_id, now):
+            self._flood(self.flooded_channels, channel_id, now, "channel")
+            self.cheap_actions += 1
+            return False
+        return True
+
+    def queue_purge(self, channel_id: int, message) -> bool:
+        """Queue a flagged message for the channel's next bulk purge; True when a purge must be scheduled"""
+        batch = self.pending.setdefault(channel_id, [])
+        batch.append(message)
+        return len(batch) == 1
+
+    def take_purge(self, channel_id: int) -> List:
+        """The messages queued for a channel's bulk purge"""
+        return self.pending.pop(channel_id, [])
+
+    def get_statistics(self) -> Dict[str, int]:
+        """Current tracking sizes and flood counters"""
+        now = self.clock()
+        return {
+            'tracked_authors': len(self.users),
+            'tracked_channels': len(self.channels),
+            'flooded_channels': sum(until > now for until in self.flooded_channels.values()),
+            'flooded_authors': sum(until > now for until in self.flooded_authors.values()),
+            'floods': self.floods,
+            'cheap_actions': self.cheap_actions,
+            'pending_purge': sum(len(batch) for batch in self.pending.values()),
+        }
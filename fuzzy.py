@@ -0,0 +1,135 @@
+"""
+Fuzzy matching tier for typos and novel spellings the trie walk misses (e.g. 'fukc', 'shiet')
+Uses a SymSpell-style deletion index over a subset of the lexicon with a bounded edit budget
+"""
+
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from lexicon import Lexicon, Match, VOWELS, fold_case
+
+# Shortest lexicon word that gets fuzzy variants; shorter ones collide with too many real words
+MIN_FUZZY_LENGTH = 4
+
+
+def _deletes(word: str) -> Set[str]:
+    """The word itself plus every string one deletion away from it"""
+    return {word} | {word[:i] + word[i + 1:] for i in range(len(word))}
+
+
+def within_one_edit(token: str, word: str) -> bool:
+    """
+    Check whether token is one restricted edit away from word
+    Allowed edits keep the first letter: an adjacent transposition ('fukc'), a vowel or
+    doubled letter inserted past the second letter ('shiet'), or, for words of five or
+    more letters, an interior deletion ('fuckng'). Substitutions are left to the trie.
+    """
+    if token == word or token[0] != word[0]:
+        return False
+
+    if len(token) == len(word):
+        diffs = [i for i in range(len(word)) if token[i] != word[i]]
+        return (
+            len(diffs) == 2 and diffs[1] == diffs[0] + 1
+            and token[diffs[0]] == word[diffs[1]] and token[diffs[1]] == word[diffs[0]]
+        )
+
+    if len(token) == len(word) + 1:
+        for i in range(2, len(token) - 1):
+            inserted = token[i]
+            if token[:i] + token[i + 1:] == word:
+                return inserted in VOWELS or inserted == token[i - 1] or inserted == token[i + 1]
+        return False
+
+    if len(token) == len(word) - 1 and len(word) >= 5:
+        return any(word[:i] + word[i + 1:] == token for i in range(1, len(word) - 1))
+
+    return False
+
+
+def letter_tokens(folded: str, letters: Dict[str, str]) -> Iterator[Tuple[str, int, int]]:
+    """
+    Yield (token, start, end) for every run of letters and unambiguous leet characters,
+    with the leet characters read as their letter
+    """
+    start = None
+    chars = []
+    for pos, char in enumerate(folded + ' '):
+        letter = char if char.isalpha() else letters.get(char)
+        if letter is not None:
+            if start is None:
+                start = pos
+                chars = []
+            chars.append(letter)
+        elif start is not None:
+            yield ''.join(chars), start, pos
+            start = None
+
+
+class FuzzyIndex:
+    """Deletion index from one-deletion variants to the fuzzable lexicon words"""
+
+    def __init__(self, lexicon: Lexicon, roots: Iterable[str]):
+        """Index every lexicon word that contains one of the roots"""
+        roots = [root.lower() for root in roots]
+        self.lexicon = lexicon
+        self.index: Dict[str, List[int]] = {}
+
+        for word_id, word in enumerate(lexicon.words):
+            if len(word) < MIN_FUZZY_LENGTH or not word.isalpha():
+                continue
+            if not any(root in word for root in roots):
+                continue
+            for variant in _deletes(word):
+                self.index.setdefault(variant, []).append(word_id)
+
+        word_lengths = [len(lexicon.words[i]) for ids in self.index.values() for i in ids]
+        self.min_length = MIN_FUZZY_LENGTH
+        self.max_length = max(word_lengths, default=0) + 1
+        self.first_letters = frozenset(lexicon.words[i][0] for ids in self.index.values() for i in ids)
+
+        # Symbols and digits with exactly one letter reading ('@' -> 'a', '0' -> 'o', ...)
+        self.letters = {
+            char: letters for char, letters in lexicon.substitutions.items() if len(letters) == 1
+        }
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def lookup(self, token: str) -> Optional[int]:
+        """Return the word id the token is a restricted one-edit variant of, if any"""
+        for variant in _deletes(token):
+            for word_id in self.index.get(variant, ()):
+                if within_one_edit(token, self.lexicon.words[word_id]):
+                    return word_id
+        return None
+
+    def scan(self, text: str, covered: List[Match], budget: float,
+             start: int = 0, stop: Optional[int] = None) -> Iterator[Match]:
+        """
+        Yield fuzzy matches for tokens that the exact pass did not already cover
+        Stops early once budget seconds have been spent on this message
+        With start/stop only tokens starting in text[start:stop] are considered
+        """
+        deadline = time.perf_counter() + budget
+        folded = fold_case(text)
+        words, replacements = self.lexicon.words, self.lexicon.replacements
+        spans = [(match.start, match.end) for match in covered]
+        window_start, window_stop = start, len(folded) if stop is None else stop
+
+        for token, start, end in letter_tokens(folded, self.letters):
+            if start < window_start:
+                continue
+            if start >= window_stop:
+                return
+            # Cheap prefilter: plausible length, a known first letter, not already matched
+            if not self.min_length <= len(token) <= self.max_length or token[0] not in self.first_letters:
+                continue
+            if any(start < span_end and span_start < end for span_start, span_end in spans):
+                continue
+            if time.perf_counter() > deadline:
+                return
+
+            word_id = self.lookup(token)
+            if word_id is not None:
+                yield Match(text[start:end], replacements[word_id], start, end, words[word_id], 1)
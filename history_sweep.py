@@ -0,0 +1,242 @@
+"""
+Retroactive sweeps of channel history
+Words added with /add_bad_word only apply to new messages. A sweep pages back through a
+channel's history, scans every page with the audit scanner and deletes the flagged messages in
+rate limited bulk deletes. Progress is checkpointed to a JSON file after every page, so a
+sweep interrupted by a restart picks up where it stopped
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from datetime import timedelta
+from typing import Callable, Dict, List, Optional
+
+import discord
+
+from audit import scan_deduplicated
+from config import (
+    DRY_RUN, SWEEP_CHECKPOINT_FILE, SWEEP_PAGE_SIZE, SWEEP_MAX_CHANNELS, SWEEP_DELETES_PER_MINUTE
+)
+from flood_guard import TokenBuckets
+
+logger = logging.getLogger(__name__)
+
+# Discord only bulk deletes messages younger than 14 days, at most 100 per request
+BULK_DELETE_MAX_AGE = timedelta(days=14)
+BULK_DELETE_LIMIT = 100
+
+
+class HistorySweeper:
+    """Runs and checkpoints history sweeps, a limited number of channels at a time"""
+
+    def __init__(self, bot, checkpoint_path: Optional[str] = None, page_size: Optional[int] = None,
+                 max_channels: Optional[int] = None, deletes_per_minute: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.bot = bot
+        self.checkpoint_path = checkpoint_path or SWEEP_CHECKPOINT_FILE
+        self.page_size = page_size or SWEEP_PAGE_SIZE
+        self.clock = clock
+        # Delete requests per guild, shared by all its sweeps so live filtering keeps its share
+        self.deletes = TokenBuckets(deletes_per_minute or SWEEP_DELETES_PER_MINUTE)
+        self._slots = asyncio.Semaphore(max_channels or SWEEP_MAX_CHANNELS)
+
+        # channel_id -> running sweep task, None while the sweep is still starting
+        self.tasks: Dict[int, Optional[asyncio.Task]] = {}
+        # str(channel_id) -> checkpoint, exactly as stored in the checkpoint file
+        self.checkpoints: Dict[str, Dict] = self.load_checkpoints()
+
+    def load_checkpoints(self) -> Dict[str, Dict]:
+        """Checkpoints left by earlier runs"""
+        if not os.path.exists(self.checkpoint_path):
+            return {}
+        try:
+            with open(self.checkpoint_path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not load sweep checkpoints from {self.checkpoint_path}: {e}")
+            return {}
+
+    def _write(self, data: str):
+        """Replace the checkpoint file in one step, so a crash never leaves half a file"""
+        temp_path = f"{self.checkpoint_path}.tmp"
+        with open(temp_path, 'w') as f:
+            f.write(data)
+        os.replace(temp_path, self.checkpoint_path)
+
+    async def save_checkpoints(self):
+        """Write the checkpoints from a worker thread; they are serialized on the loop first"""
+        data = json.dumps(self.checkpoints, indent=2)
+        try:
+            await asyncio.to_thread(self._write, data)
+        except OSError as e:
+            logger.error(f"Could not save sweep checkpoints: {e}")
+
+    def is_running(self, channel_id: int) -> bool:
+        return channel_id in self.tasks
+
+    async def start(self, channel, days: Optional[int] = None) -> bool:
+        """
+        Start sweeping a channel, newest messages first; with days only that far back
+        Returns False when the channel is already being swept
+        """
+        if self.is_running(channel.id):
+            return False
+        # Claim the channel before the first await, so a concurrent start sees it as running
+        self.tasks[channel.id] = None
+        after = None
+        if days:
+            after = discord.utils.time_snowflake(discord.utils.utcnow() - timedelta(days=days))
+        self.checkpoints[str(channel.id)] = {
+            'guild_id': channel.guild.id,
+            'channel_id': channel.id,
+            'channel': channel.name,
+            'before': None,  # oldest message id swept so far
+            'after': after,  # sweep stops at this message id
+            'scanned': 0,
+            'flagged': 0,
+            'deleted': 0,
+            'seconds': 0.0,
+            'done': False,
+        }
+        try:
+            await self.save_checkpoints()
+        except BaseException:
+            del self.tasks[channel.id]
+            raise
+        self._launch(channel)
+        return True
+
+    def resume(self) -> int:
+        """Restart the unfinished sweeps of earlier runs; returns how many were restarted"""
+        resumed = 0
+        for checkpoint in self.checkpoints.values():
+            if checkpoint['done'] or self.is_running(checkpoint['channel_id']):
+                continue
+            channel = self.bot.get_channel(checkpoint['channel_id'])
+            if channel is None:
+                logger.warning(f"Cannot resume sweep of channel {checkpoint['channel_id']}: channel not found")
+                continue
+            self._launch(channel)
+            resumed += 1
+        if resumed:
+            logger.info(f"Resumed {resumed} history sweeps from {self.checkpoint_path}")
+        return resumed
+
+    def stop(self, channel_id: int) -> bool:
+        """Cancel a running sweep; its checkpoint stays, so it resumes on the next restart"""
+        task = self.tasks.get(channel_id)
+        if task is None:
+            # Not running, or still starting; a starting sweep is not cancelled halfway
+            return False
+        task.cancel()
+        return True
+
+    def _launch(self, channel):
+        self.tasks[channel.id] = asyncio.create_task(self.sweep(channel))
+
+    async def sweep(self, channel):
+        """Page through a channel's history from its checkpoint, one page per checkpoint"""
+        checkpoint = self.checkpoints[str(channel.id)]
+        try:
+            async with self._slots:
+                logger.info(f"Sweeping history of {channel.name} from message {checkpoint['before'] or 'latest'}")
+                while not checkpoint['done']:
+                    started = self.clock()
+                    page = await self.fetch_page(channel, checkpoint)
+                    if page:
+                        flagged = await self.scan_page(page)
+                        checkpoint['deleted'] += await self.delete_flagged(channel, flagged)
+                        checkpoint['before'] = min(message.id for message in page)
+                        checkpoint['scanned'] += len(page)
+                        checkpoint['flagged'] += len(flagged)
+                    checkpoint['done'] = len(page) < self.page_size
+                    checkpoint['seconds'] += self.clock() - started
+                    await self.save_checkpoints()
+            report = self.report(checkpoint)
+            logger.info(
+                f"Swept {channel.name}: {report['scanned']} messages, {report['flagged']} flagged, "
+                f"{report['deleted']} deleted ({report['messages_per_second']:.0f} msg/s)"
+            )
+        except asyncio.CancelledError:
+            logger.info(f"Stopped sweep of {channel.name} at message {checkpoint['before']}")
+            raise
+        except discord.HTTPException as e:
+            logger.error(f"Sweep of {channel.name} failed, it resumes from its checkpoint on restart: {e}")
+        finally:
+            self.tasks.pop(channel.id, None)
+
+    async def fetch_page(self, channel, checkpoint: Dict) -> List:
+        """The next page of history, newest first, below the checkpoint"""
+        before = discord.Object(id=checkpoint['before']) if checkpoint['before'] else None
+        after = discord.Object(id=checkpoint['after']) if checkpoint['after'] else None
+        return [
+            message async for message in
+            channel.history(limit=self.page_size, before=before, after=after, oldest_first=False)
+        ]
+
+    async def scan_page(self, page: List) -> List:
+        """The messages of a page the filter flags, scanned in a worker thread"""
+        messages = [message for message in page if self.bot.should_filter(message)]
+        results = await asyncio.to_thread(
+            scan_deduplicated, self.bot.word_filter, [message.content for message in messages]
+        )
+        return [message for message, matches in zip(messages, results) if matches]
+
+    async def _take_delete(self, guild_id: int):
+        """Wait for a delete request from the guild's budget"""
+        while not self.deletes.take(guild_id, self.clock()):
+            await asyncio.sleep(1.0 / self.deletes.refill)
+
+    async def delete_flagged(self, channel, messages: List) -> int:
+        """Bulk delete the flagged messages, one by one past the bulk delete age; returns how many went"""
+        if not messages:
+            return 0
+        if DRY_RUN:
+            logger.info(f"[dry run] Would delete {len(messages)} flagged messages from the history of {channel.name}")
+            return 0
+
+        cutoff = discord.utils.utcnow() - BULK_DELETE_MAX_AGE
+        recent = [message for message in messages if message.created_at > cutoff]
+        old = [message for message in messages if message.created_at <= cutoff]
+        deleted = 0
+        for i in range(0, len(recent), BULK_DELETE_LIMIT):
+            batch = recent[i:i + BULK_DELETE_LIMIT]
+            await self._take_delete(channel.guild.id)
+            try:
+                await channel.delete_messages(batch)
+                deleted += len(batch)
+            except discord.HTTPException as e:
+                logger.error(f"Could not bulk delete flagged history in {channel.name}: {e}")
+        for message in old:
+            await self._take_delete(channel.guild.id)
+            try:
+                await message.delete()
+                deleted += 1
+            except discord.NotFound:
+                pass
+            except discord.HTTPException as e:
+                logger.error(f"Could not delete flagged history in {channel.name}: {e}")
+        return deleted
+
+    def report(self, checkpoint: Dict) -> Dict:
+        """Progress and throughput of one sweep"""
+        seconds = checkpoint['seconds']
+        return {
+            'channel': checkpoint['channel'],
+            'running': self.is_running(checkpoint['channel_id']),
+            'done': checkpoint['done'],
+            'scanned': checkpoint['scanned'],
+            'flagged': checkpoint['flagged'],
+            'deleted': checkpoint['deleted'],
+            'messages_per_second': checkpoint['scanned'] / seconds if seconds else 0.0,
+        }
+
+    def get_statistics(self, guild_id: Optional[int] = None) -> List[Dict]:
+        """Reports of every sweep on record, optionally for one guild only"""
+        return [
+            self.report(checkpoint) for checkpoint in self.checkpoints.values()
+            if guild_id is None or checkpoint['guild_id'] == guild_id
+        ]
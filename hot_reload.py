@@ -0,0 +1,193 @@
+"""
+Hot reload of the word tables and JSON lists without restarting the bot
+Watches config.py, custom_bad_words.json and whitelist.json, builds a new WordFilter
+in a worker thread, validates it against a smoke corpus and swaps it in atomically
+"""
+
+import asyncio
+import importlib.util
+import json
+import logging
+import os
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+from config import HOT_RELOAD_INTERVAL, HOT_RELOAD_FILES
+from expanded_word_list import ALL_EXPANDED_WORDS
+from word_filter import WordFilter
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Messages every rebuilt filter must leave untouched
+SMOKE_CLEAN_MESSAGES = [
+    "Hello everyone, welcome to the server!",
+    "Good morning! The meeting starts at 10am.",
+    "Can someone share the notes from class today?",
+    "Namaste, kaise ho aap sab?",
+    "I scored 42 points in the last round, gg",
+]
+
+# (message, word) pairs that must be flagged as long as the word is still in the lexicon
+SMOKE_PROFANE_MESSAGES = [
+    ("What the fuck is going on?", 'fuck'),
+    ("This sh1t is crazy", 'shit'),
+    ("Don't be such a b-i-t-c-h", 'bitch'),
+    ("Tu madarchod hai yaar", 'madarchod'),
+    ("FuCk ThIs CrAp", 'crap'),
+]
+
+
+def load_config_tables(path: Optional[str] = None) -> Dict:
+    """
+    Execute config.py into a fresh module object and return its word tables
+    The imported config module is left untouched so running code keeps a consistent view
+    """
+    path = path or os.path.join(BASE_DIR, 'config.py')
+    spec = importlib.util.spec_from_file_location('_config_reload', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    bad_words = dict(module.BAD_WORD_REPLACEMENTS)
+    if getattr(module, 'USE_EXPANDED_WORDS', False):
+        bad_words = {**ALL_EXPANDED_WORDS, **bad_words}
+
+    return {
+        'bad_words': bad_words,
+        'obfuscation_chars': module.OBFUSCATION_CHARS,
+        'separators': module.SEPARATORS,
+        'priorities': dict(module.WORD_PRIORITIES),
+        'safe_phrases': list(module.SAFE_PHRASES),
+        'context_rules': dict(module.CONTEXT_RULES)
+    }
+
+
+def validate_filter(word_filter: WordFilter) -> List[str]:
+    """
+    Run the smoke corpus through a freshly built filter
+    Returns a list of failure descriptions (empty when the filter is healthy)
+    """
+    failures = []
+
+    for message in SMOKE_CLEAN_MESSAGES:
+        if word_filter.contains_bad_word(message):
+            failures.append(f"clean message was filtered: {message!r} -> {word_filter.filter_message(message)[0]!r}")
+
+    for message, word in SMOKE_PROFANE_MESSAGES:
+        if word not in word_filter.bad_words:
+            continue
+        if not word_filter.contains_bad_word(message):
+            failures.append(f"'{word}' was not detected in {message!r}")
+
+    return failures
+
+
+class FilterReloader:
+    def __init__(self, bot, interval: float = HOT_RELOAD_INTERVAL, files: Optional[List[str]] = None,
+                 base_dir: str = BASE_DIR):
+        """Watch the word list files of a running bot and reload its filter on change"""
+        self.bot = bot
+        self.interval = interval
+        self.base_dir = base_dir
+        self.paths = [os.path.join(base_dir, name) for name in (files or HOT_RELOAD_FILES)]
+        self.mtimes = self._read_mtimes()
+        self.reload_count = 0
+        self.last_error = None
+        # Held by reloads and by every change the bot makes to its lists, so a reload never
+        # swaps in lists read from disk while a slash command is changing them
+        self.lock = asyncio.Lock()
+
+    def _read_mtimes(self, paths: Optional[List[str]] = None) -> Dict[str, Optional[float]]:
+        """Get the modification time of every watched file (None if missing)"""
+        mtimes = {}
+        for path in paths or self.paths:
+            try:
+                mtimes[path] = os.stat(path).st_mtime_ns
+            except OSError:
+                mtimes[path] = None
+        return mtimes
+
+    def changed_files(self) -> List[str]:
+        """Return the watched files that changed since the last check"""
+        current = self._read_mtimes()
+        changed = [path for path, mtime in current.items() if self.mtimes.get(path) != mtime]
+        self.mtimes = current
+        return changed
+
+    def mark_written(self, *names: str):
+        """
+        Record the bot's own writes to watched files, so they do not trigger a reload
+        The bot wrote them from the lists it already runs with
+        """
+        written = [path for path in self.paths if os.path.basename(path) in names]
+        self.mtimes.update(self._read_mtimes(written))
+
+    def build_filter(self) -> Tuple[WordFilter, Dict[str, str], Optional[Set[int]], float]:
+        """
+        Load every source from disk and compile a new filter (runs in a worker thread)
+        Returns (word_filter, custom_bad_words, whitelist, build_seconds)
+        """
+        started = time.perf_counter()
+        tables = load_config_tables(os.path.join(self.base_dir, 'config.py'))
+
+        custom_bad_words = {}
+        custom_path = os.path.join(self.base_dir, 'custom_bad_words.json')
+        if os.path.exists(custom_path):
+            with open(custom_path, 'r') as f:
+                custom_bad_words = json.load(f)
+        tables['bad_words'].update(custom_bad_words)
+
+        # An empty or half-written whitelist keeps the current one instead of failing the reload
+        whitelist = None
+        whitelist_path = os.path.join(self.base_dir, 'whitelist.json')
+        if os.path.exists(whitelist_path):
+            try:
+                with open(whitelist_path, 'r') as f:
+                    whitelist = set(json.load(f))
+            except ValueError as e:
+                logger.warning(f"Keeping current whitelist, could not parse whitelist.json: {e}")
+
+        word_filter = WordFilter(**tables)
+        failures = validate_filter(word_filter)
+        if failures:
+            raise ValueError(f"smoke test failed: {'; '.join(failures)}")
+
+        return word_filter, custom_bad_words, whitelist, time.perf_counter() - started
+
+    async def reload(self) -> bool:
+        """Rebuild the filter off the event loop and swap it in if it validates"""
+        async with self.lock:
+            try:
+                word_filter, custom_bad_words, whitelist, build_time = await asyncio.to_thread(self.build_filter)
+            except Exception as e:
+                self.last_error = str(e)
+                logger.error(f"Hot reload failed, keeping current filter: {e}")
+                return False
+
+            # Plain reference assignments with no await in between, so on_message
+            # always sees either the old or the new filter, never a mix
+            swap_started = time.perf_counter()
+            self.bot.word_filter = word_filter
+            self.bot.custom_bad_words = custom_bad_words
+            if whitelist is not None:
+                self.bot.whitelist = whitelist
+            swap_time = time.perf_counter() - swap_started
+
+            self.reload_count += 1
+            self.last_error = None
+            logger.info(
+                f"Hot reloaded word filter with {len(word_filter.bad_words)} bad words: "
+                f"build {build_time * 1000:.1f}ms, swap {swap_time * 1000000:.1f}µs"
+            )
+            return True
+
+    async def run(self):
+        """Poll the watched files forever and reload when any of them changes"""
+        logger.info(f"Watching {len(self.paths)} files for changes every {self.interval}s")
+        while True:
+            await asyncio.sleep(self.interval)
+            changed = self.changed_files()
+            if changed:
+                logger.info(f"Detected changes in {', '.join(os.path.basename(p) for p in changed)}")
+                await self.reload()
@@ -0,0 +1,349 @@
+"""
+Compact lexicon store for the word filter
+Keeps the bad word list as an array-backed trie with interned replacement strings
+and scans messages by walking the trie, instead of running several regexes per word
+"""
+
+import sys
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from scripts import WORD_MARKS
+
+# Vowels that may be stretched in messages (e.g. 'fuuuck', 'shiiit')
+VOWELS = 'aeiou'
+
+# Upper bound on how many message characters a single lexicon character may span
+# (the character itself plus separators and stretched vowels around it)
+MAX_SPAN_PER_CHAR = 4
+
+# Terminal markers: no word ends at the node, or an allow-listed safe phrase does
+NO_WORD = -1
+SAFE = -2
+
+# Trie label between the tokens of a multi-word phrase; in a message it matches any run
+# of separators and whitespace, so 'blow your load' also matches 'blow_your.load'
+PHRASE_GAP = ' '
+WHITESPACE = frozenset(' \t\n\r')
+
+# Size of the Unicode code space, used to pack (node, char) build-time edges into one int
+CODEPOINTS = 0x110000
+
+
+class Match:
+    """A bad word found in a message"""
+    __slots__ = ('text', 'replacement', 'start', 'end', 'word', 'edits')
+
+    def __init__(self, text: str, replacement: str, start: int, end: int, word: str, edits: int = 0):
+        self.text = text
+        self.replacement = replacement
+        self.start = start
+        self.end = end
+        self.word = word
+        self.edits = edits  # Character substitutions needed to read the text as the word
+
+    def __iter__(self):
+        """Unpack as (original_word, replacement, start_pos, end_pos)"""
+        return iter((self.text, self.replacement, self.start, self.end))
+
+    def __repr__(self) -> str:
+        return f"Match({self.text!r} -> {self.replacement!r}, {self.start}:{self.end}, word={self.word!r})"
+
+
+def fold_case(text: str) -> str:
+    """Lowercase text without changing its length, so positions stay valid"""
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    # A few characters (e.g. 'İ') lowercase to several; keep those as they are
+    return ''.join(ch if len(ch.lower()) != 1 else ch.lower() for ch in text)
+
+
+def is_word_char(char: str) -> bool:
+    """Letters, digits and the combining marks written on them (Indic vowel signs)"""
+    return char.isalnum() or char in WORD_MARKS
+
+
+def is_respelling(variant: str, grapheme: str) -> bool:
+    """
+    A variant that is itself a spelling in letters of another length ('ch' for 'c', 'ee' for 'i')
+    Reading those as substitutions turns everyday words into lexicon words ('cut' into 'chut',
+    'sheet' into 'shit'), so both engines only follow variants with symbols, digits or one letter
+    """
+    return len(variant) != len(grapheme) and variant.isalpha() and grapheme.isalpha()
+
+
+def expand_context_rules(context_rules: Dict[str, Dict[str, List[str]]]) -> List[str]:
+    """Turn per-word context rules into the safe phrases they describe"""
+    phrases = []
+    for word, rule in context_rules.items():
+        phrases.extend(f"{before} {word}" for before in rule.get('before', ()))
+        phrases.extend(f"{word} {after}" for after in rule.get('after', ()))
+    return phrases
+
+
+class Lexicon:
+    """Array-backed trie over the bad word list"""
+    __slots__ = (
+        'words', 'replacements', 'edge_offsets', 'edge_labels', 'edge_targets',
+        'terminals', 'substitutions', 'rules', 'separators', 'start_chars', 'max_length', 'max_span',
+        'gaps', 'safe_count'
+    )
+
+    def __init__(self, bad_words: Dict[str, str], obfuscation_chars: Dict[str, List[str]],
+                 separators: List[str], min_word_length: int = 1, safe_phrases: Iterable[str] = ()):
+        """
+        Build the trie and substitution tables from the word list
+        Safe phrases share the trie, so the scan finds them in the same pass as bad words
+        Multi-word entries are stored as their tokens joined by PHRASE_GAP edges, so phrases
+        are matched token by token in the same walk as single words
+        """
+        words = []
+        replacements = []
+        # Build-time edges live in one flat dict keyed by node * CODEPOINTS + ord(char),
+        # which is far smaller than a dict per node
+        edges = {}
+        terminals = array('i', [NO_WORD])
+
+        def insert(key: str) -> int:
+            node = 0
+            for char in key:
+                edge = node * CODEPOINTS + ord(char)
+                child = edges.get(edge)
+                if child is None:
+                    child = len(terminals)
+                    edges[edge] = child
+                    terminals.append(NO_WORD)
+                node = child
+            return node
+
+        max_length = 0
+        for bad_word, replacement in bad_words.items():
+            key = PHRASE_GAP.join(bad_word.lower().split())
+            if len(key) < min_word_length:
+                continue
+
+            node = insert(key)
+            # Keys that collide after lowercasing keep the first replacement
+            if terminals[node] != NO_WORD:
+                continue
+            terminals[node] = len(words)
+            words.append(sys.intern(key))
+            replacements.append(sys.intern(replacement))
+            max_length = max(max_length, len(key))
+
+        safe_count = 0
+        for phrase in safe_phrases:
+            node = insert(PHRASE_GAP.join(phrase.lower().split()))
+            # A phrase that is itself a bad word stays a bad word
+            if terminals[node] == NO_WORD:
+                terminals[node] = SAFE
+                safe_count += 1
+                max_length = max(max_length, len(phrase))
+
+        # Flatten into CSR arrays: the edges of node n are
+        # edge_labels[edge_offsets[n]:edge_offsets[n + 1]] with matching edge_targets
+        edge_offsets = array('I', [0]) * (len(terminals) + 1)
+        labels = []
+        edge_targets = array('I')
+        for edge in sorted(edges):
+            node, code = divmod(edge, CODEPOINTS)
+            labels.append(chr(code))
+            edge_targets.append(edges[edge])
+            edge_offsets[node + 1] += 1
+        del edges
+        for node in range(len(terminals)):
+            edge_offsets[node + 1] += edge_offsets[node]
+
+        self.words = tuple(words)
+        self.replacements = tuple(replacements)
+        self.edge_offsets = edge_offsets
+        self.edge_labels = ''.join(labels)
+        self.edge_targets = edge_targets
+        self.terminals = terminals
+
+        # Substitution transducer: message sequence -> lexicon sequence it can stand for,
+        # indexed by the first message character. Both sides may be several characters
+        # long, e.g. '|)' -> 'd' and '0' -> 'oo' as well as '@' -> 'a'
+        rules = {}
+        for grapheme, variants in obfuscation_chars.items():
+            grapheme = grapheme.lower()
+            for variant in variants:
+                variant = variant.lower()
+                if variant and variant != grapheme and not is_respelling(variant, grapheme):
+                    rules.setdefault(variant[0], set()).add((variant, grapheme))
+        self.rules = {char: tuple(sorted(pairs)) for char, pairs in rules.items()}
+
+        # Single message character -> lexicon letters it can stand for (e.g. '@' -> 'a')
+        substitutions = {}
+        for char, pairs in self.rules.items():
+            letters = ''.join(lexicon_seq for text_seq, lexicon_seq in pairs if len(text_seq) == len(lexicon_seq) == 1)
+            if letters:
+                substitutions[char] = letters
+        self.substitutions = substitutions
+        self.separators = frozenset(separators)
+        self.gaps = self.separators | WHITESPACE
+
+        root_labels = self.edge_labels[edge_offsets[0]:edge_offsets[1]]
+        self.start_chars = frozenset(root_labels) | frozenset(
+            char for char, pairs in self.rules.items() if any(lexicon_seq[0] in root_labels for _, lexicon_seq in pairs)
+        )
+        self.safe_count = safe_count
+        self.max_length = max_length
+        self.max_span = self.max_length * MAX_SPAN_PER_CHAR
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def lookup(self, word: str) -> int:
+        """Return the word id of an exact lexicon entry, or -1"""
+        offsets, labels, targets = self.edge_offsets, self.edge_labels, self.edge_targets
+        node = 0
+        for char in PHRASE_GAP.join(word.lower().split()):
+            index = labels.find(char, offsets[node], offsets[node + 1])
+            if index < 0:
+                return NO_WORD
+            node = targets[index]
+        return max(self.terminals[node], NO_WORD)
+
+    def _walk(self, folded: str, start: int) -> List[Tuple[int, int, int]]:
+        """
+        Walk the trie from one start position, following literal characters,
+        substitution rules, separators and stretched vowels
+        Returns (word_id, end_pos, edits) for every word that ends on a word boundary,
+        led by (SAFE, end_pos, 0) for the longest safe phrase if one was found
+        """
+        offsets, labels, targets = self.edge_offsets, self.edge_labels, self.edge_targets
+        terminals, rules, separators, gaps = self.terminals, self.rules, self.separators, self.gaps
+        length = len(folded)
+        limit = min(length, start + self.max_span)
+
+        best = {}
+        safe_end = 0
+        seen = set()
+        stack = [(0, start, 0, '')]
+        while stack:
+            state = stack.pop()
+            if state in seen:
+                continue
+            seen.add(state)
+            node, pos, edits, last = state
+
+            # A word only ends right after a consumed letter, never after trailing separators,
+            # so 'fuck.' keeps its full stop
+            word_id = terminals[node]
+            if word_id != NO_WORD and last and (pos == length or not is_word_char(folded[pos])):
+                if word_id == SAFE:
+                    safe_end = max(safe_end, pos)
+                else:
+                    # Prefer the reading with the fewest substitutions, then the longest one
+                    prior = best.get(word_id)
+                    if prior is None or edits < prior[1] or (edits == prior[1] and pos > prior[0]):
+                        best[word_id] = (pos, edits)
+
+            if pos >= limit:
+                continue
+
+            char = folded[pos]
+            low, high = offsets[node], offsets[node + 1]
+            if low != high:
+                if char in gaps:
+                    # Between the tokens of a phrase: consume the whole gap
+                    index = labels.find(PHRASE_GAP, low, high)
+                    if index >= 0:
+                        end = pos + 1
+                        while end < limit and folded[end] in gaps:
+                            end += 1
+                        stack.append((targets[index], end, edits, ''))
+                index = labels.find(char, low, high) if char != PHRASE_GAP else -1
+                if index >= 0:
+                    stack.append((targets[index], pos + 1, edits, char))
+                for text_seq, lexicon_seq in rules.get(char, ()):
+                    if len(text_seq) > 1 and not folded.startswith(text_seq, pos):
+                        continue
+                    target = node
+                    for letter in lexicon_seq:
+                        index = labels.find(letter, offsets[target], offsets[target + 1])
+                        if index < 0:
+                            break
+                        target = targets[index]
+                    else:
+                        stack.append((target, pos + len(text_seq), edits + 1, lexicon_seq[-1]))
+
+            if char == last and char in VOWELS:
+                stack.append((node, pos + 1, edits, last))
+            elif last and char in separators:
+                end = pos + 1
+                while end < limit and folded[end] in separators:
+                    end += 1
+                stack.append((node, end, edits, ''))
+
+        found = sorted((word_id, end, edits) for word_id, (end, edits) in best.items())
+        if safe_end:
+            found.insert(0, (SAFE, safe_end, 0))
+        return found
+
+    def scan(self, text: str, longest_only: bool = False, start: int = 0, stop: Optional[int] = None) -> Iterator[Match]:
+        """
+        Yield candidate matches in text, ordered by start position and then by lexicon order
+        With longest_only only the maximal candidate per start position is produced
+        (overlaps between start positions are left to the caller)
+        Candidates that lie inside a safe phrase starting at or before them are dropped
+        With start/stop only candidates starting in text[start:stop] are produced; walks still
+        read the whole text, so word boundaries at the edges stay exact
+        """
+        folded = fold_case(text)
+        start_chars = self.start_chars
+        words, replacements = self.words, self.replacements
+        stop = len(folded) if stop is None else min(stop, len(folded))
+
+        # Safe phrases that begin before start may still cover candidates after it
+        begin = max(0, start - self.max_span) if self.safe_count else start
+        safe_end = 0
+        previous_is_word = begin > 0 and is_word_char(folded[begin - 1])
+        for pos in range(begin, stop):
+            char = folded[pos]
+            if char in start_chars and not previous_is_word:
+                found = self._walk(folded, pos)
+                if found and found[0][0] == SAFE:
+                    safe_end = max(safe_end, found.pop(0)[1])
+                if pos < start:
+                    found = []
+                elif pos < safe_end:
+                    found = [item for item in found if item[1] > safe_end]
+                if longest_only and len(found) > 1:
+                    # Longest span first, then fewest substitutions, then lexicon order
+                    found = [min(found, key=lambda item: (-item[1], item[2], item[0]))]
+                for word_id, end, edits in found:
+                    yield Match(text[pos:end], replacements[word_id], pos, end, words[word_id], edits)
+            previous_is_word = char.isalnum() or char in WORD_MARKS
+
+    def safe_spans(self, text: str) -> List[Tuple[int, int]]:
+        """Spans of the safe phrases in text, for engines that do not scan the trie"""
+        if not self.safe_count:
+            return []
+        folded = fold_case(text)
+        spans = []
+        previous_is_word = False
+        for start, char in enumerate(folded):
+            if char in self.start_chars and not previous_is_word:
+                found = self._walk(folded, start)
+                if found and found[0][0] == SAFE:
+                    spans.append((start, found[0][1]))
+            previous_is_word = char.isalnum() or char in WORD_MARKS
+        return spans
+
+    def get_statistics(self) -> Dict[str, int]:
+        """Get size information about the compiled trie"""
+        return {
+            'words': len(self.words),
+            'safe_phrases': self.safe_count,
+            'nodes': len(self.terminals),
+            'edges': len(self.edge_labels),
+            'bytes': (
+                self.edge_offsets.itemsize * len(self.edge_offsets)
+                + self.edge_targets.itemsize * len(self.edge_targets)
+                + self.terminals.itemsize * len(self.terminals)
+                + sys.getsizeof(self.edge_labels)
+            )
+        }
@@ -1,25 +1,44 @@
 import discord
 from discord.ext import commands
 import asyncio
+import functools
 import logging
 import os
 import re
 import json
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional
 from dotenv import load_dotenv
 load_dotenv()
 
-from config import BAD_WORD_REPLACEMENTS, WEBHOOK_CACHE_SIZE
+from config import (
+    BAD_WORD_REPLACEMENTS, WEBHOOK_CACHE_SIZE, EDIT_SCAN_CACHE_SIZE, HOT_RELOAD_ENABLED, DRY_RUN, SHADOW_MODE_ENABLED,
+    FILTER_MEMBER_NAMES, MAX_NICKNAME_LENGTH, SPLIT_DETECTION_ENABLED, FLOOD_PURGE_DELAY,
+    FINGERPRINT_ENABLED, INTERACTION_DEADLINE
+)
 from word_filter import WordFilter
+from hot_reload import FilterReloader
+from shadow import ShadowRunner
+from split_detector import SplitWordDetector
+from flood_guard import FloodGuard
+from fingerprint import FingerprintIndex
+from history_sweep import HistorySweeper
+from metrics import DeadlineTracker
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+def setup_logging():
+    """Log to the console and discord_bot.log; only the bot itself does this, not tools importing it"""
+    logging.basicConfig(
+        level=logging.INFO,
+        format=LOG_FORMAT,
+        handlers=[
+            logging.StreamHandler(),
+            logging.FileHandler('discord_bot.log')
+        ]
+    )
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler('discord_bot.log')
-    ]
-)
 logger = logging.getLogger(__name__)
 
 class ProfanityBot(commands.Bot):
@@ -29,6 +48,8 @@ class ProfanityBot(commands.Bot):
         intents.message_content = True
         intents.guilds = True
         intents.guild_messages = True
+        # Privileged; must also be enabled in the developer portal
+        intents.members = FILTER_MEMBER_NAMES
         
         super().__init__(
             command_prefix='!',
@@ -39,6 +60,10 @@ class ProfanityBot(commands.Bot):
         # Initialize word filter
         self.word_filter = WordFilter()
         
+        # Recent matches per message id, reused when a message is edited
+        self.scan_cache = OrderedDict()
+        self.max_scan_cache = EDIT_SCAN_CACHE_SIZE
+        
         # Webhook cache to avoid recreating webhooks
         self.webhook_cache = {}
         self.webhook_cache_size = 0
@@ -49,6 +74,28 @@ class ProfanityBot(commands.Bot):
         self.whitelist = set()
         self.load_custom_lists()
         
+        # Watches the word list files and swaps in a rebuilt filter on change
+        self.reloader = FilterReloader(self)
+        
+        # Optional candidate filter compared against the active one on sampled traffic
+        self.shadow = ShadowRunner(self) if SHADOW_MODE_ENABLED else None
+        
+        # Recent short messages per channel and author, for words spelled out over several messages
+        self.split_detector = SplitWordDetector() if SPLIT_DETECTION_ENABLED else None
+        
+        # Per-author and per-channel rate tracking; under a flood flagged messages are only deleted
+        self.flood_guard = FloodGuard()
+        self.purge_tasks = {}
+        
+        # Fingerprints of recently flagged messages, so copypasta copies skip the scan
+        self.fingerprints = FingerprintIndex() if FINGERPRINT_ENABLED else None
+        
+        # Retroactive history sweeps, checkpointed so they resume after a restart
+        self.sweeper = HistorySweeper(self)
+        
+        # Slash command latency against the interaction deadline
+        self.command_metrics = DeadlineTracker(INTERACTION_DEADLINE)
+        
     def load_custom_lists(self):
         """Load custom bad words and whitelist from files"""
         try:
@@ -56,8 +103,7 @@ class ProfanityBot(commands.Bot):
             if os.path.exists('custom_bad_words.json'):
                 with open('custom_bad_words.json', 'r') as f:
                     self.custom_bad_words = json.load(f)
-                    self.word_filter.bad_words.update(self.custom_bad_words)
-                    self.word_filter.patterns = self.word_filter._compile_patterns()
+                    self.word_filter.update_words(self.custom_bad_words)
             
             # Load whitelist
             if os.path.exists('whitelist.json'):
@@ -66,16 +112,24 @@ class ProfanityBot(commands.Bot):
         except Exception as e:
             logger.warning(f"Could not load custom lists: {e}")
     
-    def save_custom_lists(self):
+    def write_custom_lists(self, custom_bad_words: Dict[str, str], whitelist: List[int]):
         """Save custom bad words and whitelist to files"""
         try:
             with open('custom_bad_words.json', 'w') as f:
-                json.dump(self.custom_bad_words, f, indent=2)
+                json.dump(custom_bad_words, f, indent=2)
             
             with open('whitelist.json', 'w') as f:
-                json.dump(list(self.whitelist), f, indent=2)
+                json.dump(whitelist, f, indent=2)
         except Exception as e:
             logger.error(f"Could not save custom lists: {e}")
+    
+    async def save_custom_lists(self):
+        """
+        Save the lists from a worker thread; they are copied on the loop first
+        Call with self.reloader.lock held, which also keeps saves one at a time
+        """
+        await asyncio.to_thread(self.write_custom_lists, dict(self.custom_bad_words), list(self.whitelist))
+        self.reloader.mark_written('custom_bad_words.json', 'whitelist.json')
 
     async def setup_hook(self):
         """Called when the bot is starting up"""
@@ -88,6 +142,10 @@ class ProfanityBot(commands.Bot):
         except Exception as e:
             logger.error(f"Failed to sync commands: {e}")
         
+        # Start watching config.py and the JSON lists for hot reload
+        if HOT_RELOAD_ENABLED:
+            self.reload_task = asyncio.create_task(self.reloader.run())
+        
     async def on_ready(self):
         """Called when the bot has successfully connected to Discord"""
         logger.info(f'{self.user} has connected to Discord!')
@@ -96,6 +154,9 @@ class ProfanityBot(commands.Bot):
         # Log guild information
         for guild in self.guilds:
             logger.info(f'Connected to guild: {guild.name} (ID: {guild.id})')
+        
+        # Channels are cached now, so interrupted history sweeps can pick up again
+        self.sweeper.resume()
     
     async def get_or_create_webhook(self, channel):
         """Get existing webhook or create a new one for the channel"""
@@ -149,70 +210,288 @@ class ProfanityBot(commands.Bot):
             logger.error(f"Error creating webhook for {channel.name}: {e}")
             return None
     
-    async def on_message(self, message):
-        """Monitor all messages for profanity"""
-        # Ignore bot messages
-        if message.author.bot:
-            return
+    def should_filter(self, message) -> bool:
+        """Whether a message is subject to filtering at all"""
+        # Ignore bot messages, DMs and whitelisted users
+        return not message.author.bot and message.guild is not None and message.author.id not in self.whitelist
+    
+    def remember_scan(self, message, lexicon, matches):
+        """Cache a message's matches so a later edit only rescans the changed region"""
+        self.scan_cache[message.id] = (lexicon, message.content, matches)
+        self.scan_cache.move_to_end(message.id)
+        if len(self.scan_cache) > self.max_scan_cache:
+            self.scan_cache.popitem(last=False)
+    
+    def extra_fields(self, message) -> List[str]:
+        """Scannable text besides the content: embed titles and descriptions, then attachment filenames"""
+        fields = []
+        for embed in message.embeds:
+            fields.append(embed.title or '')
+            fields.append(embed.description or '')
+        fields.extend(attachment.filename for attachment in message.attachments)
+        return fields
+    
+    def known_copy(self, message, word_filter, extra_fields):
+        """The flagged message this one copies, for text-only messages when fingerprinting is on"""
+        if self.fingerprints is None or extra_fields:
+            return None
+        if self.fingerprints.lexicon is not word_filter.lexicon:
+            self.fingerprints.reset(word_filter.lexicon)
+        return self.fingerprints.match(message.content)
+    
+    async def apply_filter(self, message, word_filter, matches, filtered_content, has_bad_words, field_matches) -> bool:
+        """
+        Repost a message whose content, embeds or filenames were flagged, otherwise remember its scan
+        Returns whether the message was flagged
+        """
+        embed_fields = 2 * len(message.embeds)
+        embeds_flagged = any(field_matches[:embed_fields])
+        file_matches = field_matches[embed_fields:]
         
-        # Ignore DMs
-        if not message.guild:
-            return
+        if has_bad_words or embeds_flagged or any(file_matches):
+            filenames = [
+                word_filter.rewrite(attachment.filename, found)[0]
+                for attachment, found in zip(message.attachments, file_matches)
+            ]
+            if self.flood_guard.allow_repost(message.channel.id, message.author.id):
+                await self.replace_message(message, filtered_content, filenames, suppress_embeds=embeds_flagged)
+            else:
+                await self.delete_flagged(message)
+            if not DRY_RUN:
+                self.scan_cache.pop(message.id, None)
+            return True
         
-        # Check if user is whitelisted
-        if message.author.id in self.whitelist:
+        # The message stays up and can still be edited
+        self.remember_scan(message, word_filter.lexicon, matches)
+        return False
+    
+    async def replace_fragments(self, messages, filtered_content):
+        """Delete a word spelled out over several messages and repost it, filtered, as one message"""
+        *earlier, last = messages
+        for message in earlier:
+            self.scan_cache.pop(message.id, None)
+        if not self.flood_guard.allow_repost(last.channel.id, last.author.id):
+            # Flood mode applies to spelled-out words too: the fragments are only deleted
+            for message in messages:
+                await self.delete_flagged(message)
+            return
+        if earlier and not DRY_RUN:
+            try:
+                await last.channel.delete_messages(earlier)
+            except discord.HTTPException as e:
+                logger.error(f"Could not delete message fragments in {last.channel.name}: {e}")
+        await self.replace_message(last, filtered_content)
+    
+    async def delete_flagged(self, message):
+        """Flood mode: delete a flagged message without reposting it, in a bulk purge if configured"""
+        if DRY_RUN:
+            logger.info(f"[dry run] Would delete flagged message from {message.author} in {message.channel.name} (flood mode)")
             return
         
-        # Check if message contains bad words
-        filtered_content, has_bad_words = self.word_filter.filter_message(message.content)
+        channel = message.channel
+        if self.flood_guard.action == 'purge':
+            if self.flood_guard.queue_purge(channel.id, message):
+                self.purge_tasks[channel.id] = asyncio.create_task(self.purge_channel(channel))
+            return
         
-        if has_bad_words:
+        try:
+            await message.delete()
+        except discord.NotFound:
+            pass
+        except discord.HTTPException as e:
+            logger.error(f"Could not delete flagged message in {channel.name}: {e}")
+    
+    async def purge_channel(self, channel):
+        """Bulk delete the flagged messages collected for a channel, 100 per request"""
+        await asyncio.sleep(FLOOD_PURGE_DELAY)
+        del self.purge_tasks[channel.id]
+        messages = self.flood_guard.take_purge(channel.id)
+        for i in range(0, len(messages), 100):
             try:
-                # Log the detection
-                logger.info(f"Bad word detected in message from {message.author} in {message.channel.name}")
+                await channel.delete_messages(messages[i:i + 100])
+            except discord.HTTPException as e:
+                logger.error(f"Could not purge flagged messages in {channel.name}: {e}")
+        logger.info(f"Purged {len(messages)} flagged messages in {channel.name}")
+    
+    async def replace_message(self, message, filtered_content, filenames=None, suppress_embeds=False):
+        """
+        Delete a message and repost its filtered version under the author's name
+        Attachments are re-uploaded under the given (filtered) filenames
+        """
+        if DRY_RUN:
+            logger.info(f"[dry run] Would filter message from {message.author} in {message.channel.name}")
+            return
+        
+        try:
+            # Log the detection
+            logger.info(f"Bad word detected in message from {message.author} in {message.channel.name}")
+            
+            # Download attachments while the original message still exists
+            filenames = filenames or [attachment.filename for attachment in message.attachments]
+            files = [
+                await attachment.to_file(filename=filename)
+                for attachment, filename in zip(message.attachments, filenames)
+            ]
+            
+            # Delete the original message
+            await message.delete()
+            logger.info(f"Deleted message from {message.author}")
+            
+            # Get or create webhook for the channel
+            webhook = await self.get_or_create_webhook(message.channel)
+            
+            if webhook:
+                # Get user's avatar URL
+                avatar_url = message.author.display_avatar.url
                 
-                # Delete the original message
-                await message.delete()
-                logger.info(f"Deleted message from {message.author}")
+                # Send the filtered message via webhook
+                await webhook.send(
+                    content=filtered_content,
+                    username=message.author.display_name,
+                    avatar_url=avatar_url,
+                    files=files,
+                    suppress_embeds=suppress_embeds,
+                    allowed_mentions=discord.AllowedMentions.none()
+                )
                 
-                # Get or create webhook for the channel
-                webhook = await self.get_or_create_webhook(message.channel)
+                logger.info(f"Sent filtered message via webhook for {message.author}")
+            else:
+                # Fallback: send a regular message if webhook creation fails
+                embed = discord.Embed(
+                    description=f"🧼 **{message.author.display_name}**: {filtered_content}",
+                    color=discord.Color.blue()
+                )
+                embed.set_thumbnail(url=message.author.display_avatar.url)
+                await message.channel.send(embed=embed, files=files, delete_after=None)
+                logger.info(f"Sent filtered message as embed for {message.author}")
                 
-                if webhook:
-                    # Get user's avatar URL
-                    avatar_url = message.author.display_avatar.url
-                    
-                    # Send the filtered message via webhook
-                    await webhook.send(
-                        content=filtered_content,
-                        username=message.author.display_name,
-                        avatar_url=avatar_url,
-                        allowed_mentions=discord.AllowedMentions.none()
-                    )
-                    
-                    logger.info(f"Sent filtered message via webhook for {message.author}")
-                else:
-                    # Fallback: send a regular message if webhook creation fails
-                    embed = discord.Embed(
-                        description=f"🧼 **{message.author.display_name}**: {filtered_content}",
-                        color=discord.Color.blue()
-                    )
-                    embed.set_thumbnail(url=message.author.display_avatar.url)
-                    await message.channel.send(embed=embed, delete_after=None)
-                    logger.info(f"Sent filtered message as embed for {message.author}")
-                    
-            except discord.Forbidden:
-                logger.error(f"No permission to delete message in {message.channel.name}")
-            except discord.NotFound:
-                logger.warning(f"Message was already deleted in {message.channel.name}")
-            except Exception as e:
-                logger.error(f"Error processing message in {message.channel.name}: {e}")
+        except discord.Forbidden:
+            logger.error(f"No permission to delete message in {message.channel.name}")
+        except discord.NotFound:
+            logger.warning(f"Message was already deleted in {message.channel.name}")
+        except Exception as e:
+            logger.error(f"Error processing message in {message.channel.name}: {e}")
+    
+    async def on_message(self, message):
+        """Monitor all messages for profanity"""
+        if not self.should_filter(message):
+            return
+        
+        self.flood_guard.observe(message.author.id)
+        
+        word_filter = self.word_filter
+        extra_fields = self.extra_fields(message)
+        known = self.known_copy(message, word_filter, extra_fields)
+        if known is not None and known.content != message.content:
+            # A near copy of a message flagged again and again: delete it without a rescan or repost
+            await self.delete_flagged(message)
+            flagged = True
+        else:
+            if known is not None:
+                # An exact copy of a flagged message reuses its filtered text
+                matches, field_matches = [], []
+                filtered_content, has_bad_words = known.filtered, True
+            else:
+                # Check the content, embeds and filenames for bad words in one scan
+                started = time.perf_counter()
+                matches, *field_matches = word_filter.scan_fields([message.content] + extra_fields)
+                filtered_content, has_bad_words = word_filter.rewrite(message.content, matches)
+                
+                if self.shadow is not None:
+                    self.shadow.observe(message, word_filter, (filtered_content, has_bad_words), time.perf_counter() - started)
+                if has_bad_words and self.fingerprints is not None and not extra_fields:
+                    self.fingerprints.add(message.content, filtered_content)
+            
+            flagged = await self.apply_filter(message, word_filter, matches, filtered_content, has_bad_words, field_matches)
+        
+        if self.split_detector is not None:
+            if flagged:
+                self.split_detector.reset(message.channel.id, message.author.id)
+            else:
+                fragments = self.split_detector.observe(word_filter, message.channel.id, message.author.id, message)
+                if fragments is not None:
+                    await self.replace_fragments(*fragments)
         
         # Process commands (if any)
         await self.process_commands(message)
     
+    async def on_message_edit(self, before, after):
+        """Rescan edited messages, so profanity cannot be edited into a clean message"""
+        if not self.should_filter(after):
+            return
+        extra_fields = self.extra_fields(after)
+        if before.content == after.content and self.extra_fields(before) == extra_fields:
+            return  # Pins and other metadata changes also arrive as edits
+        
+        # Cached matches are only reusable with the filter that produced them
+        word_filter = self.word_filter
+        cached = self.scan_cache.get(after.id)
+        if cached is not None and cached[0] is word_filter.lexicon and cached[1] == before.content:
+            matches = word_filter.rescan_edit(before.content, after.content, cached[2])
+            field_matches = word_filter.scan_fields(extra_fields)
+        else:
+            matches, *field_matches = word_filter.scan_fields([after.content] + extra_fields)
+        filtered_content, has_bad_words = word_filter.rewrite(after.content, matches)
+        
+        await self.apply_filter(after, word_filter, matches, filtered_content, has_bad_words, field_matches)
+    
+    async def on_thread_create(self, thread):
+        """Rename threads created with a bad word in their title"""
+        if thread.owner_id in self.whitelist:
+            return
+        
+        (filtered_name, has_bad_words), = self.word_filter.filter_fields([thread.name])
+        if not has_bad_words:
+            return
+        if DRY_RUN:
+            logger.info(f"[dry run] Would rename thread {thread.id} in {thread.parent}")
+            return
+        
+        try:
+            await thread.edit(name=filtered_name, reason="Profanity filter")
+            logger.info(f"Renamed thread {thread.id} in {thread.parent}")
+        except discord.HTTPException as e:
+            logger.error(f"Could not rename thread {thread.id}: {e}")
+    
+    async def filter_member_name(self, member):
+        """Give a member a clean nickname when the name they show with contains a bad word"""
+        if member.bot or member.id in self.whitelist:
+            return
+        
+        # Nickname, display name and username in one scan; the first one set is what others see
+        names = [member.nick, member.global_name, member.name]
+        results = self.word_filter.filter_fields(names)
+        shown = next(i for i, name in enumerate(names) if name)
+        filtered_name, has_bad_words = results[shown]
+        if not has_bad_words:
+            return
+        if DRY_RUN:
+            logger.info(f"[dry run] Would rename member {member} in {member.guild.name}")
+            return
+        
+        try:
+            await member.edit(nick=filtered_name[:MAX_NICKNAME_LENGTH], reason="Profanity filter")
+            logger.info(f"Changed nickname of {member.id} in {member.guild.name}")
+        except discord.HTTPException as e:
+            logger.error(f"Could not change nickname of {member.id} in {member.guild.name}: {e}")
+    
+    async def on_member_update(self, before, after):
+        """Check nickname changes"""
+        if FILTER_MEMBER_NAMES and before.nick != after.nick:
+            await self.filter_member_name(after)
+    
+    async def on_user_update(self, before, after):
+        """Check username and display name changes in every shared guild"""
+        if not FILTER_MEMBER_NAMES or (before.name, before.global_name) == (after.name, after.global_name):
+            return
+        for guild in self.guilds:
+            member = guild.get_member(after.id)
+            if member is not None:
+                await self.filter_member_name(member)
+    
     async def on_message_delete(self, message):
         """Handle message deletion events"""
+        self.scan_cache.pop(message.id, None)
         if not message.author.bot:
             logger.debug(f"Message deleted from {message.author} in {message.channel.name}")
     
@@ -233,6 +512,35 @@ class ProfanityBot(commands.Bot):
 # Create bot instance
 bot = ProfanityBot()
 
+def timed_command(func):
+    """Record how long a slash command takes to acknowledge its interaction, and to finish"""
+    name = func.__name__.removeprefix('slash_')
+    
+    @functools.wraps(func)
+    async def wrapper(interaction: discord.Interaction, **kwargs):
+        started = time.perf_counter()
+        expired = False
+        try:
+            await func(interaction, **kwargs)
+        except discord.NotFound as e:
+            # Unknown interaction: Discord stopped waiting before the acknowledgement arrived
+            if e.code != 10062:
+                raise
+            expired = True
+            logger.error(f"/{name} missed the interaction deadline: {e}")
+        finally:
+            finished = time.perf_counter()
+            acknowledged = interaction.extras.get('acknowledged', finished) - started
+            if not bot.command_metrics.record(acknowledged, finished - started, expired) and not expired:
+                logger.warning(f"/{name} acknowledged its interaction after {acknowledged:.2f}s")
+    
+    return wrapper
+
+async def defer(interaction: discord.Interaction, ephemeral: bool = False):
+    """Acknowledge an interaction before slow work; the reply then goes out with interaction.followup.send"""
+    await interaction.response.defer(ephemeral=ephemeral, thinking=True)
+    interaction.extras['acknowledged'] = time.perf_counter()
+
 @bot.command(name='status')
 @commands.has_permissions(manage_messages=True)
 async def status(ctx):
@@ -250,7 +558,7 @@ async def status(ctx):
     
     embed.add_field(
         name="🔧 Word Filter",
-        value=f"Bad Words: {len(bot.word_filter.bad_words)}\nPatterns: {len(bot.word_filter.patterns)}",
+        value=f"Bad Words: {len(bot.word_filter.bad_words)}\nPatterns: {bot.word_filter.get_statistics()['total_patterns']}",
         inline=True
     )
     
@@ -260,6 +568,29 @@ async def status(ctx):
         inline=True
     )
     
+    flood_stats = bot.flood_guard.get_statistics()
+    embed.add_field(
+        name="🌊 Flood Protection",
+        value=f"Flooded channels: {flood_stats['flooded_channels']}\nFlooded authors: {flood_stats['flooded_authors']}\nDeleted without repost: {flood_stats['cheap_actions']}",
+        inline=True
+    )
+    
+    if bot.fingerprints is not None:
+        fingerprint_stats = bot.fingerprints.get_statistics()
+        embed.add_field(
+            name="🧬 Duplicate Spam",
+            value=f"Fingerprints: {fingerprint_stats['entries']}\nCopies caught: {fingerprint_stats['exact_hits'] + fingerprint_stats['near_hits']}\nLookup p99: {fingerprint_stats['lookup_p99_us']:.0f}µs",
+            inline=True
+        )
+    
+    if bot.shadow is not None:
+        shadow_stats = bot.shadow.get_statistics()
+        embed.add_field(
+            name="👥 Shadow Mode",
+            value=f"Samples: {shadow_stats['samples']}\nDisagreements: {shadow_stats['disagreements']}\nLatency delta: {shadow_stats['mean_delta_ms']:+.2f}ms",
+            inline=True
+        )
+    
     await ctx.send(embed=embed)
 
 @bot.command(name='test_filter')
@@ -307,6 +638,7 @@ async def clear_webhook_cache(ctx):
 
 # Slash Commands
 @bot.tree.command(name="status", description="Check bot status and statistics")
+@timed_command
 async def slash_status(interaction: discord.Interaction):
     """Slash command version of status"""
     # Check if user has manage messages permission in the guild
@@ -329,7 +661,7 @@ async def slash_status(interaction: discord.Interaction):
     
     embed.add_field(
         name="🔧 Word Filter",
-        value=f"```\nDefault Words: {len(BAD_WORD_REPLACEMENTS)}\nCustom Words: {len(bot.custom_bad_words)}\nTotal Patterns: {len(bot.word_filter.patterns)}\n```",
+        value=f"```\nDefault Words: {len(BAD_WORD_REPLACEMENTS)}\nCustom Words: {len(bot.custom_bad_words)}\nTotal Patterns: {bot.word_filter.get_statistics()['total_patterns']}\n```",
         inline=True
     )
     
@@ -339,12 +671,20 @@ async def slash_status(interaction: discord.Interaction):
         inline=True
     )
     
+    commands_stats = bot.command_metrics.summary()
+    embed.add_field(
+        name="⏱️ Slash Commands",
+        value=f"```\nCommands: {commands_stats['acknowledged']['count']}\nAck p99: {commands_stats['acknowledged']['p99_ms']:.0f}ms\nMissed deadlines: {commands_stats['missed']}\n```",
+        inline=True
+    )
+    
     if bot.user:
         embed.set_footer(text=f"Bot ID: {bot.user.id}", icon_url=bot.user.display_avatar.url)
     
     await interaction.response.send_message(embed=embed)
 
 @bot.tree.command(name="test_filter", description="Test the word filter on provided text")
+@timed_command
 async def slash_test_filter(interaction: discord.Interaction, text: str):
     """Slash command to test word filtering"""
     if not interaction.guild:
@@ -393,11 +733,9 @@ async def slash_test_filter(interaction: discord.Interaction, text: str):
     await interaction.response.send_message(embed=embed, ephemeral=True)
 
 @bot.tree.command(name="add_bad_word", description="Add a custom bad word with replacement")
+@timed_command
 async def slash_add_bad_word(interaction: discord.Interaction, bad_word: str, replacement: str):
     """Add a custom bad word to the filter"""
-    
-    await interaction.response.defer(thinking=True)
-    
     if not interaction.user.guild_permissions.administrator:
         await interaction.response.send_message("❌ You need Administrator permission to use this command.", ephemeral=True)
         return
@@ -409,10 +747,12 @@ async def slash_add_bad_word(interaction: discord.Interaction, bad_word: str, re
         await interaction.response.send_message("❌ Bad word must be at least 2 characters long.", ephemeral=True)
         return
     
-    bot.custom_bad_words[bad_word] = replacement
-    bot.word_filter.bad_words[bad_word] = replacement
-    bot.word_filter.patterns = bot.word_filter._compile_patterns()
-    bot.save_custom_lists()
+    # Recompiling the filter and saving the lists can outlast the interaction deadline
+    await defer(interaction)
+    async with bot.reloader.lock:
+        bot.custom_bad_words[bad_word] = replacement
+        await asyncio.to_thread(bot.word_filter.add_word, bad_word, replacement)
+        await bot.save_custom_lists()
     
     embed = discord.Embed(
         title="✅ Bad Word Added",
@@ -440,9 +780,10 @@ async def slash_add_bad_word(interaction: discord.Interaction, bad_word: str, re
     
     embed.set_footer(text=f"Added by {interaction.user.display_name}", icon_url=interaction.user.display_avatar.url)
     
-    await interaction.response.send_message(embed=embed)
+    await interaction.followup.send(embed=embed)
 
 @bot.tree.command(name="remove_bad_word", description="Remove a custom bad word from the filter")
+@timed_command
 async def slash_remove_bad_word(interaction: discord.Interaction, bad_word: str):
     """Remove a custom bad word from the filter"""
     if not interaction.user.guild_permissions.administrator:
@@ -455,10 +796,15 @@ async def slash_remove_bad_word(interaction: discord.Interaction, bad_word: str)
         await interaction.response.send_message(f"❌ `{bad_word}` is not in the custom bad words list.", ephemeral=True)
         return
     
-    replacement = bot.custom_bad_words.pop(bad_word)
-    bot.word_filter.bad_words.pop(bad_word, None)
-    bot.word_filter.patterns = bot.word_filter._compile_patterns()
-    bot.save_custom_lists()
+    await defer(interaction)
+    async with bot.reloader.lock:
+        # Another removal or a reload may have dropped it while this one waited
+        replacement = bot.custom_bad_words.pop(bad_word, None)
+        if replacement is None:
+            await interaction.followup.send(f"❌ `{bad_word}` is not in the custom bad words list.")
+            return
+        await asyncio.to_thread(bot.word_filter.remove_word, bad_word)
+        await bot.save_custom_lists()
     
     embed = discord.Embed(
         title="✅ Bad Word Removed",
@@ -480,9 +826,10 @@ async def slash_remove_bad_word(interaction: discord.Interaction, bad_word: str)
     
     embed.set_footer(text=f"Removed by {interaction.user.display_name}", icon_url=interaction.user.display_avatar.url)
     
-    await interaction.response.send_message(embed=embed)
+    await interaction.followup.send(embed=embed)
 
 @bot.tree.command(name="list_custom_words", description="List all custom bad words")
+@timed_command
 async def slash_list_custom_words(interaction: discord.Interaction):
     """List all custom bad words"""
     if not interaction.user.guild_permissions.manage_messages:
@@ -523,6 +870,7 @@ async def slash_list_custom_words(interaction: discord.Interaction):
     await interaction.response.send_message(embed=embed, ephemeral=True)
 
 @bot.tree.command(name="whitelist_add", description="Add a user to the whitelist (they won't be filtered)")
+@timed_command
 async def slash_whitelist_add(interaction: discord.Interaction, user: discord.User):
     """Add a user to the whitelist"""
     if not interaction.user.guild_permissions.administrator:
@@ -533,8 +881,10 @@ async def slash_whitelist_add(interaction: discord.Interaction, user: discord.Us
         await interaction.response.send_message(f"❌ {user.mention} is already whitelisted.", ephemeral=True)
         return
     
-    bot.whitelist.add(user.id)
-    bot.save_custom_lists()
+    await defer(interaction)
+    async with bot.reloader.lock:
+        bot.whitelist.add(user.id)
+        await bot.save_custom_lists()
     
     embed = discord.Embed(
         title="✅ User Whitelisted",
@@ -557,9 +907,10 @@ async def slash_whitelist_add(interaction: discord.Interaction, user: discord.Us
     
     embed.set_footer(text=f"Added by {interaction.user.display_name}", icon_url=interaction.user.display_avatar.url)
     
-    await interaction.response.send_message(embed=embed)
+    await interaction.followup.send(embed=embed)
 
 @bot.tree.command(name="whitelist_remove", description="Remove a user from the whitelist")
+@timed_command
 async def slash_whitelist_remove(interaction: discord.Interaction, user: discord.User):
     """Remove a user from the whitelist"""
     if not interaction.user.guild_permissions.administrator:
@@ -570,8 +921,10 @@ async def slash_whitelist_remove(interaction: discord.Interaction, user: discord
         await interaction.response.send_message(f"❌ {user.mention} is not whitelisted.", ephemeral=True)
         return
     
-    bot.whitelist.remove(user.id)
-    bot.save_custom_lists()
+    await defer(interaction)
+    async with bot.reloader.lock:
+        bot.whitelist.discard(user.id)
+        await bot.save_custom_lists()
     
     embed = discord.Embed(
         title="✅ User Removed from Whitelist",
@@ -594,9 +947,10 @@ async def slash_whitelist_remove(interaction: discord.Interaction, user: discord
     
     embed.set_footer(text=f"Removed by {interaction.user.display_name}", icon_url=interaction.user.display_avatar.url)
     
-    await interaction.response.send_message(embed=embed)
+    await interaction.followup.send(embed=embed)
 
 @bot.tree.command(name="whitelist_list", description="List all whitelisted users")
+@timed_command
 async def slash_whitelist_list(interaction: discord.Interaction):
     """List all whitelisted users"""
     if not interaction.user.guild_permissions.manage_messages:
@@ -643,8 +997,92 @@ async def slash_whitelist_list(interaction: discord.Interaction):
     
     await interaction.response.send_message(embed=embed, ephemeral=True)
 
+@bot.tree.command(name="sweep_history", description="Scan a channel's existing messages and delete the flagged ones")
+@timed_command
+async def slash_sweep_history(interaction: discord.Interaction, channel: Optional[discord.TextChannel] = None, days: Optional[int] = None):
+    """Start a retroactive sweep of a channel's history"""
+    if not interaction.guild or not interaction.user.guild_permissions.administrator:
+        await interaction.response.send_message("❌ You need Administrator permission to use this command.", ephemeral=True)
+        return
+    
+    channel = channel or interaction.channel
+    permissions = channel.permissions_for(interaction.guild.me)
+    if not permissions.read_message_history or not permissions.manage_messages:
+        await interaction.response.send_message(f"❌ I need 'Read Message History' and 'Manage Messages' in {channel.mention}.", ephemeral=True)
+        return
+    
+    if bot.sweeper.is_running(channel.id):
+        await interaction.response.send_message(f"❌ {channel.mention} is already being swept. Use `/sweep_status` to follow it.", ephemeral=True)
+        return
+    
+    # Starting a sweep writes its checkpoint first
+    await defer(interaction)
+    if not await bot.sweeper.start(channel, days):
+        await interaction.followup.send(f"❌ {channel.mention} is already being swept. Use `/sweep_status` to follow it.")
+        return
+    
+    embed = discord.Embed(
+        title="🧹 History Sweep Started",
+        description=f"Scanning {channel.mention} {f'for the last {days} days' if days else 'back to its first message'}.",
+        color=discord.Color.green(),
+        timestamp=discord.utils.utcnow()
+    )
+    
+    embed.add_field(
+        name="⏱️ Progress",
+        value="Use `/sweep_status` to follow it. Interrupted sweeps resume after a restart.",
+        inline=False
+    )
+    
+    embed.set_footer(text=f"Started by {interaction.user.display_name}", icon_url=interaction.user.display_avatar.url)
+    
+    await interaction.followup.send(embed=embed)
+
+@bot.tree.command(name="sweep_stop", description="Stop a running history sweep")
+@timed_command
+async def slash_sweep_stop(interaction: discord.Interaction, channel: Optional[discord.TextChannel] = None):
+    """Stop a channel's history sweep; it resumes on the next restart"""
+    if not interaction.guild or not interaction.user.guild_permissions.administrator:
+        await interaction.response.send_message("❌ You need Administrator permission to use this command.", ephemeral=True)
+        return
+    
+    channel = channel or interaction.channel
+    if not bot.sweeper.stop(channel.id):
+        await interaction.response.send_message(f"❌ {channel.mention} is not being swept.", ephemeral=True)
+        return
+    
+    await interaction.response.send_message(f"⏹️ Stopped the sweep of {channel.mention}. It resumes from its checkpoint on the next restart.")
+
+@bot.tree.command(name="sweep_status", description="Show the progress of history sweeps")
+@timed_command
+async def slash_sweep_status(interaction: discord.Interaction):
+    """Progress and throughput of this server's history sweeps"""
+    if not interaction.guild or not interaction.user.guild_permissions.manage_messages:
+        await interaction.response.send_message("❌ You need 'Manage Messages' permission to use this command.", ephemeral=True)
+        return
+    
+    reports = bot.sweeper.get_statistics(interaction.guild.id)
+    embed = discord.Embed(
+        title="🧹 History Sweeps",
+        description=f"Total: {len(reports)} sweeps" if reports else "No history sweeps have been run yet.",
+        color=discord.Color.blue(),
+        timestamp=discord.utils.utcnow()
+    )
+    
+    for report in reports[:20]:
+        state = "🔄 Running" if report['running'] else "✅ Done" if report['done'] else "⏸️ Paused"
+        embed.add_field(
+            name=f"#{report['channel']} - {state}",
+            value=f"```\nScanned: {report['scanned']}\nFlagged: {report['flagged']}\nDeleted: {report['deleted']}\nSpeed: {report['messages_per_second']:.0f} msg/s\n```",
+            inline=True
+        )
+    
+    await interaction.response.send_message(embed=embed, ephemeral=True)
+
 def main():
     """Main function to run the bot"""
+    setup_logging()
+    
     # Get Discord token from environment variable
     token = os.getenv('DISCORD_BOT_TOKEN')
     
@@ -683,6 +1121,7 @@ def check_permissions(interaction: discord.Interaction, permission_level: str) -
     return True, ""
 
 @bot.tree.command(name="help", description="Show all available commands and bot information")
+@timed_command
 async def slash_help(interaction: discord.Interaction):
     """Show comprehensive help and command list"""
     embed = discord.Embed(
@@ -702,14 +1141,14 @@ async def slash_help(interaction: discord.Interaction):
     # Commands for manage messages permission
     embed.add_field(
         name="🛠️ Moderator Commands (Manage Messages)",
-        value="```\n/status - View bot statistics\n/test_filter <text> - Test filtering\n/list_custom_words - View custom words\n/whitelist_list - View whitelisted users\n```",
+        value="```\n/status - View bot statistics\n/test_filter <text> - Test filtering\n/list_custom_words - View custom words\n/whitelist_list - View whitelisted users\n/sweep_status - View history sweeps\n```",
         inline=False
     )
     
     # Commands for administrators
     embed.add_field(
         name="⚡ Admin Commands (Administrator)",
-        value="```\n/add_bad_word <word> <replacement>\n/remove_bad_word <word>\n/whitelist_add <user>\n/whitelist_remove <user>\n```",
+        value="```\n/add_bad_word <word> <replacement>\n/remove_bad_word <word>\n/whitelist_add <user>\n/whitelist_remove <user>\n/sweep_history [channel] [days]\n/sweep_stop [channel]\n```",
         inline=False
     )
     
@@ -737,7 +1176,7 @@ async def slash_help(interaction: discord.Interaction):
     # Performance info
     embed.add_field(
         name="⚡ Performance",
-        value=f"• **Latency**: {round(bot.latency * 1000)}ms\n• **Detection Patterns**: {sum(len(patterns) for patterns in bot.word_filter.patterns.values())}\n• **Cache Size**: {bot.webhook_cache_size}",
+        value=f"• **Latency**: {round(bot.latency * 1000)}ms\n• **Detection Patterns**: {bot.word_filter.get_statistics()['total_patterns']}\n• **Cache Size**: {bot.webhook_cache_size}",
         inline=True
     )
     
@@ -0,0 +1,89 @@
+"""
+Latency metrics shared by the bot, the replay harness and the benchmarks
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Dict, List
+
+
+def _nearest_rank(ordered: List[float], percent: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    rank = max(1, round(percent / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+class LatencyTracker:
+    """Keeps the most recent latency samples and summarizes them as percentiles"""
+
+    def __init__(self, size: int = 10000):
+        self.samples = deque(maxlen=size)
+        self.count = 0
+        self.max = 0.0
+
+    def __len__(self) -> int:
+        return len(self.samples)
+
+    def record(self, seconds: float):
+        """Add one sample in seconds"""
+        self.samples.append(seconds)
+        self.count += 1
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, percent: float) -> float:
+        """Nearest-rank percentile of the kept samples in seconds (0.0 when empty)"""
+        if not self.samples:
+            return 0.0
+        return _nearest_rank(sorted(self.samples), percent)
+
+    def summary(self) -> Dict[str, float]:
+        """Sample count plus p50/p95/p99/max in milliseconds"""
+        ordered = sorted(self.samples) or [0.0]
+        return {
+            'count': self.count,
+            'p50_ms': _nearest_rank(ordered, 50) * 1000,
+            'p95_ms': _nearest_rank(ordered, 95) * 1000,
+            'p99_ms': _nearest_rank(ordered, 99) * 1000,
+            'max_ms': self.max * 1000
+        }
+
+
+class DeadlineTracker:
+    """Time until slash commands acknowledge their interaction, and until they finish, against a deadline"""
+
+    def __init__(self, deadline: float, size: int = 10000):
+        self.deadline = deadline
+        self.acknowledged = LatencyTracker(size)
+        self.completed = LatencyTracker(size)
+        self.missed = 0
+
+    def record(self, acknowledged: float, completed: float, expired: bool = False) -> bool:
+        """
+        Add one command in seconds; returns whether it was acknowledged within the deadline
+        expired marks a command whose acknowledgement Discord rejected as too late
+        """
+        self.acknowledged.record(acknowledged)
+        self.completed.record(completed)
+        if expired or acknowledged > self.deadline:
+            self.missed += 1
+            return False
+        return True
+
+    def summary(self) -> Dict:
+        """Missed deadlines plus the acknowledge and completion percentiles in milliseconds"""
+        return {
+            'deadline_ms': self.deadline * 1000,
+            'missed': self.missed,
+            'acknowledged': self.acknowledged.summary(),
+            'completed': self.completed.summary()
+        }
+
+
+async def monitor_loop_lag(tracker: LatencyTracker, interval: float = 0.01):
+    """Record how late the event loop wakes up from a sleep, until cancelled"""
+    while True:
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        tracker.record(max(0.0, time.perf_counter() - started - interval))
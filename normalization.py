@@ -0,0 +1,116 @@
+"""
+Text normalization applied before matching
+Folds Unicode look-alikes (fullwidth, mathematical alphanumerics, accented Latin) onto plain
+Latin characters and drops zero-width characters and combining marks, all through one
+precomputed str.translate table. Cyrillic and Greek look-alikes are only folded inside tokens
+that mix them with Latin letters, so text written in those scripts is left alone
+"""
+
+import re
+import unicodedata
+from typing import List, Optional, Tuple
+
+# Cyrillic and Greek letters that look like Latin ones
+SCRIPT_HOMOGLYPHS = {
+    # Cyrillic
+    'а': 'a', 'в': 'b', 'е': 'e', 'ё': 'e', 'к': 'k', 'м': 'm', 'н': 'h', 'о': 'o', 'р': 'p',
+    'с': 'c', 'т': 't', 'у': 'y', 'х': 'x', 'ѕ': 's', 'і': 'i', 'ї': 'i', 'ј': 'j', 'ԁ': 'd',
+    'ԛ': 'q', 'ԝ': 'w', 'һ': 'h', 'ь': 'b', 'ц': 'u', 'п': 'n', 'г': 'r', 'ч': 'y',
+    'А': 'a', 'В': 'b', 'Е': 'e', 'Ё': 'e', 'К': 'k', 'М': 'm', 'Н': 'h', 'О': 'o', 'Р': 'p',
+    'С': 'c', 'Т': 't', 'У': 'y', 'Х': 'x', 'Ѕ': 's', 'І': 'i', 'Ї': 'i', 'Ј': 'j', 'Ь': 'b',
+    # Greek
+    'α': 'a', 'β': 'b', 'γ': 'y', 'ε': 'e', 'η': 'n', 'ι': 'i', 'κ': 'k', 'μ': 'u', 'ν': 'v',
+    'ο': 'o', 'ρ': 'p', 'σ': 'o', 'τ': 't', 'υ': 'u', 'χ': 'x', 'ω': 'w', 'ϲ': 'c',
+    'Α': 'a', 'Β': 'b', 'Ε': 'e', 'Ζ': 'z', 'Η': 'h', 'Ι': 'i', 'Κ': 'k', 'Μ': 'm', 'Ν': 'n',
+    'Ο': 'o', 'Ρ': 'p', 'Τ': 't', 'Υ': 'y', 'Χ': 'x',
+}
+
+# Hand-picked Latin look-alikes and small capitals that Unicode normalization does not fold
+HOMOGLYPHS = {
+    'ı': 'i', 'ȷ': 'j', 'ɑ': 'a', 'ɡ': 'g', 'ɩ': 'i', 'ʋ': 'u', 'ℓ': 'l', 'ø': 'o', 'ð': 'd',
+    'ᴀ': 'a', 'ʙ': 'b', 'ᴄ': 'c', 'ᴅ': 'd', 'ᴇ': 'e', 'ɢ': 'g', 'ʜ': 'h', 'ɪ': 'i', 'ᴊ': 'j',
+    'ᴋ': 'k', 'ʟ': 'l', 'ᴍ': 'm', 'ɴ': 'n', 'ᴏ': 'o', 'ᴘ': 'p', 'ʀ': 'r', 'ꜱ': 's', 'ᴛ': 't',
+    'ᴜ': 'u', 'ᴠ': 'v', 'ᴡ': 'w', 'ʏ': 'y', 'ᴢ': 'z',
+}
+
+# Invisible characters used to split words without changing how they look
+ZERO_WIDTH = '\u00ad\u034f\u061c\u115f\u1160\u180e\u200b\u200c\u200d\u200e\u200f\u2060\u2061\u2062\u2063\u2064\ufeff'
+
+# Combining diacritics stacked on Latin, Greek and Cyrillic text ('zalgo' text);
+# Indic vowel signs and viramas are combining marks too, so only these blocks are dropped
+COMBINING_RANGES = [(0x0300, 0x036F), (0x1AB0, 0x1AFF), (0x1DC0, 0x1DFF), (0x20D0, 0x20FF), (0xFE20, 0xFE2F)]
+
+# Blocks whose compatibility decompositions are plain ASCII letters or digits
+COMPATIBILITY_RANGES = [
+    (0x00C0, 0x024F),    # Latin-1 Supplement and Latin Extended-A/B (accented letters)
+    (0x1E00, 0x1EFF),    # Latin Extended Additional
+    (0x2100, 0x214F),    # Letterlike symbols
+    (0x2460, 0x24FF),    # Enclosed alphanumerics
+    (0xFF01, 0xFF5E),    # Fullwidth forms
+    (0x1D400, 0x1D7FF),  # Mathematical alphanumeric symbols
+    (0x1F130, 0x1F189),  # Squared and negative circled letters
+]
+
+
+def _ascii_fold(char: str) -> Optional[str]:
+    """The single ASCII character a compatibility character decomposes to, if any"""
+    decomposed = unicodedata.normalize('NFKD', char)
+    base = ''.join(c for c in decomposed if not unicodedata.combining(c))
+    if len(base) == 1 and base.isascii() and base != char:
+        return base.lower() if base.isalpha() else base
+    return None
+
+
+def _build_fold_table() -> dict:
+    """Build the code point -> replacement table once; every value is one character or None"""
+    table = {}
+    for start, end in COMPATIBILITY_RANGES:
+        for code in range(start, end + 1):
+            folded = _ascii_fold(chr(code))
+            if folded is not None:
+                table[code] = folded
+    for char, folded in HOMOGLYPHS.items():
+        table[ord(char)] = folded
+    for start, end in COMBINING_RANGES:
+        for code in range(start, end + 1):
+            table[code] = None
+    for char in ZERO_WIDTH:
+        table[ord(char)] = None
+    return table
+
+
+FOLD_TABLE = _build_fold_table()
+DROPPED = frozenset(code for code, folded in FOLD_TABLE.items() if folded is None)
+SCRIPT_FOLD_TABLE = {ord(char): folded for char, folded in SCRIPT_HOMOGLYPHS.items()}
+
+# Runs of text between whitespace; a run that mixes Latin letters with Cyrillic or Greek
+# look-alikes ('fuсk' with a Cyrillic 'с') is an evasion, a run without Latin letters is not
+TOKEN_PATTERN = re.compile(r'\S+')
+SCRIPT_HOMOGLYPH_PATTERN = re.compile(f"[{re.escape(''.join(SCRIPT_HOMOGLYPHS))}]")
+LATIN_LETTER_PATTERN = re.compile(r'[a-zA-Z]')
+
+
+def _fold_mixed_token(match: re.Match) -> str:
+    token = match.group()
+    if SCRIPT_HOMOGLYPH_PATTERN.search(token) and LATIN_LETTER_PATTERN.search(token):
+        return token.translate(SCRIPT_FOLD_TABLE)
+    return token
+
+
+def fold_confusables(text: str) -> Tuple[str, Optional[List[int]]]:
+    """
+    Fold look-alike characters and drop invisible ones
+    Returns (folded_text, positions) where positions[i] is the index in text of folded_text[i],
+    or None when nothing was dropped and positions are unchanged
+    """
+    if text.isascii():
+        return text, None
+
+    folded = text.translate(FOLD_TABLE)
+    if SCRIPT_HOMOGLYPH_PATTERN.search(folded):
+        folded = TOKEN_PATTERN.sub(_fold_mixed_token, folded)
+    if len(folded) == len(text):
+        return folded, None
+
+    positions = [i for i, char in enumerate(text) if ord(char) not in DROPPED]
+    return folded, positions
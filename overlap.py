@@ -0,0 +1,92 @@
+"""
+Overlap resolution for candidate matches
+Decides which of several overlapping bad word candidates gets replaced
+"""
+
+from bisect import bisect_right
+from typing import Callable, Iterable, Iterator, List, Tuple
+
+from lexicon import Match
+
+# 'first'            - leftmost start wins, ties go to lexicon order (the original behaviour)
+# 'longest-leftmost' - leftmost start wins, ties go to the longest span
+# 'priority'         - highest word priority wins, then the longest span, then the leftmost
+# 'most-specific'    - fewest substitutions wins, then the longest lexicon word, then the leftmost
+STRATEGIES = ('first', 'longest-leftmost', 'priority', 'most-specific')
+
+# Strategies that can be decided while candidates stream past in position order
+STREAMING_STRATEGIES = ('first', 'longest-leftmost')
+
+
+class IntervalIndex:
+    """
+    Sorted set of disjoint [start, end) intervals with O(log n) overlap checks
+    Inserts shift the sorted lists, O(n) each; n is the number of kept matches,
+    which is small since they are disjoint spans of one message
+    """
+    __slots__ = ('starts', 'ends')
+
+    def __init__(self):
+        self.starts = []
+        self.ends = []
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def overlaps(self, start: int, end: int) -> bool:
+        """Check whether [start, end) intersects any stored interval"""
+        index = bisect_right(self.starts, start)
+        if index and self.ends[index - 1] > start:
+            return True
+        return index < len(self.starts) and self.starts[index] < end
+
+    def add(self, start: int, end: int):
+        """Store [start, end), which must not overlap a stored interval; O(n) list insert"""
+        index = bisect_right(self.starts, start)
+        self.starts.insert(index, start)
+        self.ends.insert(index, end)
+
+
+def resolve_streaming(candidates: Iterable[Match], longest: bool) -> Iterator[Match]:
+    """
+    Resolve candidates that arrive ordered by start position, in one pass
+    With longest=True the longest candidate per start is held back until the start moves on
+    """
+    last_end = -1
+    pending = None
+
+    for match in candidates:
+        if pending is not None:
+            if match.start == pending.start:
+                if longest and match.end > pending.end:
+                    pending = match
+                continue
+            last_end = pending.end
+            yield pending
+            pending = None
+
+        if match.start >= last_end:  # No overlap
+            if longest:
+                pending = match
+            else:
+                last_end = match.end
+                yield match
+
+    if pending is not None:
+        yield pending
+
+
+def resolve_ranked(candidates: Iterable[Match], rank: Callable[[Match], Tuple]) -> List[Match]:
+    """
+    Greedily keep the best ranked candidates that do not overlap an already kept one
+    O(m log m) to sort and check m candidates plus O(k) per insert of the k kept ones,
+    so O(m log m + k^2) in all; returns the kept matches in position order
+    """
+    kept = IntervalIndex()
+    chosen = []
+    for match in sorted(candidates, key=rank):
+        if not kept.overlaps(match.start, match.end):
+            kept.add(match.start, match.end)
+            chosen.append(match)
+    chosen.sort(key=lambda match: match.start)
+    return chosen
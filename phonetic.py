@@ -0,0 +1,116 @@
+"""
+Phonetic matching tier for romanized Indian languages (Hinglish and friends)
+Romanized Hindi has no standard spelling: 'behenchod', 'bhenchod' and 'behanchod' are the
+same word. Every spelling is reduced to a phonetic key (vowel length collapsed, aspirates
+folded, doubled letters merged) and each romanized lexicon entry is stored once under its key,
+so a token is matched with one hash lookup instead of one hand-added variant per spelling
+"""
+
+import re
+import threading
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from fuzzy import letter_tokens
+from lexicon import Lexicon, Match, fold_case
+
+# Shortest token that is keyed; shorter ones ('mc', 'bc') are left to the exact entries
+MIN_PHONETIC_LENGTH = 4
+
+# Tokens repeat a lot in chat, so their keys are cached up to this many tokens per thread
+KEY_CACHE_SIZE = 20000
+
+# Spellings of one sound, longest first so 'chh' wins over 'ch' and 'ch' over 'c'.
+# Aspirates fold onto the plain consonant, 'au'/'aw'/'ou'/'ow' onto 'o', long vowels onto short
+# ones; a bare 'c' reads as 'k' while 'ch' stays 'c', so 'chut' and 'cut' keep different keys
+SOUNDS = {
+    'chh': 'c', 'ch': 'c', 'kh': 'k', 'gh': 'g', 'th': 't', 'dh': 'd', 'bh': 'b', 'jh': 'j',
+    'ph': 'f', 'sh': 's', 'ck': 'k', 'c': 'k', 'q': 'k', 'z': 'j', 'w': 'v',
+    'aa': 'a', 'ee': 'i', 'ii': 'i', 'oo': 'u', 'uu': 'u',
+    'au': 'o', 'aw': 'o', 'ou': 'o', 'ow': 'o', 'ai': 'e', 'ae': 'e', 'iy': 'i',
+}
+SOUND_PATTERN = re.compile('|'.join(sorted(SOUNDS, key=len, reverse=True)))
+
+# A medial 'e' between consonants is the same schwa as 'a' ('behen', 'bahan'), then a medial
+# 'h' is mostly silent ('bahan', 'ban') and a trailing 'y' after a vowel spells the vowel ('dengey')
+SCHWA_PATTERN = re.compile(r'(?<=[^aeiou])e(?=[^aeiouy])')
+SILENT_PATTERN = re.compile(r'(?<=.)h|(?<=[aeiou])y$')
+DOUBLE_PATTERN = re.compile(r'(.)\1+')
+
+
+def phonetic_key(word: str) -> str:
+    """
+    Reduce a romanized word to its phonetic key
+    e.g. 'behenchod', 'bhenchod' and 'behanchod' all become 'bancod'
+    """
+    key = SOUND_PATTERN.sub(lambda match: SOUNDS[match.group()], word.lower())
+    key = SCHWA_PATTERN.sub('a', key)
+    key = SILENT_PATTERN.sub('', key)
+    return DOUBLE_PATTERN.sub(r'\1', key)
+
+
+class PhoneticIndex:
+    """Phonetic key -> word id for the romanized lexicon entries"""
+
+    def __init__(self, lexicon: Lexicon, roots: Iterable[str]):
+        """Key every single-word lexicon entry that contains one of the roots"""
+        roots = [root.lower() for root in roots]
+        self.lexicon = lexicon
+        self.index: Dict[str, int] = {}
+        # Entries whose key an earlier entry with the same replacement already holds
+        self.duplicates: List[Tuple[str, str]] = []
+
+        for word_id, word in enumerate(lexicon.words):
+            if len(word) < MIN_PHONETIC_LENGTH or not word.isalpha():
+                continue
+            if not any(root in word for root in roots):
+                continue
+            key = phonetic_key(word)
+            other = self.index.setdefault(key, word_id)
+            if other != word_id and lexicon.replacements[other] == lexicon.replacements[word_id]:
+                self.duplicates.append((word, lexicon.words[other]))
+
+        # Token -> key caches, one per scanning thread, so lookups never lock or contend
+        self._local = threading.local()
+        self.letters = {
+            char: letters for char, letters in lexicon.substitutions.items() if len(letters) == 1
+        }
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def lookup(self, token: str) -> Optional[int]:
+        """Return the word id whose phonetic key the token shares, if any"""
+        try:
+            keys = self._local.keys
+        except AttributeError:
+            keys = self._local.keys = {}
+        key = keys.get(token)
+        if key is None:
+            if len(keys) >= KEY_CACHE_SIZE:
+                keys.clear()
+            key = keys[token] = phonetic_key(token)
+        return self.index.get(key)
+
+    def scan(self, text: str, covered: List[Match], start: int = 0, stop: Optional[int] = None) -> Iterator[Match]:
+        """
+        Yield phonetic matches for tokens that the earlier tiers did not already cover
+        With start/stop only tokens starting in text[start:stop] are considered
+        """
+        folded = fold_case(text)
+        words, replacements = self.lexicon.words, self.lexicon.replacements
+        spans = [(match.start, match.end) for match in covered]
+        window_start, window_stop = start, len(folded) if stop is None else stop
+
+        for token, start, end in letter_tokens(folded, self.letters):
+            if start < window_start:
+                continue
+            if start >= window_stop:
+                return
+            if len(token) < MIN_PHONETIC_LENGTH:
+                continue
+            if any(start < span_end and span_start < end for span_start, span_end in spans):
+                continue
+
+            word_id = self.lookup(token)
+            if word_id is not None:
+                yield Match(text[start:end], replacements[word_id], start, end, words[word_id], 1)
@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+"""
+Replay harness: drives ProfanityBot.on_message with recorded or synthetic traffic
+against an in-process fake Discord, so the whole pipeline can be load tested offline
+The fakes simulate REST latency, 429 rate limits (retried the way discord.py does) and NotFound
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import time
+from collections import Counter, deque
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Dict, Iterable, List, Optional
+
+import discord
+
+from corpus import CLEAN_MESSAGES, PROFANE_MESSAGES
+from main import LOG_FORMAT, ProfanityBot
+from metrics import LatencyTracker, monitor_loop_lag
+
+
+class FakeRest:
+    """Stand-in for Discord's REST API: latency, per-bucket rate limits and NotFound errors"""
+
+    def __init__(self, latency: float = 0.05, jitter: float = 0.02, rate_limit: int = 5, per: float = 1.0,
+                 not_found: Optional[Dict[str, float]] = None, rng: Optional[random.Random] = None):
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit = rate_limit
+        self.per = per
+        self.not_found = not_found or {}
+        self.rng = rng or random.Random(0)
+
+        self.calls = Counter()  # Every attempt, 429s included
+        self.completed = Counter()
+        self.rate_limited = 0
+        self.not_found_errors = 0
+        self._buckets = {}
+
+    def _retry_after(self, bucket: str) -> Optional[float]:
+        """Take a slot in the bucket's sliding window, or return how long until one frees up"""
+        now = time.perf_counter()
+        window = self._buckets.setdefault(bucket, deque())
+        while window and now - window[0] >= self.per:
+            window.popleft()
+        if len(window) >= self.rate_limit:
+            return self.per - (now - window[0])
+        window.append(now)
+        return None
+
+    async def request(self, route: str, bucket: str):
+        """One REST call; 429s are retried after retry_after, as discord.py's HTTP client does"""
+        while True:
+            self.calls[route] += 1
+            await asyncio.sleep(max(0.0, self.rng.gauss(self.latency, self.jitter)))
+            retry_after = self._retry_after(bucket)
+            if retry_after is None:
+                break
+            self.rate_limited += 1
+            await asyncio.sleep(retry_after)
+
+        if self.rng.random() < self.not_found.get(route, 0.0):
+            self.not_found_errors += 1
+            raise discord.NotFound(SimpleNamespace(status=404, reason='Not Found'), f"Unknown ({route})")
+        self.completed[route] += 1
+
+
+class FakeUser:
+    """The few User/Member attributes the bot reads"""
+
+    def __init__(self, user_id: int, name: str, bot: bool = False):
+        self.id = user_id
+        self.name = name
+        self.display_name = name
+        self.bot = bot
+        self.display_avatar = SimpleNamespace(url=f"https://cdn.example/avatars/{user_id}.png")
+
+    def __str__(self) -> str:
+        return self.name
+
+
+class FakeWebhook:
+    """Channel webhook whose calls go through the fake REST API"""
+
+    def __init__(self, rest: FakeRest, channel: 'FakeTextChannel', user: FakeUser):
+        self.rest = rest
+        self.channel = channel
+        self.user = user
+        self.sent = []
+
+    async def fetch(self):
+        try:
+            await self.rest.request('fetch_webhook', f"webhook:{id(self)}")
+        except discord.NotFound:
+            # Someone deleted the webhook, later lookups must not find it either
+            if self in self.channel._webhooks:
+                self.channel._webhooks.remove(self)
+            raise
+        return self
+
+    async def send(self, content: str, **kwargs):
+        await self.rest.request('execute_webhook', f"webhook:{id(self)}")
+        self.sent.append(dict(kwargs, content=content))
+
+
+class FakeTextChannel:
+    """Text channel with webhook management and plain sends"""
+
+    def __init__(self, rest: FakeRest, channel_id: int, guild):
+        self.rest = rest
+        self.id = channel_id
+        self.name = f"channel-{channel_id}"
+        self.guild = guild
+        self._webhooks: List[FakeWebhook] = []
+        self.messages: List['FakeMessage'] = []  # History, oldest first
+
+    async def webhooks(self) -> List[FakeWebhook]:
+        await self.rest.request('channel_webhooks', f"channel:{self.id}")
+        return list(self._webhooks)
+
+    async def create_webhook(self, name: str, reason: Optional[str] = None) -> FakeWebhook:
+        await self.rest.request('create_webhook', f"channel:{self.id}")
+        webhook = FakeWebhook(self.rest, self, self.guild.me)
+        self._webhooks.append(webhook)
+        return webhook
+
+    async def send(self, content: Optional[str] = None, **kwargs):
+        await self.rest.request('send_message', f"channel:{self.id}")
+
+    async def delete_messages(self, messages: List['FakeMessage']):
+        for message in messages:
+            message.deleted = True
+        await self.rest.request('bulk_delete', f"delete:{self.id}")
+
+    async def history(self, limit: int = 100, before=None, after=None, oldest_first: bool = False):
+        """Undeleted messages between before and after, one REST call per 100 like discord.py"""
+        messages = [
+            message for message in self.messages
+            if not message.deleted and (before is None or message.id < before.id) and (after is None or message.id > after.id)
+        ]
+        messages = messages[:limit] if oldest_first else messages[::-1][:limit]
+        for i in range(0, len(messages), 100):
+            await self.rest.request('channel_history', f"channel:{self.id}")
+            for message in messages[i:i + 100]:
+                yield message
+
+
+class FakeAttachment:
+    """Attachment whose download goes through the fake REST API"""
+
+    def __init__(self, rest: FakeRest, filename: str):
+        self.rest = rest
+        self.filename = filename
+
+    async def to_file(self, filename: Optional[str] = None):
+        await self.rest.request('download_attachment', 'cdn')
+        return SimpleNamespace(filename=filename or self.filename)
+
+
+class FakeMessage:
+    """Incoming message; delete() goes through the channel's rate limit bucket"""
+
+    def __init__(self, message_id: int, content: str, author: FakeUser, channel: FakeTextChannel,
+                 embeds: Optional[List[Dict]] = None, attachments: Optional[List[str]] = None,
+                 created_at: Optional[datetime] = None):
+        self.id = message_id
+        self.content = content
+        self.author = author
+        self.channel = channel
+        self.guild = channel.guild
+        self.embeds = [SimpleNamespace(title=embed.get('title'), description=embed.get('description')) for embed in embeds or ()]
+        self.attachments = [FakeAttachment(channel.rest, filename) for filename in attachments or ()]
+        self.created_at = created_at or discord.utils.utcnow()
+        self.deleted = False
+
+    async def delete(self):
+        self.deleted = True  # Set first, a NotFound still means the bot acted on the message
+        await self.channel.rest.request('delete_message', f"delete:{self.channel.id}")
+
+
+class ReplayBot(ProfanityBot):
+    """ProfanityBot with a fake logged-in user and command processing turned off"""
+
+    def __init__(self, user: FakeUser):
+        super().__init__()
+        self._replay_user = user
+
+    @property
+    def user(self):
+        return self._replay_user
+
+    async def process_commands(self, message):
+        # Command dispatch needs a gateway connection and is not part of the filter pipeline
+        return None
+
+
+def load_messages(path: str) -> List[Dict]:
+    """
+    Read recorded traffic: JSON lines with 'content' and optional 'author_id', 'channel_id',
+    'embeds' (objects with 'title' / 'description') and 'attachments' (filenames)
+    """
+    with open(path, 'r') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def synthetic_messages(count: int, profane_ratio: float, authors: int, channels: int, seed: int = 0) -> List[Dict]:
+    """Sample corpus messages with the given share of profanity"""
+    rng = random.Random(seed)
+    return [
+        {
+            'content': rng.choice(PROFANE_MESSAGES if rng.random() < profane_ratio else CLEAN_MESSAGES),
+            'author_id': rng.randrange(authors),
+            'channel_id': rng.randrange(channels),
+        }
+        for _ in range(count)
+    ]
+
+
+async def replay(records: Iterable[Dict], rest: FakeRest, rate: float = 200.0) -> Dict:
+    """
+    Feed the records into on_message at the given rate (messages per second, 0 for all at once)
+    and return the end-to-end report
+    """
+    guild = SimpleNamespace(id=1, name='replay-guild')
+    guild.me = FakeUser(10 ** 9, 'ProfanityBot', bot=True)
+    bot = ReplayBot(guild.me)
+    channels: Dict[int, FakeTextChannel] = {}
+    authors: Dict[int, FakeUser] = {}
+
+    latency = LatencyTracker()
+    loop_lag = LatencyTracker()
+    lag_task = asyncio.create_task(monitor_loop_lag(loop_lag))
+    messages = []
+
+    async def handle(message: FakeMessage, arrived: float):
+        await bot.on_message(message)
+        latency.record(time.perf_counter() - arrived)
+
+    started = time.perf_counter()
+    tasks = []
+    for message_id, record in enumerate(records):
+        channel_id = record.get('channel_id', 0)
+        author_id = record.get('author_id', 0)
+        channel = channels.setdefault(channel_id, FakeTextChannel(rest, channel_id, guild))
+        author = authors.setdefault(author_id, FakeUser(author_id, f"user{author_id}"))
+        message = FakeMessage(message_id, record['content'], author, channel,
+                              record.get('embeds'), record.get('attachments'))
+        messages.append(message)
+
+        # discord.py dispatches every event as its own task
+        tasks.append(asyncio.create_task(handle(message, time.perf_counter())))
+        if rate:
+            next_arrival = started + (message_id + 1) / rate
+            await asyncio.sleep(max(0.0, next_arrival - time.perf_counter()))
+        else:
+            await asyncio.sleep(0)
+
+    await asyncio.gather(*tasks)
+    # Flood mode purges run on their own timers
+    await asyncio.gather(*bot.purge_tasks.values())
+    elapsed = time.perf_counter() - started
+    lag_task.cancel()
+
+    flagged = sum(message.deleted for message in messages)
+    rest_calls = sum(rest.calls.values())
+    return {
+        'messages': len(messages),
+        'flagged': flagged,
+        'seconds': elapsed,
+        'throughput': len(messages) / elapsed if elapsed else 0.0,
+        'latency': latency.summary(),
+        'loop_lag': loop_lag.summary(),
+        'rest_calls': dict(rest.calls),
+        'rest_completed': dict(rest.completed),
+        'rest_calls_per_flagged': rest_calls / flagged if flagged else 0.0,
+        'rate_limited': rest.rate_limited,
+        'not_found': rest.not_found_errors,
+        'flood': bot.flood_guard.get_statistics(),
+        'fingerprints': bot.fingerprints.get_statistics() if bot.fingerprints is not None else None,
+    }
+
+
+def print_report(report: Dict):
+    """Human readable summary of a replay"""
+    print(f"\n🎬 Replayed {report['messages']} messages ({report['flagged']} flagged) in {report['seconds']:.2f}s")
+    print(f"   Throughput:        {report['throughput']:10.1f} msg/s")
+    latency = report['latency']
+    print(f"   End-to-end:        p50 {latency['p50_ms']:8.1f} ms  p95 {latency['p95_ms']:8.1f} ms  "
+          f"p99 {latency['p99_ms']:8.1f} ms  max {latency['max_ms']:8.1f} ms")
+    lag = report['loop_lag']
+    print(f"   Event loop lag:    p50 {lag['p50_ms']:8.2f} ms  p99 {lag['p99_ms']:8.2f} ms  max {lag['max_ms']:8.2f} ms")
+    calls = ', '.join(f"{route} {count}" for route, count in sorted(report['rest_calls'].items()))
+    print(f"   REST calls:        {sum(report['rest_calls'].values())} ({calls or 'none'})")
+    print(f"   Per flagged msg:   {report['rest_calls_per_flagged']:10.2f} REST calls")
+    print(f"   429 retries:       {report['rate_limited']:10d}")
+    print(f"   NotFound errors:   {report['not_found']:10d}")
+    flood = report['flood']
+    print(f"   Flood mode:        {flood['floods']:10d} floods, {flood['cheap_actions']} deleted without repost")
+    fingerprints = report['fingerprints']
+    if fingerprints is not None:
+        print(f"   Fingerprints:      {fingerprints['entries']:10d} kept, {fingerprints['exact_hits']} exact and "
+              f"{fingerprints['near_hits']} near copies, lookup p99 {fingerprints['lookup_p99_us']:.1f} µs")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay traffic through ProfanityBot.on_message against a fake Discord")
+    parser.add_argument('--file', help="recorded traffic as JSON lines (default: synthetic corpus traffic)")
+    parser.add_argument('--messages', type=int, default=1000, help="synthetic message count")
+    parser.add_argument('--profane-ratio', type=float, default=0.2, help="share of synthetic messages with profanity")
+    parser.add_argument('--authors', type=int, default=50, help="distinct synthetic authors")
+    parser.add_argument('--channels', type=int, default=5, help="distinct synthetic channels")
+    parser.add_argument('--rate', type=float, default=200.0, help="arrival rate in messages per second (0 = burst)")
+    parser.add_argument('--latency-ms', type=float, default=50.0, help="mean REST latency")
+    parser.add_argument('--jitter-ms', type=float, default=20.0, help="REST latency standard deviation")
+    parser.add_argument('--rate-limit', type=int, default=5, help="requests per bucket per window before a 429")
+    parser.add_argument('--per', type=float, default=1.0, help="rate limit window in seconds")
+    parser.add_argument('--not-found', type=float, default=0.01, help="chance a delete or webhook fetch hits NotFound")
+    parser.add_argument('--json', action='store_true', help="print the report as JSON")
+    parser.add_argument('--verbose', action='store_true', help="keep the bot's per-message logging")
+    args = parser.parse_args()
+
+    # Console only; discord_bot.log is the live bot's log
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING, format=LOG_FORMAT)
+
+    if args.file:
+        records = load_messages(args.file)
+    else:
+        records = synthetic_messages(args.messages, args.profane_ratio, args.authors, args.channels)
+
+    rest = FakeRest(
+        latency=args.latency_ms / 1000, jitter=args.jitter_ms / 1000, rate_limit=args.rate_limit, per=args.per,
+        not_found={'delete_message': args.not_found, 'fetch_webhook': args.not_found}
+    )
+    report = asyncio.run(replay(records, rest, args.rate))
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print("🤖 Profanity Bot Replay Harness")
+        print("=" * 60)
+        print_report(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Script detection for routing messages to per-language lexicon partitions
+Latin covers English and romanized Indian languages; native-script words go to the
+partition of their script, which only runs when a message contains that script
+"""
+
+import unicodedata
+from typing import Dict, FrozenSet, Iterable
+
+# The main partition: Latin script, plus anything else the confusables fold onto it
+LATIN = 'latin'
+
+# Indic Unicode blocks are 128 code points each, starting at U+0900
+INDIC_START = 0x0900
+INDIC_BLOCKS = ('devanagari', 'bengali', 'gurmukhi', 'gujarati', 'oriya', 'tamil', 'telugu', 'kannada', 'malayalam')
+INDIC_END = INDIC_START + 128 * len(INDIC_BLOCKS)
+
+# What each partition covers, for statistics and the help text
+SCRIPT_LANGUAGES = {
+    LATIN: 'English and romanized Indian languages',
+    'devanagari': 'Hindi',
+    'bengali': 'Bengali',
+    'gurmukhi': 'Punjabi',
+    'tamil': 'Tamil',
+    'telugu': 'Telugu',
+}
+
+# Combining marks (Indic vowel signs, viramas, nuqtas) belong to the word they sit on,
+# although str.isalnum() is False for them
+WORD_MARKS = frozenset(
+    chr(code) for code in range(0x0300, 0x10000) if unicodedata.category(chr(code)) in ('Mn', 'Mc')
+)
+
+LATIN_ONLY = frozenset((LATIN,))
+
+
+def script_of(char: str) -> str:
+    """The partition a character belongs to"""
+    code = ord(char)
+    if INDIC_START <= code < INDIC_END:
+        return INDIC_BLOCKS[(code - INDIC_START) >> 7]
+    return LATIN
+
+
+def detect_scripts(text: str) -> FrozenSet[str]:
+    """
+    The partitions a text needs: every Indic script it contains, plus Latin when it has
+    any other non-space character, since symbols alone can spell a word ('@$$').
+    ASCII text, by far the most common, is answered at C speed
+    """
+    if text.isascii():
+        return LATIN_ONLY
+    scripts = set()
+    for char in set(text):
+        code = ord(char)
+        if INDIC_START <= code < INDIC_END:
+            scripts.add(INDIC_BLOCKS[(code - INDIC_START) >> 7])
+        elif not char.isspace():
+            scripts.add(LATIN)
+    return frozenset(scripts)
+
+
+def word_script(word: str) -> str:
+    """The partition of a lexicon entry: its Indic script if it is written in one, otherwise Latin"""
+    scripts = {script_of(char) for char in word if char.isalnum() or char in WORD_MARKS}
+    return scripts.pop() if len(scripts) == 1 else LATIN
+
+
+def partition_by_script(words: Dict[str, str]) -> Dict[str, Dict[str, str]]:
+    """
+    Split a word table into per-script tables
+    Native-script entries are also stored in their other canonical form (e.g. 'ো' as 'ে' + 'া'),
+    since messages arrive in either
+    """
+    partitions = {LATIN: {}}
+    for word, replacement in words.items():
+        script = word_script(word)
+        table = partitions.setdefault(script, {})
+        table[word] = replacement
+        if script != LATIN:
+            for form in ('NFC', 'NFD'):
+                table.setdefault(unicodedata.normalize(form, word), replacement)
+    return partitions
+
+
+def mark_class(marks: Iterable[str] = WORD_MARKS) -> str:
+    """Regex character class body matching word characters and combining marks"""
+    ranges = []
+    for code in sorted(ord(mark) for mark in marks):
+        if ranges and ranges[-1][1] == code - 1:
+            ranges[-1][1] = code
+        else:
+            ranges.append([code, code])
+    return '\\w' + ''.join(
+        f"\\u{low:04x}" if low == high else f"\\u{low:04x}-\\u{high:04x}" for low, high in ranges
+    )
+
+
+WORD_CHAR_CLASS = mark_class()
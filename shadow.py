@@ -0,0 +1,133 @@
+"""
+Shadow mode for rolling out filter changes safely
+A candidate WordFilter runs next to the active one on a sample of live messages, in a
+worker thread, and every comparison is appended to a JSON lines file. The shadow side
+only records; it never deletes or reposts anything.
+"""
+
+import asyncio
+import json
+import logging
+import random
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from config import SHADOW_FILTER_OPTIONS, SHADOW_SAMPLE_RATE, SHADOW_MAX_PENDING, SHADOW_LOG_FILE
+from word_filter import WordFilter
+
+logger = logging.getLogger(__name__)
+
+
+class ShadowRunner:
+    """Compares a candidate filter against the bot's active filter on sampled messages"""
+
+    def __init__(self, bot, options: Optional[Dict] = None, sample_rate: Optional[float] = None,
+                 log_path: Optional[str] = None, max_pending: Optional[int] = None,
+                 rng: Optional[random.Random] = None):
+        self.bot = bot
+        self.options = options if options is not None else SHADOW_FILTER_OPTIONS
+        self.sample_rate = SHADOW_SAMPLE_RATE if sample_rate is None else sample_rate
+        self.log_path = log_path or SHADOW_LOG_FILE
+        self.max_pending = SHADOW_MAX_PENDING if max_pending is None else max_pending
+        self.rng = rng or random.Random()
+
+        self._candidate = None
+        self._source = None
+        self._build_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._pending = set()
+
+        self.samples = 0
+        self.disagreements = 0
+        self.skipped = 0
+        self.total_delta = 0.0
+
+    def candidate_for(self, active: WordFilter) -> WordFilter:
+        """Candidate filter over the active filter's word tables, rebuilt whenever those change"""
+        with self._build_lock:
+            # Word changes and hot reloads both produce a new snapshot
+            snapshot = active.snapshot
+            if self._source is not snapshot:
+                tables = {
+                    'bad_words': snapshot.bad_words,
+                    'obfuscation_chars': active.obfuscation_chars,
+                    'separators': active.separators,
+                    'priorities': active.priorities,
+                    'safe_phrases': active.safe_phrases,
+                    'context_rules': {},  # already expanded into safe_phrases
+                }
+                # The options may replace tables too, e.g. to try out a new safe phrase list
+                tables.update(self.options)
+                self._candidate = WordFilter(**tables)
+                self._source = snapshot
+                logger.info(f"Built shadow filter with {self.options}")
+            return self._candidate
+
+    def observe(self, message, active: WordFilter, active_result: Tuple[str, bool], active_seconds: float):
+        """
+        Maybe sample a message the active filter just handled
+        The comparison is scheduled in a worker thread and never awaited by on_message
+        """
+        if self.rng.random() >= self.sample_rate:
+            return
+        if len(self._pending) >= self.max_pending:
+            self.skipped += 1
+            return
+
+        task = asyncio.create_task(asyncio.to_thread(
+            self.compare, active, message.content, active_result, active_seconds,
+            {'message_id': message.id, 'channel_id': message.channel.id}
+        ))
+        self._pending.add(task)
+        task.add_done_callback(self._finished)
+
+    def _finished(self, task: asyncio.Task):
+        """Forget a finished comparison and log it if it failed"""
+        self._pending.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Shadow comparison failed: {task.exception()}")
+
+    def compare(self, active: WordFilter, content: str, active_result: Tuple[str, bool],
+                active_seconds: float, context: Optional[Dict] = None) -> Dict:
+        """Run the candidate on one message and append the comparison to the log file"""
+        candidate = self.candidate_for(active)
+        started = time.perf_counter()
+        candidate_result = candidate.filter_message(content)
+        candidate_seconds = time.perf_counter() - started
+
+        agree = candidate_result == active_result
+        record = dict(context or {})
+        record.update({
+            'time': time.time(),
+            'agree': agree,
+            'active_ms': round(active_seconds * 1000, 3),
+            'candidate_ms': round(candidate_seconds * 1000, 3),
+            'delta_ms': round((candidate_seconds - active_seconds) * 1000, 3),
+        })
+        if not agree:
+            record.update({
+                'content': content,
+                'active': active_result[0],
+                'candidate': candidate_result[0],
+                'active_flagged': active_result[1],
+                'candidate_flagged': candidate_result[1],
+            })
+
+        with self._write_lock:
+            self.samples += 1
+            self.disagreements += not agree
+            self.total_delta += candidate_seconds - active_seconds
+            with open(self.log_path, 'a') as f:
+                f.write(json.dumps(record) + '\n')
+        return record
+
+    def get_statistics(self) -> Dict[str, float]:
+        """Get counters for the status command"""
+        return {
+            'samples': self.samples,
+            'disagreements': self.disagreements,
+            'skipped': self.skipped,
+            'pending': len(self._pending),
+            'mean_delta_ms': self.total_delta * 1000 / self.samples if self.samples else 0.0
+        }
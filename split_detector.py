@@ -0,0 +1,115 @@
+"""
+Cross-message detection of words spelled out over several short messages ('f', 'u', 'c', 'k')
+Keeps a small ring buffer of recent fragments per channel and author, bounded by count,
+age and number of buffers, and scans only that buffer when a new fragment arrives
+"""
+
+import logging
+import time
+from collections import OrderedDict, deque
+from typing import Callable, Iterable, List, Optional, Tuple
+
+from config import (
+    SPLIT_MAX_FRAGMENT_LENGTH, SPLIT_WINDOW_MESSAGES, SPLIT_TTL_SECONDS, SPLIT_MAX_BUFFERS, SPLIT_COMMON_FRAGMENTS
+)
+from word_filter import WordFilter
+
+logger = logging.getLogger(__name__)
+
+
+class SplitWordDetector:
+    """Rolling windows of short messages per (channel, author), scanned as one text"""
+
+    def __init__(self, max_fragment_length: Optional[int] = None, window: Optional[int] = None,
+                 ttl: Optional[float] = None, max_buffers: Optional[int] = None,
+                 common_fragments: Optional[Iterable[str]] = None, clock: Callable[[], float] = time.monotonic):
+        self.max_fragment_length = max_fragment_length or SPLIT_MAX_FRAGMENT_LENGTH
+        self.window = window or SPLIT_WINDOW_MESSAGES
+        self.ttl = ttl or SPLIT_TTL_SECONDS
+        self.max_buffers = max_buffers or SPLIT_MAX_BUFFERS
+        self.common_fragments = frozenset(
+            fragment.lower() for fragment in (SPLIT_COMMON_FRAGMENTS if common_fragments is None else common_fragments)
+        )
+        self.clock = clock
+
+        # (channel_id, author_id) -> deque of (timestamp, text, message), least recently used first
+        self.buffers: OrderedDict = OrderedDict()
+        self.detections = 0
+
+    def __len__(self) -> int:
+        return len(self.buffers)
+
+    def reset(self, channel_id: int, author_id: int):
+        """Forget the fragments of one author in one channel"""
+        self.buffers.pop((channel_id, author_id), None)
+
+    def _sweep(self, now: float):
+        """Drop buffers whose newest fragment has expired; they sit at the front of the LRU order"""
+        while self.buffers:
+            key, buffer = next(iter(self.buffers.items()))
+            if buffer and now - buffer[-1][0] <= self.ttl:
+                break
+            del self.buffers[key]
+
+    def observe(self, word_filter: WordFilter, channel_id: int, author_id: int,
+                message) -> Optional[Tuple[List, str]]:
+        """
+        Add a message that passed the filter on its own
+        Returns (fragment_messages, filtered_text) when the latest fragments spell out a bad word
+        together; the cost is bounded by the window, not by the channel history
+        """
+        now = self.clock()
+        key = (channel_id, author_id)
+        content = message.content.strip()
+        if not content or len(content) > self.max_fragment_length:
+            # A regular message ends any word being spelled out
+            self.buffers.pop(key, None)
+            self._sweep(now)
+            return None
+
+        buffer = self.buffers.get(key)
+        if buffer is None:
+            buffer = self.buffers[key] = deque(maxlen=self.window)
+            if len(self.buffers) > self.max_buffers:
+                self.buffers.popitem(last=False)
+        else:
+            self.buffers.move_to_end(key)
+        while buffer and now - buffer[0][0] > self.ttl:
+            buffer.popleft()
+        buffer.append((now, content, message))
+        self._sweep(now)
+        if len(buffer) < 2:
+            return None
+
+        # Fragments are joined with spaces, which the matcher reads as separators ('f u c k')
+        texts = [text for _, text, _ in buffer]
+        joined = ' '.join(texts)
+        starts = {}
+        offset = 0
+        for index, text in enumerate(texts):
+            starts[offset] = index
+            offset += len(text) + 1
+
+        # A match counts only if it spells whole fragments, from one fragment's start to the end
+        # of the newest, with no substitutions: a gap between messages is weak evidence already
+        first = None
+        for match in word_filter.iter_matches(joined):
+            index = starts.get(match.start)
+            if index is None or index == len(texts) - 1 or match.edits:
+                continue
+            if match.end <= len(joined) - len(content) or any(char.isalnum() for char in joined[match.end:]):
+                continue
+            if all(text.lower() in self.common_fragments for text in texts[index:]):
+                continue
+            first = index
+            break
+        if first is None:
+            return None
+
+        filtered_text, _ = word_filter.filter_message(' '.join(texts[first:]))
+        messages = [message for _, _, message in list(buffer)[first:]]
+
+        del self.buffers[key]
+        self.detections += 1
+        logger.info(f"Word spelled out over {len(messages)} messages in channel {channel_id}")
+        return messages, filtered_text
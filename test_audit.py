@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Tests for offline audits of stored messages
+"""
+
+from audit import audit, scan_deduplicated
+from corpus import CLEAN_MESSAGES, PROFANE_MESSAGES
+from word_filter import WordFilter
+
+
+def spans(matches):
+    return [(match.text, match.start, match.end, match.word) for match in matches]
+
+
+def test_deduplicated_matches_per_message_path():
+    """Deduplicated results equal find_matches for every message, duplicates and workers included"""
+    word_filter = WordFilter()
+    messages = (CLEAN_MESSAGES + PROFANE_MESSAGES) * 3 + ['', 'x' * 2001]
+    expected = [spans(word_filter.find_matches(message)) for message in messages]
+
+    for workers in (1, 3):
+        results = scan_deduplicated(word_filter, messages, workers, chunk_size=4)
+        assert [spans(matches) for matches in results] == expected
+
+    # Copies of a text never share Match records
+    results = scan_deduplicated(word_filter, ["damn it", "damn it"])
+    assert results[0][0] is not results[1][0]
+
+
+def test_audit():
+    """Only flagged messages are reported, with their positions in the input"""
+    word_filter = WordFilter()
+    flagged = list(audit(word_filter, ["hello there", "what the fuck", "hello there", "sh1t"]))
+    assert [index for index, _ in flagged] == [1, 3]
+    assert [match.word for match in flagged[0][1]] == ['fuck']
+
+
+if __name__ == "__main__":
+    for name, func in list(globals().items()):
+        if name.startswith('test_'):
+            func()
+            print(f"✅ {name}")
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Tests for the lexicon compiler's validation and artifact
+"""
+
+from compile_lexicon import find_overlaps, load_artifact, merge_sources, write_artifact
+from config import OBFUSCATION_CHARS, SEPARATORS
+from lexicon import Lexicon
+
+
+def test_merge_reports_dropped_and_conflicting_entries():
+    """Short, letterless, duplicated, conflicting and multi-word entries are all reported"""
+    sources = [
+        ('config.py', {'shit': 'poopoo', 'bc': 'oops', 'ball gag': 'mouth accessory', 'damn': 'dang'}),
+        ('custom.json', {'shit': 'poopoo', 'damn': 'darn', '1244': '3457', 'Damn': 'dang'}),
+    ]
+    merged, issues = merge_sources(sources, min_word_length=3)
+
+    assert 'bc' not in merged and merged['damn'] == 'darn'
+    assert issues['too_short'] == [('bc', 'config.py')]
+    assert issues['no_letters'] == [('1244', 'custom.json')]
+    assert issues['duplicates'] == [('shit', 'config.py', 'custom.json')]
+    assert issues['conflicts'] == [('damn', 'config.py', 'custom.json', 'dang', 'darn')]
+    assert issues['case_collisions'] == [('Damn', 'damn')]
+    assert issues['phrases'] == [('ball gag', 'config.py')]
+
+
+def test_overlaps():
+    """Entries another entry already reads as, and entries containing another, are found"""
+    words = {'shit': 'poopoo', '5h1t': 'poopoo', 'sh1t': 'crap', 'shit head': 'poopoo head', 'ass': 'butt', 'azz': 'butt'}
+    overlaps = find_overlaps(Lexicon(words, OBFUSCATION_CHARS, SEPARATORS))
+
+    assert overlaps['redundant'] == [('5h1t', 'shit')]
+    # Neither of two entries reading as each other is named for deletion
+    assert overlaps['mutual'] == [('ass', 'azz')]
+    assert overlaps['variants'] == [('5h1t', 'sh1t'), ('sh1t', 'shit')]
+    assert overlaps['contains'] == [('shit head', 'shit')]
+    assert overlaps['unmatchable'] == []
+
+
+def test_artifact_round_trip(tmp_path):
+    """The pickled lexicon scans exactly like the one it was written from"""
+    from word_filter import WordFilter
+    word_filter = WordFilter()
+    path = tmp_path / 'lexicon.pickle'
+    write_artifact(word_filter, str(path))
+    lexicon = load_artifact(str(path))
+
+    message = "What the fuck, this sh1t is b-i-t-c-h"
+    assert [tuple(m) for m in lexicon.scan(message)] == [tuple(m) for m in word_filter.lexicon.scan(message)]
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Bypass-recall test for Unicode look-alikes, invisible characters and combining marks
+Each profane word is rewritten with several homoglyph tricks; the filter should still catch them
+"""
+
+from normalization import fold_confusables
+from word_filter import WordFilter
+
+WORDS = ['fuck', 'shit', 'bitch', 'asshole', 'bastard', 'damn', 'crap', 'madarchod', 'chutiya', 'randi']
+
+CYRILLIC = {'a': 'а', 'c': 'с', 'e': 'е', 'i': 'і', 'o': 'о', 'p': 'р', 's': 'ѕ', 'h': 'һ', 'd': 'ԁ', 'y': 'у', 'k': 'к'}
+GREEK = {'a': 'α', 'i': 'ι', 'k': 'κ', 'o': 'ο', 't': 'τ', 'u': 'υ', 'n': 'η'}
+
+
+def bypass_variants(word: str):
+    """Yield (trick, variant) pairs for a word"""
+    yield 'cyrillic', ''.join(CYRILLIC.get(c, c) for c in word)
+    yield 'greek', ''.join(GREEK.get(c, c) for c in word)
+    yield 'fullwidth', ''.join(chr(ord(c) + 0xFEE0) for c in word)
+    yield 'math bold', ''.join(chr(0x1D41A + ord(c) - ord('a')) for c in word)
+    yield 'circled', ''.join(chr(0x24D0 + ord(c) - ord('a')) for c in word)
+    yield 'zero width', '\u200b'.join(word)
+    yield 'soft hyphen', '\u00ad'.join(word)
+    yield 'zalgo', ''.join(c + '\u0336' for c in word)
+    yield 'accents', word.replace('a', 'á').replace('i', 'ï').replace('u', 'ü').replace('o', 'ö')
+
+
+def measure_bypass_recall(word_filter: WordFilter):
+    """Return (recall, missed variants) over the bypass corpus"""
+    total = 0
+    missed = []
+    for word in WORDS:
+        for trick, variant in bypass_variants(word):
+            total += 1
+            if not word_filter.contains_bad_word(f"you are such a {variant} honestly"):
+                missed.append((trick, variant))
+    return 1 - len(missed) / total, missed
+
+
+def test_bypass_recall():
+    """At least 95% of the homoglyph variants are caught"""
+    recall, missed = measure_bypass_recall(WordFilter())
+    assert recall >= 0.95, missed
+
+
+def test_positions_map_back():
+    """Replacements land on the original characters, invisible ones included"""
+    word_filter = WordFilter()
+
+    assert word_filter.filter_message("so f\u200bu\u200bc\u200bk it") == ("so fluff it", True)
+    assert word_filter.filter_message("f\u0336u\u0336c\u0336k\u0336 it") == ("fluff it", True)
+    assert word_filter.filter_message("ｆｕｃｋ this") == ("fluff this", True)
+
+
+def test_other_scripts_untouched():
+    """Clean accented text and Indic scripts survive folding"""
+    assert fold_confusables("बहनचोद नमस्ते")[0] == "बहनचोद नमस्ते"
+    assert not WordFilter().contains_bad_word("Café crème and a naïve piñata")
+
+
+def test_cyrillic_and_greek_words_untouched():
+    """Look-alikes are only folded in words that mix them with Latin letters"""
+    for text in ["У меня болит рот", "Мой кот спит", "Καλημέρα, τι κάνεις;", "Ο Τάκης είναι εκεί"]:
+        assert fold_confusables(text)[0] == text
+    assert fold_confusables("рот pоt")[0] == "рот pot"
+    for engine in ('compiled', 'regex'):
+        word_filter = WordFilter(engine=engine)
+        assert word_filter.filter_message("У меня болит рот") == ("У меня болит рот", False)
+        assert word_filter.filter_message("мой fuсk рот") == ("мой fluff рот", True)
+
+
+if __name__ == "__main__":
+    recall, missed = measure_bypass_recall(WordFilter())
+    print(f"🔤 Bypass recall: {recall:.1%}")
+    for trick, variant in missed:
+        print(f"   missed ({trick}): {variant!r}")
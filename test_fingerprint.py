@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Tests for duplicate-spam fingerprinting
+"""
+
+from fingerprint import FingerprintIndex, normalize, sketch, similarity
+
+RAID = "Copy this message to every channel or your account gets banned tonight, fuck the mods"
+
+
+def test_similarity():
+    """Near copies of a message share most of their sketch, unrelated messages share none of it"""
+    original = sketch(normalize(RAID))
+    assert similarity(original, sketch(normalize("COPY this message to every channel or your account gets banned tonight!!! fuck the mods lol"))) >= 0.6
+    assert similarity(original, sketch(normalize("Did anyone finish the homework for tomorrow, I am stuck on question four"))) < 0.2
+
+
+def test_exact_and_near_copies():
+    """Exact copies hit at once, near copies only once the original has become a raid"""
+    index = FingerprintIndex(min_copies=3)
+    index.add(RAID, "filtered")
+    near = RAID.replace("tonight", "today").upper()
+
+    assert index.match(RAID).filtered == "filtered"
+    assert index.match(near) is None  # not a raid yet
+    assert index.match(RAID) is not None
+    assert index.match(near) is not None
+    assert index.match("What the fuck") is None
+    assert index.match("Did anyone finish the homework for tomorrow, I am stuck on question four") is None
+
+    stats = index.get_statistics()
+    assert stats['exact_hits'] == 2 and stats['near_hits'] == 1 and stats['raids'] == 1
+
+
+def test_window_and_size_bounds():
+    """Fingerprints expire after the window and the index never outgrows its cap"""
+    now = [0.0]
+    index = FingerprintIndex(window=10, max_entries=2, min_copies=1, clock=lambda: now[0])
+    index.add(RAID, "filtered")
+    index.match(RAID)
+    assert index.raids
+
+    now[0] = 11
+    assert index.match(RAID) is None
+    assert len(index) == 0 and not index.raids
+
+    for i in range(5):
+        index.add(f"message number {i}", "filtered")
+    assert len(index) == 2
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Tests for the per-author and per-channel token buckets behind flood mode
+"""
+
+from flood_guard import FloodGuard, TokenBuckets
+
+
+def test_token_buckets_refill_and_sweep():
+    """Buckets refill at the configured rate and full ones are swept away"""
+    buckets = TokenBuckets(per_minute=60, burst=3)
+    assert [buckets.take('a', 0.0) for _ in range(4)] == [True, True, True, False]
+    assert buckets.take('a', 1.0)  # one token per second
+    assert not buckets.take('a', 1.0)
+
+    buckets.take('b', 0.0)
+    buckets.sweep(3.5)
+    assert list(buckets.buckets) == ['a']  # 'b' has refilled, 'a' has not yet
+    buckets.sweep(4.0)
+    assert len(buckets) == 0
+
+
+def test_flood_mode():
+    """Authors over their message rate and channels over their repost rate lose reposts for a while"""
+    now = [0.0]
+    guard = FloodGuard(user_rate=3, channel_rate=2, flood_seconds=10, action='delete', sweep_interval=5,
+                       clock=lambda: now[0])
+
+    # A channel spends its repost budget, then stays in flood mode after it refills
+    assert guard.allow_repost(1, 100) and guard.allow_repost(1, 101)
+    assert not guard.allow_repost(1, 102)
+    assert guard.allow_repost(2, 100)
+    now[0] = 9.0
+    assert not guard.allow_repost(1, 103)
+    now[0] = 40.0
+    assert guard.allow_repost(1, 103)
+
+    # An author who floods loses reposts in every channel
+    for _ in range(4):
+        guard.observe(200)
+    assert not guard.allow_repost(3, 200)
+    assert guard.allow_repost(3, 201)
+
+    stats = guard.get_statistics()
+    assert stats['floods'] == 2 and stats['cheap_actions'] == 3
+
+    now[0] = 100.0
+    guard.observe(201)
+    stats = guard.get_statistics()
+    assert stats['tracked_authors'] == 1 and stats['tracked_channels'] == 0
+    assert stats['flooded_channels'] == 0 and stats['flooded_authors'] == 0
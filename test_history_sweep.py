@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Tests for retroactive history sweeps: page scans, rate limited deletes and resumable checkpoints
+"""
+
+import asyncio
+import json
+from datetime import timedelta
+from types import SimpleNamespace
+
+import discord
+
+from history_sweep import HistorySweeper
+from replay import FakeMessage, FakeRest, FakeTextChannel, FakeUser
+from word_filter import WordFilter
+
+
+def fake_bot(*channels):
+    """The bot attributes a sweep reads"""
+    return SimpleNamespace(
+        word_filter=WordFilter(),
+        should_filter=lambda message: not message.author.bot,
+        get_channel={channel.id: channel for channel in channels}.get,
+    )
+
+
+def fake_channel(channel_id: int, texts, first_id: int = 1) -> FakeTextChannel:
+    """A channel whose history holds the texts, oldest first"""
+    rest = FakeRest(latency=0.0, jitter=0.0, rate_limit=1000)
+    guild = SimpleNamespace(id=1, name='guild', me=FakeUser(0, 'bot', bot=True))
+    channel = FakeTextChannel(rest, channel_id, guild)
+    author = FakeUser(2, 'user')
+    channel.messages = [FakeMessage(first_id + i, text, author, channel) for i, text in enumerate(texts)]
+    return channel
+
+
+def test_sweep_deletes_flagged_history(tmp_path):
+    """Flagged messages go in bulk deletes, old ones one by one; bots and clean messages stay"""
+    texts = ["hello", "what the fuck", "nice weather", "sh1t happens", "damn it"] * 10
+    channel = fake_channel(5, texts)
+    channel.messages[0].author = FakeUser(3, 'other bot', bot=True)
+    channel.messages[1].author = channel.messages[0].author
+    old = channel.messages[3]
+    old.created_at = discord.utils.utcnow() - timedelta(days=30)
+
+    sweeper = HistorySweeper(fake_bot(channel), str(tmp_path / 'sweeps.json'), page_size=20, deletes_per_minute=6000)
+
+    async def run():
+        assert await sweeper.start(channel)
+        assert not await sweeper.start(channel)
+        await sweeper.tasks[channel.id]
+
+    asyncio.run(run())
+    flagged = [message for message in channel.messages if message.content != "hello" and message.content != "nice weather"]
+    assert all(message.deleted for message in flagged[1:])
+    assert not channel.messages[1].deleted
+    assert not any(message.deleted for message in channel.messages if message not in flagged)
+    assert channel.rest.completed['delete_message'] == 1
+    assert channel.rest.completed['bulk_delete'] == 3
+
+    report = sweeper.get_statistics()[0]
+    assert report['done'] and not report['running']
+    assert (report['scanned'], report['flagged'], report['deleted']) == (50, 29, 29)
+    assert report['messages_per_second'] > 0
+    assert json.loads((tmp_path / 'sweeps.json').read_text())['5']['done']
+
+
+def test_concurrent_starts(tmp_path):
+    """Two starts for one channel racing each other launch a single sweep"""
+    channel = fake_channel(5, ["what the fuck", "hello"] * 15)
+    sweeper = HistorySweeper(fake_bot(channel), str(tmp_path / 'sweeps.json'), page_size=10, deletes_per_minute=6000)
+
+    async def run():
+        started = await asyncio.gather(sweeper.start(channel), sweeper.start(channel, days=1))
+        tasks = list(sweeper.tasks.values())
+        await asyncio.gather(*tasks)
+        return started, tasks
+
+    started, tasks = asyncio.run(run())
+    assert sorted(started) == [False, True] and len(tasks) == 1
+    report = sweeper.get_statistics()[0]
+    assert (report['scanned'], report['flagged'], report['deleted']) == (30, 15, 15)
+    assert sweeper.checkpoints['5']['after'] is None
+
+
+def test_sweep_resumes_from_checkpoint(tmp_path):
+    """A restarted sweep only scans below its checkpoint"""
+    channel = fake_channel(5, ["what the fuck"] * 30)
+    path = str(tmp_path / 'sweeps.json')
+    sweeper = HistorySweeper(fake_bot(channel), path, page_size=10, deletes_per_minute=6000)
+
+    fetch_page = sweeper.fetch_page
+    fetched = []
+
+    async def stop_after_first_page(channel, checkpoint):
+        # The first page is checkpointed by the time the second one is fetched
+        if fetched:
+            sweeper.stop(channel.id)
+            await asyncio.sleep(0)
+        fetched.append(checkpoint['before'])
+        return await fetch_page(channel, checkpoint)
+
+    sweeper.fetch_page = stop_after_first_page
+
+    async def first_page():
+        await sweeper.start(channel)
+        await asyncio.gather(*sweeper.tasks.values(), return_exceptions=True)
+
+    asyncio.run(first_page())
+    assert [message.deleted for message in channel.messages] == [False] * 20 + [True] * 10
+
+    restarted = HistorySweeper(fake_bot(channel), path, page_size=10, deletes_per_minute=6000)
+    assert restarted.checkpoints['5']['before'] == 21
+
+    async def resume():
+        assert restarted.resume() == 1
+        await asyncio.gather(*restarted.tasks.values())
+
+    asyncio.run(resume())
+    assert all(message.deleted for message in channel.messages)
+    assert restarted.get_statistics()[0]['scanned'] == 30
+
+
+def test_sweep_concurrency_limit(tmp_path):
+    """No more channels are paged through at once than the limit allows"""
+    channels = [fake_channel(channel_id, ["hello there"] * 25) for channel_id in (5, 6, 7)]
+    sweeper = HistorySweeper(fake_bot(*channels), str(tmp_path / 'sweeps.json'), page_size=10, max_channels=2)
+    fetch_page = sweeper.fetch_page
+    active, peak = set(), []
+
+    async def tracked_fetch(channel, checkpoint):
+        active.add(channel.id)
+        peak.append(len(active))
+        await asyncio.sleep(0.001)
+        page = await fetch_page(channel, checkpoint)
+        if len(page) < sweeper.page_size:
+            active.discard(channel.id)
+        return page
+
+    sweeper.fetch_page = tracked_fetch
+
+    async def run():
+        for channel in channels:
+            await sweeper.start(channel)
+        await asyncio.gather(*sweeper.tasks.values())
+
+    asyncio.run(run())
+    assert max(peak) == 2
+    assert [report['scanned'] for report in sweeper.get_statistics()] == [25, 25, 25]
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+    for name, func in list(globals().items()):
+        if name.startswith('test_'):
+            with tempfile.TemporaryDirectory() as tmp:
+                func(Path(tmp))
+            print(f"✅ {name}")
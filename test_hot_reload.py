@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Tests for hot reload: rebuild from disk, smoke validation, swap and rollback
+"""
+
+import asyncio
+import json
+import os
+import shutil
+from types import SimpleNamespace
+
+from hot_reload import BASE_DIR, FilterReloader, validate_filter
+from word_filter import WordFilter
+
+
+def word_list_dir(tmp_path, custom=None, whitelist=None):
+    """A directory with the real config.py and the given JSON lists"""
+    shutil.copy(os.path.join(BASE_DIR, 'config.py'), tmp_path / 'config.py')
+    if custom is not None:
+        (tmp_path / 'custom_bad_words.json').write_text(json.dumps(custom))
+    if whitelist is not None:
+        (tmp_path / 'whitelist.json').write_text(json.dumps(whitelist))
+    return str(tmp_path)
+
+
+def fake_bot():
+    """The bot attributes a reload swaps"""
+    return SimpleNamespace(word_filter=WordFilter(), custom_bad_words={}, whitelist={1})
+
+
+def test_validate_filter():
+    """The smoke corpus passes on the default filter and catches a word that breaks clean messages"""
+    assert validate_filter(WordFilter()) == []
+    failures = validate_filter(WordFilter(bad_words={'fuck': 'fluff', 'hello': 'bye'}))
+    assert len(failures) == 1 and 'Hello everyone' in failures[0]
+
+
+def test_reload_swaps_lists_and_filter(tmp_path):
+    """A valid change is built from disk and swapped in with the lists it was built from"""
+    bot = fake_bot()
+    reloader = FilterReloader(bot, base_dir=word_list_dir(tmp_path, {'zonk': 'boop'}, [5, 6]))
+
+    assert asyncio.run(reloader.reload())
+    assert bot.word_filter.filter_message("what a zonk") == ("what a boop", True)
+    assert bot.custom_bad_words == {'zonk': 'boop'} and bot.whitelist == {5, 6}
+    assert reloader.reload_count == 1 and reloader.last_error is None
+
+
+def test_reload_rollback(tmp_path):
+    """A change that fails the smoke corpus, or does not parse, keeps the running filter"""
+    bot = fake_bot()
+    running = bot.word_filter
+    reloader = FilterReloader(bot, base_dir=word_list_dir(tmp_path, {'hello': 'bye'}))
+
+    assert not asyncio.run(reloader.reload())
+    assert 'smoke test failed' in reloader.last_error
+    assert bot.word_filter is running and bot.custom_bad_words == {}
+
+    (tmp_path / 'custom_bad_words.json').write_text('{"zonk": ')
+    assert not asyncio.run(reloader.reload())
+    assert bot.word_filter is running
+
+    # A half-written whitelist keeps the current one but does not block the reload
+    (tmp_path / 'custom_bad_words.json').write_text('{}')
+    (tmp_path / 'whitelist.json').write_text('[1, ')
+    assert asyncio.run(reloader.reload())
+    assert bot.whitelist == {1}
+
+
+def test_own_writes_do_not_reload(tmp_path):
+    """Files the bot saved itself are not picked up as changes; edits by others are"""
+    path = word_list_dir(tmp_path, {}, [])
+    reloader = FilterReloader(fake_bot(), base_dir=path)
+    assert reloader.changed_files() == []
+
+    (tmp_path / 'custom_bad_words.json').write_text('{"zonk": "boop"}')
+    os.utime(tmp_path / 'custom_bad_words.json', ns=(1, 1))
+    reloader.mark_written('custom_bad_words.json')
+    assert reloader.changed_files() == []
+
+    (tmp_path / 'whitelist.json').write_text('[9]')
+    os.utime(tmp_path / 'whitelist.json', ns=(2, 2))
+    assert reloader.changed_files() == [os.path.join(path, 'whitelist.json')]
+
+
+def test_reload_waits_for_list_changes(tmp_path):
+    """A reload never swaps in lists read before a concurrent change was saved"""
+    bot = fake_bot()
+    reloader = FilterReloader(bot, base_dir=word_list_dir(tmp_path, {}, []))
+
+    async def run():
+        async with reloader.lock:
+            reload = asyncio.create_task(reloader.reload())
+            await asyncio.sleep(0.01)
+            # What /add_bad_word does while holding the lock
+            bot.custom_bad_words['zonk'] = 'boop'
+            bot.word_filter.add_word('zonk', 'boop')
+            (tmp_path / 'custom_bad_words.json').write_text(json.dumps(bot.custom_bad_words))
+        return await reload
+
+    assert asyncio.run(run())
+    assert bot.custom_bad_words == {'zonk': 'boop'}
+    assert bot.word_filter.contains_bad_word("zonk")
@@ -4,6 +4,11 @@ Test script to demonstrate Indian Hindi profanity filtering functionality
 Shows how the bot detects and replaces various forms of Indian bad words
 """
 
+import unicodedata
+
+from config import BAD_WORD_REPLACEMENTS, FUZZY_ROOTS
+from phonetic import phonetic_key
+from scripts import LATIN, detect_scripts
 from word_filter import WordFilter
 
 def test_indian_filter_examples():
@@ -72,5 +77,72 @@ def test_indian_filter_examples():
     print(f"   • Telugu (తెలుగు) - Andhra Pradesh/Telangana")
     print(f"   • Hinglish - Hindi-English combinations")
 
+def test_native_script_partitions():
+    """Native-script words are matched by their script's partition, in both engines"""
+    assert detect_scripts("plain ascii") == {LATIN}
+    assert detect_scripts("तू chutiya है") == {LATIN, 'devanagari'}
+    assert detect_scripts("நீ புண்டை") == {'tamil'}
+
+    for engine in ('compiled', 'regex'):
+        word_filter = WordFilter(engine=engine)
+        assert word_filter.filter_message("तू चूतिया है") == ("तू silly person है", True)
+        assert word_filter.filter_message("ये च.ू.त.ि.य.ा है") == ("ये silly person है", True)
+        assert word_filter.filter_message("நீ புண்டை") == ("நீ friend", True)
+        assert word_filter.filter_message("ਪੈਨਚੋਦ ਬੰਦਾ") == ("friend ਬੰਦਾ", True)
+        assert word_filter.filter_message("तू madarchod है") == ("तू buddy है", True)
+        # Precomposed and decomposed vowel signs are both matched
+        assert word_filter.contains_bad_word(unicodedata.normalize('NFD', "বোকাচোদা তুই"))
+        # A vowel sign continues the word, so a shorter entry does not match inside a longer one
+        assert not word_filter.contains_bad_word("चूतियापंती")
+        assert not word_filter.contains_bad_word("नमस्ते दोस्तों, कैसे हो?")
+
+
+def test_symbol_words_in_mixed_text():
+    """Symbol-only leet still routes to Latin when an emoji or native script is present"""
+    assert detect_scripts("@$$ 😀") == {LATIN}
+    assert detect_scripts("नमस्ते @$$") == {LATIN, 'devanagari'}
+
+    for engine in ('compiled', 'regex'):
+        word_filter = WordFilter(engine=engine)
+        assert word_filter.contains_bad_word("@$$")
+        assert word_filter.contains_bad_word("@$$ 😀")
+        assert word_filter.contains_bad_word("नमस्ते @$$")
+
+
+def test_phonetic_tier():
+    """Romanized spellings of one word share a phonetic key and match its single entry"""
+    assert {phonetic_key(word) for word in ('behenchod', 'bhenchod', 'behanchod', 'bahenchod')} == {'bancod'}
+    assert phonetic_key('chootiya') == phonetic_key('chutia') == phonetic_key('chutiya')
+    assert phonetic_key('chut') != phonetic_key('cut')
+
+    for engine in ('compiled', 'regex'):
+        word_filter = WordFilter(engine=engine)
+        assert word_filter.filter_message("tu bahenchod hai") == ("tu friend hai", True)
+        assert word_filter.filter_message("kitna chutia, ch00t") == ("kitna silly person, flower", True)
+        assert not word_filter.contains_bad_word("salah and sally ate the chutney")
+    assert not WordFilter(phonetic=False).contains_bad_word("tu bahenchod hai")
+
+
+def test_spelling_variants_without_phonetic_tier():
+    """Spellings the phonetic tier also covers keep their entries, so they match with the tier off"""
+    expected = {
+        "tu gaandu hai": "tu buddy hai",
+        "paagal hai kya": "silly hai kya",
+        "chutia banda": "silly person banda",
+        "badmaash log": "troublemaker log",
+        "choot": "flower",
+    }
+    for word in ('gaandu', 'paagal', 'chutia', 'badmaash', 'choot'):
+        assert word in BAD_WORD_REPLACEMENTS
+    # Fuzzy roots point at entries that exist
+    assert all(any(root in word for word in BAD_WORD_REPLACEMENTS) for root in FUZZY_ROOTS)
+
+    for engine in ('compiled', 'regex'):
+        for phonetic in (True, False):
+            word_filter = WordFilter(engine=engine, phonetic=phonetic)
+            for message, filtered in expected.items():
+                assert word_filter.filter_message(message) == (filtered, True), (engine, phonetic, message)
+
+
 if __name__ == "__main__":
     test_indian_filter_examples()
\ No newline at end of file
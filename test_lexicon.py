@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Tests for the compact lexicon store and the compiled matching engine
+"""
+
+import threading
+
+import pytest
+
+from config import BAD_WORD_REPLACEMENTS, MAX_MESSAGE_LENGTH, WORD_PRIORITIES
+from corpus import AMBIGUOUS_MESSAGES, CLEAN_MESSAGES, MULTICHAR_MESSAGES, PHRASE_MESSAGES, PROFANE_MESSAGES
+from expanded_word_list import ALL_EXPANDED_WORDS
+from fuzzy import within_one_edit
+from lexicon import Lexicon, Match, expand_context_rules, is_respelling
+from overlap import IntervalIndex
+from word_filter import WordFilter
+
+
+def test_trie_lookup_and_interning():
+    """Every word is reachable in the trie and equal replacements share one object"""
+    lexicon = Lexicon({'fuck': 'fluff', 'fucker': 'fluffer', 'fck': 'fluff'}, {}, [])
+
+    assert len(lexicon) == 3
+    assert lexicon.words[lexicon.lookup('FUCKER')] == 'fucker'
+    assert lexicon.lookup('fuc') == -1
+    assert lexicon.replacements[0] is lexicon.replacements[2]
+
+
+def test_match_records():
+    """Match records use slots and unpack like the old tuples"""
+    match = Match('f*ck', 'fluff', 4, 8, 'fuck')
+    original, replacement, start, end = match
+
+    assert (original, replacement, start, end) == ('f*ck', 'fluff', 4, 8)
+    assert not hasattr(match, '__dict__')
+
+
+def test_compiled_engine_corpus():
+    """The compiled engine flags every profane sample and no clean one"""
+    word_filter = WordFilter(engine='compiled')
+
+    for message in PROFANE_MESSAGES:
+        assert word_filter.filter_message(message)[1], message
+    for message in CLEAN_MESSAGES:
+        assert not word_filter.filter_message(message)[1], message
+
+
+def test_trailing_separators_survive():
+    """Matches end on the last letter, so punctuation, spaces and emoji after a word are kept"""
+    compiled = WordFilter(engine='compiled')
+    regex = WordFilter(engine='regex')
+    expected = {
+        "fuck.": "fluff.",
+        "you ass.": "you booty.",
+        "shit :) lol": "poopoo :) lol",
+        "what the fuck 😀": "what the fluff 😀",
+        "f.u.c.k.": "fluff.",
+    }
+
+    for message, filtered in expected.items():
+        assert compiled.filter_message(message) == (filtered, True), message
+        assert regex.filter_message(message) == (filtered, True), message
+    match = next(compiled.lexicon.scan("fuck... "))
+    assert (match.text, match.end) == ('fuck', 4)
+
+
+def test_multichar_substitutions():
+    """Both engines read multi-character substitutions as whole sequences and agree"""
+    compiled = WordFilter(engine='compiled')
+    regex = WordFilter(engine='regex')
+
+    for message in CLEAN_MESSAGES + PROFANE_MESSAGES + MULTICHAR_MESSAGES:
+        assert compiled.filter_message(message) == regex.filter_message(message), message
+    for message in MULTICHAR_MESSAGES:
+        assert compiled.contains_bad_word(message), message
+
+    # A single character of a multi-character sequence is not a substitution on its own
+    for message in ["how are you", "hope so", "That's great"]:
+        assert not compiled.contains_bad_word(message), message
+        assert not regex.contains_bad_word(message), message
+
+
+def test_letter_respellings_are_not_substitutions():
+    """Letters never stand for a digraph or the other way round ('cut' is not 'chut', 'meet' not 'meth')"""
+    assert is_respelling('ch', 'c') and is_respelling('i', 'ee')
+    assert not is_respelling('|)', 'd') and not is_respelling('0', 'oo') and not is_respelling('k', 'c')
+    for engine in ('compiled', 'regex'):
+        word_filter = WordFilter(engine=engine, phonetic=False)
+        for message in CLEAN_MESSAGES + ["wed", "tot", "bob", "choke", "coot", "cad", "speech"]:
+            assert not word_filter.contains_bad_word(message), (engine, message)
+
+
+def test_safe_phrases():
+    """Bad words inside a safe phrase or context rule are left alone, elsewhere they are not"""
+    assert expand_context_rules({'pot': {'before': ['cooking'], 'after': ['luck']}}) == ['cooking pot', 'pot luck']
+
+    for engine in ('compiled', 'regex'):
+        word_filter = WordFilter(engine=engine)
+        for message in AMBIGUOUS_MESSAGES:
+            assert not word_filter.contains_bad_word(message), (engine, message)
+        assert word_filter.filter_message("smoking pot in the cooking pot") == (
+            "smoking cooking vessel in the cooking pot", True
+        )
+        assert word_filter.filter_message("c00king p0t") == ("c00king p0t", False)
+
+    # A safe phrase that is itself a bad word stays a bad word
+    lexicon = Lexicon({'holy cow': 'wow'}, {}, [' '], safe_phrases=['holy cow', 'cash cow'])
+    assert lexicon.safe_count == 1
+    assert [match.word for match in lexicon.scan("holy cow")] == ['holy cow']
+
+
+def test_phrases():
+    """Multi-word entries match token by token across any gap, in both engines"""
+    words = {**ALL_EXPANDED_WORDS, **BAD_WORD_REPLACEMENTS}
+    compiled = WordFilter(bad_words=words, engine='compiled')
+    regex = WordFilter(bad_words=words, engine='regex')
+
+    for message in PHRASE_MESSAGES:
+        assert compiled.contains_bad_word(message), message
+        assert compiled.filter_message(message) == regex.filter_message(message), message
+    for message in ["blowyourload", "camel toes", "the ball game"]:
+        assert not compiled.contains_bad_word(message), message
+    assert compiled.lexicon.lookup("ball   gag") == compiled.lexicon.lookup("ball gag") >= 0
+
+
+def test_edit_rescan():
+    """Rescanning only the edited window gives the same matches as a full scan"""
+    word_filter = WordFilter()
+    filler = ' '.join(CLEAN_MESSAGES)
+    old = f"{filler} what the f*ck {filler} holy sh1t {filler}"
+    old_matches = word_filter.find_matches(old)
+
+    edits = [
+        old.replace("Good morning", "Good fucking morning"),   # profanity edited in
+        old.replace("what the f*ck", "what the heck"),          # profanity edited out
+        old.replace("holy sh1t", "holy s h i t"),               # edit inside a match
+        old + " b@stard",                                       # appended at the end
+        "damn " + old,                                          # inserted at the start
+    ]
+    for new in edits:
+        expected = [(m.start, m.end, m.replacement) for m in word_filter.find_matches(new)]
+        rescanned = word_filter.rescan_edit(old, new, old_matches)
+        assert [(m.start, m.end, m.replacement) for m in rescanned] == expected, new
+
+
+def test_scan_fields():
+    """Fields are scanned together, but no match runs across two fields"""
+    word_filter = WordFilter()
+    fields = ["what the f*ck", "", None, "sh1t.png", "fu", "ck", "cooking pot"]
+
+    assert word_filter.filter_fields(fields) == [
+        ("what the fluff", True), ("", False), (None, False), ("poopoo.png", True),
+        ("fu", False), ("ck", False), ("cooking pot", False),
+    ]
+    matches = word_filter.scan_fields(["clean", "holy sh1t"])
+    assert matches[0] == [] and (matches[1][0].start, matches[1][0].end) == (5, 9)
+
+    # Fields past the message length limit are skipped, as filter_message skips them
+    long_field = "fuck " * (MAX_MESSAGE_LENGTH // 5 + 1)
+    matches = word_filter.scan_fields([long_field, "holy sh1t"])
+    assert matches[0] == [] and (matches[1][0].start, matches[1][0].end) == (5, 9)
+    assert word_filter.filter_fields([long_field])[0] == word_filter.filter_message(long_field)
+
+
+def test_streaming_matches():
+    """iter_matches streams non-overlapping matches in order and both engines agree"""
+    for engine in ('compiled', 'regex'):
+        word_filter = WordFilter(engine=engine)
+        matches = word_filter.iter_matches("What the fuck, this sh1t is crap")
+
+        assert next(matches).word == 'fuck'
+        assert [match.word for match in matches] == ['shit', 'crap']
+        for message in CLEAN_MESSAGES + PROFANE_MESSAGES:
+            assert word_filter.contains_bad_word(message) == word_filter.filter_message(message)[1], message
+
+
+def test_overlap_strategies():
+    """Longest-leftmost prefers the longer word, 'first' keeps the original behaviour"""
+    message = "F U C K I N G hell"
+    for engine in ('compiled', 'regex'):
+        assert WordFilter(engine=engine, resolution='longest-leftmost').filter_message(message)[0] == "fluffing heck"
+        assert WordFilter(engine=engine, resolution='first').filter_message(message)[0] == "fluff I N G heck"
+
+    word_filter = WordFilter(resolution='priority', priorities={'fuck': 10})
+    assert word_filter.filter_message(message)[0] == "fluff I N G heck"
+
+    # The configured priorities name real entries, so they can apply
+    assert all(word in BAD_WORD_REPLACEMENTS for word in WORD_PRIORITIES)
+    for engine in ('compiled', 'regex'):
+        word_filter = WordFilter(engine=engine, resolution='priority')
+        assert word_filter.filter_message("you motherfucker") == ("you motherfluffer", True)
+
+
+def test_interval_index():
+    """The interval index detects overlaps on both sides"""
+    index = IntervalIndex()
+    index.add(10, 20)
+    index.add(30, 40)
+
+    assert index.overlaps(15, 16) and index.overlaps(5, 11) and index.overlaps(19, 31)
+    assert not index.overlaps(20, 30) and not index.overlaps(0, 10) and not index.overlaps(40, 50)
+
+
+def test_fuzzy_tier():
+    """Typos are caught with the fuzzy tier on, look-alike everyday words are not"""
+    assert within_one_edit('fukc', 'fuck') and within_one_edit('shiet', 'shit')
+    assert not within_one_edit('count', 'cunt') and not within_one_edit('shirt', 'shit')
+
+    word_filter = WordFilter(fuzzy=True)
+    assert word_filter.filter_message("you fukc off, this is shiet") == ("you fluff off, this is poopoo", True)
+    assert not word_filter.contains_bad_word("count the shirts in the shift")
+    assert not WordFilter(fuzzy=False).contains_bad_word("this is shiet")
+
+
+def test_private_word_table():
+    """Adding words to one filter neither touches config nor compiles regexes"""
+    word_filter = WordFilter()
+    word_filter.add_word('zzyzx', 'desert')
+
+    assert 'zzyzx' not in BAD_WORD_REPLACEMENTS
+    assert word_filter.filter_message("welcome to zzyzx") == ("welcome to desert", True)
+    assert word_filter.snapshot.patterns is None
+
+
+def test_snapshots():
+    """Word changes swap in a new snapshot; scans already running keep the one they started with"""
+    word_filter = WordFilter()
+    with pytest.raises(TypeError):
+        word_filter.bad_words['zzyzx'] = 'desert'
+
+    before = word_filter.snapshot
+    running = word_filter.iter_matches("zzyzx, damn and zzyzx again")
+    assert next(running).word == 'damn'
+    word_filter.update_words({'zzyzx': 'desert'}, remove=['damn'])
+    assert [match.word for match in running] == []
+    assert word_filter.snapshot is not before and 'damn' in before.bad_words
+    assert word_filter.filter_message("zzyzx, damn") == ("desert, damn", True)
+
+    # Concurrent readers during a burst of writes only ever see whole snapshots
+    errors = []
+    stop = threading.Event()
+
+    def reader():
+        while not stop.is_set():
+            matches = word_filter.find_matches("zzyzx and shit")
+            if [match.word for match in matches] not in (['shit'], ['zzyzx', 'shit']):
+                errors.append(matches)
+
+    readers = [threading.Thread(target=reader) for _ in range(4)]
+    for thread in readers:
+        thread.start()
+    for _ in range(5):
+        word_filter.remove_word('zzyzx')
+        word_filter.add_word('zzyzx', 'desert')
+    stop.set()
+    for thread in readers:
+        thread.join()
+    assert errors == []
+
+
+def test_threaded_scans():
+    """Threads sharing one filter get the sequential results, and lazy patterns are compiled once"""
+    word_filter = WordFilter()
+    messages = CLEAN_MESSAGES + PROFANE_MESSAGES + ["tu bahenchod hai"]
+    expected = [word_filter.filter_message(message) for message in messages]
+    results, patterns = [], []
+
+    def worker():
+        patterns.append(word_filter.patterns)
+        results.append([word_filter.filter_message(message) for message in messages])
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(results) == 4 and all(result == expected for result in results)
+    assert all(compiled is patterns[0] for compiled in patterns)
+
+
+if __name__ == "__main__":
+    for name, func in list(globals().items()):
+        if name.startswith('test_'):
+            func()
+            print(f"✅ {name}")
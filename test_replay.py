@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Tests for the replay harness and the latency metrics it reports
+"""
+
+import asyncio
+import unittest.mock
+
+import pytest
+
+from metrics import LatencyTracker
+
+pytest.importorskip('discord')
+from flood_guard import FloodGuard  # noqa: E402
+from replay import FakeMessage, FakeRest, FakeTextChannel, FakeUser, ReplayBot, replay, synthetic_messages  # noqa: E402
+from types import SimpleNamespace  # noqa: E402
+
+
+def test_latency_tracker_percentiles():
+    """Nearest-rank percentiles over the kept samples, reported in milliseconds"""
+    tracker = LatencyTracker(size=100)
+    for ms in range(1, 101):
+        tracker.record(ms / 1000)
+
+    assert tracker.percentile(50) == pytest.approx(0.050)
+    summary = tracker.summary()
+    assert summary['count'] == 100
+    assert summary['p99_ms'] == pytest.approx(99.0)
+    assert summary['max_ms'] == pytest.approx(100.0)
+
+
+def test_replay_pipeline():
+    """Every profane message is deleted and reposted through the fake REST API"""
+    records = synthetic_messages(60, profane_ratio=0.5, authors=5, channels=2)
+    rest = FakeRest(latency=0.0, jitter=0.0, rate_limit=1000)
+    report = asyncio.run(replay(records, rest, rate=0))
+
+    assert report['messages'] == 60
+    assert report['flagged'] > 0
+    assert report['rest_calls']['delete_message'] == report['flagged']
+    assert report['rest_calls']['execute_webhook'] == report['flagged']
+    assert report['rate_limited'] == 0 and report['not_found'] == 0
+
+
+def test_replay_rate_limits_and_not_found():
+    """429s are retried and NotFound deletes are counted without stopping the replay"""
+    records = [{'content': "What the fuck", 'channel_id': 0}] * 8
+    rest = FakeRest(latency=0.0, jitter=0.0, rate_limit=4, per=0.05, not_found={'delete_message': 0.5})
+    report = asyncio.run(replay(records, rest, rate=0))
+
+    assert report['flagged'] == 8
+    assert report['rate_limited'] > 0
+    assert report['not_found'] > 0
+    # A message whose delete hit NotFound is not reposted
+    assert report['rest_completed']['execute_webhook'] == 8 - report['not_found']
+
+
+def test_edit_pipeline():
+    """Profanity edited into a clean message goes through the same delete and repost"""
+    async def run():
+        rest = FakeRest(latency=0.0, jitter=0.0, rate_limit=1000)
+        guild = SimpleNamespace(id=1, name='guild', me=FakeUser(0, 'bot', bot=True))
+        bot = ReplayBot(guild.me)
+        channel = FakeTextChannel(rest, 5, guild)
+        before = FakeMessage(1, "This is a normal message", FakeUser(2, 'user'), channel)
+        after = FakeMessage(1, "This is a normal fucking message", before.author, channel)
+
+        await bot.on_message(before)
+        assert not before.deleted and 1 in bot.scan_cache
+        await bot.on_message_edit(before, after)
+        return after, rest
+
+    after, rest = asyncio.run(run())
+    assert after.deleted
+    assert rest.completed['execute_webhook'] == 1
+
+
+def test_multi_field_pipeline():
+    """Embed and filename hits are reposted with suppressed embeds and renamed files"""
+    async def run():
+        rest = FakeRest(latency=0.0, jitter=0.0, rate_limit=1000)
+        guild = SimpleNamespace(id=1, name='guild', me=FakeUser(0, 'bot', bot=True))
+        bot = ReplayBot(guild.me)
+        channel = FakeTextChannel(rest, 5, guild)
+        author = FakeUser(2, 'user')
+        clean = FakeMessage(1, "look at this", author, channel, [{'title': 'A normal page'}], ['notes.txt'])
+        flagged = FakeMessage(2, "look at this", author, channel, [{'description': 'what the fuck'}], ['sh1t.png'])
+
+        await bot.on_message(clean)
+        await bot.on_message(flagged)
+        return clean, flagged, channel
+
+    clean, flagged, channel = asyncio.run(run())
+    assert not clean.deleted and flagged.deleted
+    sent = channel._webhooks[0].sent[0]
+    assert sent['content'] == "look at this"
+    assert sent['suppress_embeds']
+    assert [file.filename for file in sent['files']] == ['poopoo.png']
+
+
+def test_split_word_pipeline():
+    """A word spelled out over several messages is bulk deleted and reposted filtered"""
+    async def run():
+        rest = FakeRest(latency=0.0, jitter=0.0, rate_limit=1000)
+        guild = SimpleNamespace(id=1, name='guild', me=FakeUser(0, 'bot', bot=True))
+        bot = ReplayBot(guild.me)
+        channel = FakeTextChannel(rest, 5, guild)
+        author = FakeUser(2, 'user')
+        messages = [FakeMessage(i, text, author, channel) for i, text in enumerate(["hey", "sh", "it"])]
+        for message in messages:
+            await bot.on_message(message)
+        return messages, channel, rest
+
+    messages, channel, rest = asyncio.run(run())
+    assert [message.deleted for message in messages] == [False, True, True]
+    assert rest.completed['bulk_delete'] == 1
+    assert channel._webhooks[0].sent[0]['content'] == 'poopoo'
+
+
+def test_split_words_respect_flood_mode():
+    """Spelled-out words take a repost token like any flagged message; past the budget they are only deleted"""
+    async def run():
+        rest = FakeRest(latency=0.0, jitter=0.0, rate_limit=1000)
+        guild = SimpleNamespace(id=1, name='guild', me=FakeUser(0, 'bot', bot=True))
+        bot = ReplayBot(guild.me)
+        bot.flood_guard = FloodGuard(user_rate=1000, channel_rate=2, action='delete')
+        channel = FakeTextChannel(rest, 5, guild)
+        author = FakeUser(2, 'user')
+        messages = [FakeMessage(i, text, author, channel) for i, text in enumerate(["sh", "it"] * 4)]
+        for message in messages:
+            await bot.on_message(message)
+        return messages, channel, bot
+
+    messages, channel, bot = asyncio.run(run())
+    assert all(message.deleted for message in messages)
+    assert len(channel._webhooks[0].sent) == 2
+    assert bot.flood_guard.get_statistics()['cheap_actions'] == 2
+
+
+def test_flood_mode_pipeline():
+    """Past the channel's repost budget flagged messages are bulk purged instead of reposted"""
+    async def run():
+        rest = FakeRest(latency=0.0, jitter=0.0, rate_limit=1000)
+        guild = SimpleNamespace(id=1, name='guild', me=FakeUser(0, 'bot', bot=True))
+        bot = ReplayBot(guild.me)
+        bot.flood_guard = FloodGuard(user_rate=1000, channel_rate=5, action='purge')
+        channel = FakeTextChannel(rest, 5, guild)
+        messages = [FakeMessage(i, "What the fuck", FakeUser(i, f"user{i}"), channel) for i in range(20)]
+        with unittest.mock.patch('main.FLOOD_PURGE_DELAY', 0):
+            for message in messages:
+                await bot.on_message(message)
+            await asyncio.gather(*bot.purge_tasks.values())
+        return messages, channel, rest, bot
+
+    messages, channel, rest, bot = asyncio.run(run())
+    assert all(message.deleted for message in messages)
+    assert len(channel._webhooks[0].sent) == 5
+    assert rest.completed['delete_message'] == 5
+    assert rest.completed['bulk_delete'] == 1
+    assert bot.flood_guard.get_statistics()['cheap_actions'] == 15
+
+
+def test_copypasta_pipeline():
+    """Copies of a flagged message are actioned from the fingerprint index without a rescan"""
+    raid = "Copy this message to every channel or your account gets banned tonight, fuck the mods"
+    records = [{'content': raid, 'channel_id': i % 3, 'author_id': i} for i in range(6)]
+    records += [{'content': raid.replace("tonight", "today"), 'channel_id': 0, 'author_id': 9}]
+    report = asyncio.run(replay(records, FakeRest(latency=0.0, jitter=0.0, rate_limit=1000), rate=0))
+
+    assert report['flagged'] == 7
+    assert report['fingerprints']['exact_hits'] == 5
+    assert report['fingerprints']['near_hits'] == 1
+    assert report['rest_completed']['execute_webhook'] == 6
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Tests for shadow mode: sampled comparisons against a candidate filter, recorded to a file
+"""
+
+import asyncio
+import json
+import random
+from types import SimpleNamespace
+
+from corpus import CLEAN_MESSAGES, PROFANE_MESSAGES
+from shadow import ShadowRunner
+from word_filter import WordFilter
+
+
+def fake_message(content: str, message_id: int = 1):
+    """The few Message attributes shadow mode reads"""
+    return SimpleNamespace(id=message_id, content=content, channel=SimpleNamespace(id=99))
+
+
+def test_compare_records_disagreements(tmp_path):
+    """Disagreements carry both outputs, agreements only the latency numbers"""
+    active = WordFilter()
+    shadow = ShadowRunner(SimpleNamespace(word_filter=active), options={'safe_phrases': []},
+                          log_path=str(tmp_path / 'shadow.jsonl'))
+
+    agree = shadow.compare(active, "What the fuck", active.filter_message("What the fuck"), 0.0001)
+    message = "Leave the soup pot on the stove"
+    disagree = shadow.compare(active, message, active.filter_message(message), 0.0001)
+
+    assert agree['agree'] and 'content' not in agree
+    assert not disagree['agree'] and disagree['candidate_flagged'] and not disagree['active_flagged']
+    lines = (tmp_path / 'shadow.jsonl').read_text().splitlines()
+    assert [json.loads(line)['agree'] for line in lines] == [True, False]
+    assert shadow.get_statistics()['disagreements'] == 1
+
+
+def test_observe_samples_off_the_loop(tmp_path):
+    """Only the sampled share of messages is compared, in worker threads"""
+    active = WordFilter()
+    shadow = ShadowRunner(SimpleNamespace(word_filter=active), options={'engine': 'regex'},
+                          sample_rate=0.5, log_path=str(tmp_path / 'shadow.jsonl'),
+                          rng=random.Random(1))
+    messages = CLEAN_MESSAGES + PROFANE_MESSAGES
+
+    async def replay():
+        for i, content in enumerate(messages):
+            shadow.observe(fake_message(content, i), active, active.filter_message(content), 0.0)
+        while shadow._pending:
+            await asyncio.sleep(0.01)
+
+    asyncio.run(replay())
+    stats = shadow.get_statistics()
+    assert 0 < stats['samples'] + stats['skipped'] < len(messages)
+    assert stats['disagreements'] == 0
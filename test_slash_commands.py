@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Tests for the admin slash commands: deferred responses, work off the event loop and deadline metrics
+"""
+
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+
+import discord
+
+import main
+from metrics import DeadlineTracker
+from word_filter import WordFilter
+
+
+class FakeResponse:
+    """InteractionResponse that enforces Discord's one-response rule"""
+
+    def __init__(self):
+        self.deferred = False
+        self.sent = []
+
+    def is_done(self) -> bool:
+        return self.deferred or bool(self.sent)
+
+    async def defer(self, ephemeral: bool = False, thinking: bool = False):
+        assert not self.is_done(), "interaction already acknowledged"
+        self.deferred = True
+
+    async def send_message(self, content=None, **kwargs):
+        assert not self.is_done(), "interaction already acknowledged, use the followup"
+        self.sent.append(dict(kwargs, content=content))
+
+
+class FakeFollowup:
+    """Webhook for followup messages, usable once the response is deferred"""
+
+    def __init__(self, response: FakeResponse):
+        self.response = response
+        self.sent = []
+
+    async def send(self, content=None, **kwargs):
+        assert self.response.deferred, "followups need a deferred response"
+        self.sent.append(dict(kwargs, content=content))
+
+
+def fake_interaction(administrator: bool = True):
+    """The Interaction attributes the admin commands read"""
+    response = FakeResponse()
+    user = SimpleNamespace(
+        id=7, display_name='admin', mention='<@7>', display_avatar=SimpleNamespace(url='https://cdn.example/7.png'),
+        guild_permissions=SimpleNamespace(administrator=administrator, manage_messages=administrator),
+    )
+    return SimpleNamespace(response=response, followup=FakeFollowup(response), user=user,
+                           guild=SimpleNamespace(id=1), extras={})
+
+
+def fresh_bot(monkeypatch, tmp_path):
+    """Point the module's bot at empty lists saved under tmp_path"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(main.bot, 'word_filter', WordFilter())
+    monkeypatch.setattr(main.bot, 'custom_bad_words', {})
+    monkeypatch.setattr(main.bot, 'whitelist', set())
+    monkeypatch.setattr(main.bot, 'command_metrics', DeadlineTracker(main.INTERACTION_DEADLINE))
+    return main.bot
+
+
+def test_admin_commands_defer_and_follow_up(monkeypatch, tmp_path):
+    """Heavy commands acknowledge first and reply with a followup; rejections stay plain ephemeral replies"""
+    bot = fresh_bot(monkeypatch, tmp_path)
+    added, removed, denied = fake_interaction(), fake_interaction(), fake_interaction(administrator=False)
+    user = SimpleNamespace(id=42, mention='<@42>', display_name='friend')
+
+    async def run():
+        await main.slash_add_bad_word.callback(added, bad_word=' Zonk ', replacement='boop')
+        await main.slash_remove_bad_word.callback(removed, bad_word='zonk')
+        await main.slash_add_bad_word.callback(denied, bad_word='zonk', replacement='boop')
+        await main.slash_whitelist_add.callback(fake_interaction(), user=user)
+
+    asyncio.run(run())
+    assert added.response.deferred and len(added.followup.sent) == 1
+    assert removed.response.deferred and len(removed.followup.sent) == 1
+    assert not denied.response.deferred and denied.response.sent[0]['ephemeral']
+    assert not bot.word_filter.contains_bad_word("zonk")
+    assert json.loads((tmp_path / 'custom_bad_words.json').read_text()) == {}
+    assert json.loads((tmp_path / 'whitelist.json').read_text()) == [42]
+    assert bot.command_metrics.summary()['acknowledged']['count'] == 4
+
+
+def test_deadline_under_load(monkeypatch, tmp_path):
+    """Concurrent word additions are all acknowledged well inside the deadline while recompiles run"""
+    bot = fresh_bot(monkeypatch, tmp_path)
+    interactions = [fake_interaction() for _ in range(30)]
+
+    async def run():
+        await asyncio.gather(*(
+            main.slash_add_bad_word.callback(interaction, bad_word=f"zonk{i}", replacement='boop')
+            for i, interaction in enumerate(interactions)
+        ))
+
+    asyncio.run(run())
+    summary = bot.command_metrics.summary()
+    assert summary['missed'] == 0
+    assert summary['acknowledged']['max_ms'] < summary['completed']['max_ms']
+    assert summary['acknowledged']['max_ms'] < 250
+    assert all(interaction.followup.sent for interaction in interactions)
+    assert all(bot.word_filter.contains_bad_word(f"zonk{i}") for i in range(30))
+    assert len(json.loads((tmp_path / 'custom_bad_words.json').read_text())) == 30
+
+
+def test_missed_deadline_is_counted(monkeypatch, tmp_path):
+    """A late acknowledgement and an expired interaction both count as missed deadlines"""
+    bot = fresh_bot(monkeypatch, tmp_path)
+    monkeypatch.setattr(bot.command_metrics, 'deadline', 0.01)
+    late, expired = fake_interaction(), fake_interaction()
+
+    async def slow_defer(ephemeral=False, thinking=False):
+        time.sleep(0.02)
+        late.response.deferred = True
+
+    async def unknown_interaction(ephemeral=False, thinking=False):
+        raise discord.NotFound(SimpleNamespace(status=404, reason='Not Found'), {'code': 10062, 'message': 'Unknown interaction'})
+
+    late.response.defer = slow_defer
+    expired.response.defer = unknown_interaction
+
+    async def run():
+        await main.slash_add_bad_word.callback(late, bad_word='zonk', replacement='boop')
+        await main.slash_add_bad_word.callback(expired, bad_word='zonk', replacement='boop')
+
+    asyncio.run(run())
+    assert bot.command_metrics.missed == 2
+    assert not expired.followup.sent
+
+
+if __name__ == "__main__":
+    import pytest
+    pytest.main([__file__, '-q'])
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Tests for cross-message split-word detection
+"""
+
+from types import SimpleNamespace
+
+from split_detector import SplitWordDetector
+from word_filter import WordFilter
+
+
+def fragment(text: str):
+    """A message with only the attributes the detector reads"""
+    return SimpleNamespace(content=text)
+
+
+def test_spelled_out_words():
+    """Fragments of one author join up; other authors and regular messages break the run"""
+    word_filter = WordFilter()
+    detector = SplitWordDetector()
+
+    assert detector.observe(word_filter, 1, 2, fragment("sh")) is None
+    assert detector.observe(word_filter, 1, 3, fragment("it")) is None  # another author
+    messages, filtered = detector.observe(word_filter, 1, 2, fragment("it"))
+    assert [m.content for m in messages] == ["sh", "it"] and filtered == "poopoo"
+    assert len(detector) == 1  # the matched buffer is cleared, the other author's stays
+
+    detector.observe(word_filter, 1, 2, fragment("sh"))
+    detector.observe(word_filter, 1, 2, fragment("a regular message"))
+    assert detector.observe(word_filter, 1, 2, fragment("it")) is None
+
+    # Everyday short replies do not add up to anything
+    for text in ["ok", "so", "is", "it", "on", "lol", "yes", "no"]:
+        assert detector.observe(word_filter, 1, 4, fragment(text)) is None
+
+
+def test_ordinary_pairs_are_not_words():
+    """Two everyday replies that happen to read as a word, or only do so through substitutions, stay up"""
+    word_filter = WordFilter()
+    detector = SplitWordDetector()
+
+    for author, pair in enumerate([("gg", "ok"), ("go", "ok"), ("go", "k"), ("ok", "so"), ("no", "pe")]):
+        for text in pair:
+            assert detector.observe(word_filter, 1, author, fragment(text)) is None, pair
+
+    # Whole fragments are still joined, also before trailing punctuation
+    for author, pair in enumerate([("as", "s"), ("fu", "ck!"), ("b", "itch")], start=10):
+        detector.observe(word_filter, 1, author, fragment(pair[0]))
+        assert detector.observe(word_filter, 1, author, fragment(pair[1])) is not None, pair
+
+
+def test_ttl_and_caps():
+    """Old fragments expire, and the number of buffers and fragments is bounded"""
+    word_filter = WordFilter()
+    now = [0.0]
+    detector = SplitWordDetector(window=3, ttl=10, max_buffers=2, clock=lambda: now[0])
+
+    detector.observe(word_filter, 1, 2, fragment("sh"))
+    now[0] = 11
+    assert detector.observe(word_filter, 1, 2, fragment("it")) is None
+
+    for author in range(5):
+        detector.observe(word_filter, 1, author, fragment("a"))
+    assert len(detector) == 2
+    for text in "abcdef":
+        detector.observe(word_filter, 1, 9, fragment(text))
+    assert len(detector.buffers[(1, 9)]) == 3
+
+    now[0] = 100
+    detector.observe(word_filter, 2, 2, fragment("x"))
+    assert list(detector.buffers) == [(2, 2)]
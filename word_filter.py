@@ -4,47 +4,256 @@ Handles various obfuscation methods including spacing, symbols, and character su
 """
 
 import re
+import sys
+import unicodedata
+import heapq
+from bisect import bisect_left, bisect_right
+import itertools
 import logging
-from typing import Tuple, Dict, List, Set
-from config import BAD_WORD_REPLACEMENTS, OBFUSCATION_CHARS, SEPARATORS, MIN_WORD_LENGTH
+import threading
+from types import MappingProxyType
+from typing import Tuple, Dict, List, Set, Optional, Iterator, Iterable, Mapping
+from config import (
+    BAD_WORD_REPLACEMENTS, OBFUSCATION_CHARS, SEPARATORS, MIN_WORD_LENGTH,
+    MAX_MESSAGE_LENGTH, FILTER_ENGINE, OVERLAP_RESOLUTION, WORD_PRIORITIES,
+    FUZZY_MATCHING, FUZZY_TIME_BUDGET_MS, FUZZY_ROOTS,
+    PHONETIC_MATCHING, PHONETIC_ROOTS, SAFE_PHRASES, CONTEXT_RULES, USE_EXPANDED_WORDS
+)
+from expanded_word_list import ALL_EXPANDED_WORDS
+from lexicon import Lexicon, Match, expand_context_rules, is_respelling
+from fuzzy import FuzzyIndex
+from phonetic import PhoneticIndex
+from normalization import DROPPED, fold_confusables
+from overlap import STRATEGIES, STREAMING_STRATEGIES, resolve_streaming, resolve_ranked
+from scripts import LATIN, WORD_CHAR_CLASS, detect_scripts, partition_by_script
 
 logger = logging.getLogger(__name__)
 
+# Joins the fields of a multi-field scan; it is not a separator, letter or substitution,
+# so no match can run from one field into the next
+FIELD_SEPARATOR = '\x00'
+
+class FilterSnapshot:
+    """
+    One compiled version of the word table: the words, their lexicons and the tier indexes
+    Never changed once built; WordFilter swaps in a new snapshot by reference on every change,
+    so a scan that picked one up sees a consistent filter however long it runs
+    """
+    __slots__ = ('bad_words', 'lexicon', 'script_lexicons', 'word_scripts', 'fuzzy_index', 'phonetic_index', 'patterns')
+    
+    def __init__(self, bad_words: Dict[str, str], lexicon: Lexicon, script_lexicons: Dict[str, Lexicon],
+                 word_scripts: Dict[str, str], fuzzy_index: Optional[FuzzyIndex],
+                 phonetic_index: Optional[PhoneticIndex], patterns: Optional[Dict[str, List[re.Pattern]]]):
+        """Wrap compiled tables; the word table is exposed read-only"""
+        self.bad_words: Mapping[str, str] = MappingProxyType(bad_words)
+        self.lexicon = lexicon
+        self.script_lexicons = script_lexicons
+        self.word_scripts = word_scripts
+        self.fuzzy_index = fuzzy_index
+        self.phonetic_index = phonetic_index
+        # Regex patterns; built with the snapshot for the regex engine, on first use otherwise
+        self.patterns = patterns
+    
+    def partitions(self) -> Iterator[Tuple[str, Lexicon]]:
+        """(script, lexicon) for the main lexicon and every native-script partition"""
+        yield LATIN, self.lexicon
+        yield from self.script_lexicons.items()
+
+
 class WordFilter:
-    def __init__(self):
-        """Initialize the word filter with compiled regex patterns"""
-        self.bad_words = BAD_WORD_REPLACEMENTS
-        self.obfuscation_chars = OBFUSCATION_CHARS
-        self.separators = SEPARATORS
+    def __init__(self, bad_words: Optional[Dict[str, str]] = None,
+                 obfuscation_chars: Optional[Dict[str, List[str]]] = None,
+                 separators: Optional[List[str]] = None, engine: Optional[str] = None,
+                 resolution: Optional[str] = None, priorities: Optional[Dict[str, int]] = None,
+                 fuzzy: Optional[bool] = None, phonetic: Optional[bool] = None, safe_phrases: Optional[List[str]] = None,
+                 context_rules: Optional[Dict[str, Dict[str, List[str]]]] = None):
+        """
+        Initialize the word filter with a compiled lexicon
+        Tables default to the ones in config.py; the hot reloader passes freshly loaded ones
+        """
+        # Private copy so custom words never leak into config.BAD_WORD_REPLACEMENTS
+        if bad_words is not None:
+            source = bad_words
+        elif USE_EXPANDED_WORDS:
+            source = {**ALL_EXPANDED_WORDS, **BAD_WORD_REPLACEMENTS}
+        else:
+            source = BAD_WORD_REPLACEMENTS
+        self.obfuscation_chars = obfuscation_chars if obfuscation_chars is not None else OBFUSCATION_CHARS
+        self.separators = separators if separators is not None else SEPARATORS
         self.min_word_length = MIN_WORD_LENGTH
+        self.engine = engine or FILTER_ENGINE
+        if self.engine not in ('compiled', 'regex'):
+            raise ValueError(f"Unknown filter engine: {self.engine}")
+        self.resolution = resolution or OVERLAP_RESOLUTION
+        if self.resolution not in STRATEGIES:
+            raise ValueError(f"Unknown overlap resolution strategy: {self.resolution}")
+        self.priorities = priorities if priorities is not None else WORD_PRIORITIES
+        self.fuzzy = FUZZY_MATCHING if fuzzy is None else fuzzy
+        self.fuzzy_budget = FUZZY_TIME_BUDGET_MS / 1000
+        self.phonetic = PHONETIC_MATCHING if phonetic is None else phonetic
+        # Allow-list of safe phrases ('cooking pot', 'moby dick'), context rules included
+        self.safe_phrases = list(safe_phrases if safe_phrases is not None else SAFE_PHRASES)
+        self.safe_phrases += expand_context_rules(context_rules if context_rules is not None else CONTEXT_RULES)
         
-        # Compile regex patterns for efficient matching
-        self.patterns = self._compile_patterns()
+        # Readers never lock: they take self.snapshot once and scan with it. Writers build
+        # a new snapshot from a copy and swap the reference, one writer at a time
+        self._write_lock = threading.Lock()
+        self._patterns_lock = threading.Lock()
+        self.snapshot = self._build(source)
         
-        logger.info(f"WordFilter initialized with {len(self.bad_words)} bad words and {len(self.patterns)} patterns")
+        logger.info(f"WordFilter initialized with {len(self.bad_words)} bad words ({self.engine} engine)")
+    
+    def _build(self, bad_words: Mapping[str, str]) -> FilterSnapshot:
+        """Compile a snapshot of a word table"""
+        # Replacements are interned so repeated ones ('buddy', 'friend', ...) are stored once
+        bad_words = {word: sys.intern(replacement) for word, replacement in bad_words.items()}
+        # One lexicon per script: Latin (English and romanized Indian languages) is the main one,
+        # native-script entries get a partition that only runs on messages in that script
+        partitions = partition_by_script(bad_words)
+        lexicon = Lexicon(
+            partitions.pop(LATIN), self.obfuscation_chars, self.separators, self.min_word_length, self.safe_phrases
+        )
+        script_lexicons = {
+            script: Lexicon(words, {}, self.separators, self.min_word_length)
+            for script, words in partitions.items()
+        }
+        word_scripts = {word: script for script, words in partitions.items() for word in words}
+        # Regex patterns cost several KB per word, the compiled engine only builds them on demand
+        patterns = self._compile_patterns(bad_words, word_scripts) if self.engine == 'regex' else None
+        return FilterSnapshot(
+            bad_words, lexicon, script_lexicons, word_scripts,
+            FuzzyIndex(lexicon, FUZZY_ROOTS) if self.fuzzy else None,
+            PhoneticIndex(lexicon, PHONETIC_ROOTS) if self.phonetic else None,
+            patterns
+        )
+    
+    def update_words(self, add: Optional[Dict[str, str]] = None, remove: Iterable[str] = ()):
+        """
+        Add and remove words as one change: a new snapshot is compiled and swapped in
+        Scans already running finish with the snapshot they started with
+        """
+        with self._write_lock:
+            bad_words = dict(self.snapshot.bad_words)
+            for word in remove:
+                bad_words.pop(word, None)
+            bad_words.update(add or {})
+            self.snapshot = self._build(bad_words)
+    
+    def add_word(self, word: str, replacement: str):
+        """Add or replace one bad word"""
+        self.update_words({word: replacement})
+    
+    def remove_word(self, word: str):
+        """Remove one bad word, if present"""
+        self.update_words(remove=(word,))
+    
+    @property
+    def bad_words(self) -> Mapping[str, str]:
+        """Read-only view of the current word table; change it with update_words"""
+        return self.snapshot.bad_words
+    
+    @property
+    def lexicon(self) -> Lexicon:
+        return self.snapshot.lexicon
+    
+    @property
+    def script_lexicons(self) -> Dict[str, Lexicon]:
+        return self.snapshot.script_lexicons
+    
+    @property
+    def word_scripts(self) -> Dict[str, str]:
+        return self.snapshot.word_scripts
+    
+    @property
+    def fuzzy_index(self) -> Optional[FuzzyIndex]:
+        return self.snapshot.fuzzy_index
+    
+    @property
+    def phonetic_index(self) -> Optional[PhoneticIndex]:
+        return self.snapshot.phonetic_index
+    
+    @property
+    def patterns(self) -> Dict[str, List[re.Pattern]]:
+        """Regex patterns per bad word, used by the regex engine and for debugging"""
+        return self._snapshot_patterns(self.snapshot)
+    
+    def _snapshot_patterns(self, snapshot: FilterSnapshot) -> Dict[str, List[re.Pattern]]:
+        """
+        The regex patterns of a snapshot, compiled once on first use
+        The unlocked check keeps the common path lock-free, also without a GIL
+        """
+        patterns = snapshot.patterns
+        if patterns is None:
+            with self._patterns_lock:
+                if snapshot.patterns is None:
+                    snapshot.patterns = self._compile_patterns(snapshot.bad_words, snapshot.word_scripts)
+                patterns = snapshot.patterns
+        return patterns
     
     def _escape_regex_chars(self, text: str) -> str:
         """Escape special regex characters in text"""
         return re.escape(text)
     
+    def _split_graphemes(self, word: str) -> List[str]:
+        """Split a word into obfuscation table keys, longest first (e.g. 'chutiya' -> 'ch', 'u', ...)"""
+        longest_key = max((len(key) for key in self.obfuscation_chars), default=1)
+        graphemes = []
+        i = 0
+        while i < len(word):
+            for size in range(min(longest_key, len(word) - i), 0, -1):
+                if size == 1 or word[i:i + size] in self.obfuscation_chars:
+                    graphemes.append(word[i:i + size])
+                    i += size
+                    break
+        return graphemes
+    
+    def _create_grapheme_pattern(self, grapheme: str) -> str:
+        """Alternation of every way a grapheme can be written, as whole sequences"""
+        if grapheme not in self.obfuscation_chars:
+            return re.escape(grapheme)
+        variants = {variant for variant in self.obfuscation_chars[grapheme] if not is_respelling(variant, grapheme)}
+        options = [re.escape(option) for option in sorted(
+            {grapheme, *variants}, key=lambda option: (-len(option), option)
+        )]
+        if len(grapheme) > 1:
+            # Multi-letter graphemes may also be written letter by letter ('aa' as '@@')
+            options.append(''.join(self._create_grapheme_pattern(char) for char in grapheme))
+        return f"(?:{'|'.join(options)})"
+    
     def _create_obfuscation_pattern(self, word: str) -> str:
         """Create a regex pattern that matches obfuscated versions of a word"""
-        pattern_parts = []
-        
-        for char in word.lower():
-            if char in self.obfuscation_chars:
-                # Create character class with all possible substitutions
-                substitutions = [re.escape(char)] + [re.escape(sub) for sub in self.obfuscation_chars[char]]
-                pattern_parts.append(f"[{''.join(substitutions)}]")
-            else:
-                pattern_parts.append(re.escape(char))
+        # Alternations rather than a character class, so multi-character
+        # substitutions like '|=' or '|)' only match as whole sequences
+        separators = ''.join(re.escape(sep) for sep in self.separators)
+        token_patterns = []
+        for token in word.lower().split():
+            pattern_parts = [self._create_grapheme_pattern(grapheme) for grapheme in self._split_graphemes(token)]
+            # Join with optional separators between characters
+            token_patterns.append(f"[{separators}]*".join(pattern_parts))
         
-        # Join with optional separators between characters
-        separator_pattern = f"[{''.join(re.escape(sep) for sep in self.separators)}]*"
-        full_pattern = separator_pattern.join(pattern_parts)
+        # The tokens of a phrase are separated by any run of separators or whitespace
+        full_pattern = f"[{separators}\\s]+".join(token_patterns)
         
-        # Add word boundaries and make it case-insensitive
-        return f"\\b{full_pattern}\\b"
+        # Not touching other word characters; unlike \\b this also holds when
+        # the match starts or ends with a symbol such as '|)' or '@'
+        return f"(?<!\\w){full_pattern}(?!\\w)"
+    
+    def _create_native_patterns(self, word: str) -> List[re.Pattern]:
+        """
+        Exact and separator-split patterns for a native-script word
+        Boundaries count combining marks as word characters, unlike \\b, so a word never
+        matches inside a longer one that continues with a vowel sign
+        """
+        word_chars = WORD_CHAR_CLASS
+        separators = ''.join(re.escape(sep) for sep in self.separators)
+        # Messages may spell vowel signs precomposed or decomposed
+        forms = sorted({unicodedata.normalize('NFC', word), unicodedata.normalize('NFD', word)})
+        exact = '|'.join(re.escape(form) for form in forms)
+        split = '|'.join(f"[{separators}]*".join(re.escape(char) for char in form) for form in forms)
+        return [
+            re.compile(f"(?<![{word_chars}])(?:{exact})(?![{word_chars}])"),
+            re.compile(f"(?<![{word_chars}])(?:{split})(?![{word_chars}])"),
+        ]
     
     def _create_spacing_pattern(self, word: str) -> str:
         """Create pattern for spaced out words (e.g. 'f u c k')"""
@@ -73,13 +282,16 @@ class WordFilter:
                 pattern_chars.append(re.escape(char))
         return f"\\b{''.join(pattern_chars)}\\b"
     
-    def _compile_patterns(self) -> Dict[str, List[re.Pattern]]:
+    def _compile_patterns(self, bad_words: Mapping[str, str], word_scripts: Dict[str, str]) -> Dict[str, List[re.Pattern]]:
         """Compile all regex patterns for efficient matching"""
         patterns = {}
         
-        for bad_word, replacement in self.bad_words.items():
+        for bad_word, replacement in bad_words.items():
             if len(bad_word) < self.min_word_length:
                 continue
+            if bad_word in word_scripts:
+                patterns[bad_word] = self._create_native_patterns(bad_word)
+                continue
                 
             word_patterns = []
             
@@ -119,66 +331,286 @@ class WordFilter:
         
         return patterns
     
-    def _find_bad_words_in_text(self, text: str) -> List[Tuple[str, str, int, int]]:
+    def _iter_regex_candidates(self, snapshot: FilterSnapshot, text: str,
+                               start: int = 0, stop: Optional[int] = None) -> Iterator[Match]:
         """
-        Find all bad words in text and return their positions and replacements
-        Returns list of (original_word, replacement, start_pos, end_pos)
+        Lazily merge the finditer streams of every regex pattern into one stream
+        ordered by start position, then word order, then pattern order
+        Only matches starting in text[start:stop] are produced
         """
-        found_words = []
+        patterns = self._snapshot_patterns(snapshot)
+        stop = len(text) if stop is None else stop
         
-        for bad_word, replacement in self.bad_words.items():
-            if bad_word not in self.patterns:
+        def stream(first: re.Match, rest: Iterator[re.Match], order: int, pattern_index: int,
+                   bad_word: str, replacement: str):
+            # Only the exact and mixed case patterns read the text without substitutions
+            edits = 0 if pattern_index in (0, 3) else 1
+            for match in itertools.chain((first,), rest):
+                if match.start() >= stop:
+                    return
+                yield match.start(), order, pattern_index, Match(
+                    match.group(),  # The actual matched text
+                    replacement,    # The replacement word
+                    match.start(),  # Start position
+                    match.end(),    # End position
+                    bad_word,
+                    edits
+                )
+        
+        # Only patterns that hit at least once take part in the merge, and only
+        # the patterns of the scripts the text is written in are tried
+        scripts = detect_scripts(text)
+        word_scripts = snapshot.word_scripts
+        streams = []
+        for order, (bad_word, replacement) in enumerate(snapshot.bad_words.items()):
+            if word_scripts.get(bad_word, LATIN) not in scripts:
                 continue
-                
-            for pattern in self.patterns[bad_word]:
-                matches = pattern.finditer(text)
-                for match in matches:
-                    found_words.append((
-                        match.group(),  # The actual matched text
-                        replacement,    # The replacement word
-                        match.start(),  # Start position
-                        match.end()     # End position
-                    ))
-        
-        # Sort by position to handle overlapping matches
-        found_words.sort(key=lambda x: x[2])
-        
-        # Remove overlapping matches (keep the first one found)
-        filtered_words = []
-        last_end = -1
-        
-        for word_info in found_words:
-            if word_info[2] >= last_end:  # No overlap
-                filtered_words.append(word_info)
-                last_end = word_info[3]
-        
-        return filtered_words
+            for pattern_index, pattern in enumerate(patterns.get(bad_word, ())):
+                # Lookbehinds still see the text before start, so boundaries stay exact
+                matches = pattern.finditer(text, start)
+                first = next(matches, None)
+                if first is not None and first.start() < stop:
+                    streams.append(stream(first, matches, order, pattern_index, bad_word, replacement))
+        
+        # Safe phrases come from the trie, the regex patterns know nothing about them
+        safe_spans = snapshot.lexicon.safe_spans(text) if streams else []
+        for _, _, _, match in heapq.merge(*streams):
+            if not any(start <= match.start and match.end <= end for start, end in safe_spans):
+                yield match
+    
+    def _rank(self, match: Match) -> Tuple:
+        """Sort key for the non-streaming overlap strategies (smaller ranks first)"""
+        if self.resolution == 'priority':
+            return (-self.priorities.get(match.word, 0), match.start - match.end, match.start)
+        # most-specific
+        return (match.edits, -len(match.word), match.start - match.end, match.start)
+    
+    def _iter_exact_matches(self, snapshot: FilterSnapshot, text: str,
+                            start: int = 0, stop: Optional[int] = None) -> Iterator[Match]:
+        """Resolved matches from the main engine, without the fuzzy tier"""
+        longest = self.resolution == 'longest-leftmost'
+        if self.engine == 'compiled':
+            # The trie walk can produce only the maximal match per start position;
+            # each script partition present in the text is walked, the others are skipped
+            scripts = detect_scripts(text)
+            streams = [
+                lexicon.scan(text, longest_only=longest, start=start, stop=stop)
+                for script, lexicon in snapshot.partitions()
+                if script in scripts
+            ]
+            if len(streams) == 1:
+                candidates = streams[0]
+            else:
+                candidates = heapq.merge(*streams, key=lambda match: match.start)
+        else:
+            candidates = self._iter_regex_candidates(snapshot, text, start, stop)
+        
+        if self.resolution in STREAMING_STRATEGIES:
+            return resolve_streaming(candidates, longest)
+        return iter(resolve_ranked(candidates, self._rank))
+    
+    def _iter_folded_matches(self, snapshot: FilterSnapshot, folded: str,
+                             start: int = 0, stop: Optional[int] = None) -> Iterator[Match]:
+        """Matches on already folded text, from the main engine plus the phonetic and fuzzy tiers"""
+        phonetic_index, fuzzy_index = snapshot.phonetic_index, snapshot.fuzzy_index
+        if phonetic_index is None and fuzzy_index is None:
+            yield from self._iter_exact_matches(snapshot, folded, start, stop)
+            return
+        
+        # Each tier only looks at tokens the tiers before it left untouched
+        found = list(self._iter_exact_matches(snapshot, folded, start, stop))
+        tiers = []
+        if phonetic_index is not None:
+            tiers.append(lambda covered: phonetic_index.scan(folded, covered, start, stop))
+        if fuzzy_index is not None:
+            tiers.append(lambda covered: fuzzy_index.scan(folded, covered, self.fuzzy_budget, start, stop))
+        for tier in tiers:
+            tier_found = list(tier(found))
+            if tier_found:
+                found = sorted(found + tier_found, key=lambda match: match.start)
+        yield from found
+    
+    def iter_matches(self, text: str, start: int = 0, stop: Optional[int] = None,
+                     snapshot: Optional[FilterSnapshot] = None) -> Iterator[Match]:
+        """
+        Lazily yield the bad words in text, left to right, without overlaps
+        Overlaps are settled by the configured resolution strategy; the positional
+        strategies decide while candidates stream past instead of collecting them all
+        With start/stop only matches starting in text[start:stop] are produced
+        The whole scan uses one snapshot, the current one unless given
+        """
+        snapshot = snapshot or self.snapshot
+        # Look-alike characters are folded and invisible ones dropped first,
+        # then match positions are mapped back onto the original text
+        folded, positions = fold_confusables(text)
+        if folded is text:
+            yield from self._iter_folded_matches(snapshot, folded, start, stop)
+            return
+        
+        if positions is not None:
+            start = bisect_left(positions, start)
+            stop = None if stop is None else bisect_left(positions, stop)
+        for match in self._iter_folded_matches(snapshot, folded, start, stop):
+            if positions is not None:
+                match.start = positions[match.start]
+                end = positions[match.end - 1] + 1
+                # Invisible characters trailing the last letter belong to the match
+                while end < len(text) and ord(text[end]) in DROPPED:
+                    end += 1
+                match.end = end
+            match.text = text[match.start:match.end]
+            yield match
+    
+    def _find_bad_words_in_text(self, text: str) -> List[Match]:
+        """
+        Find all bad words in text and return their positions and replacements
+        Returns list of Match records, which unpack as (original_word, replacement, start_pos, end_pos)
+        """
+        return list(self.iter_matches(text))
+    
+    def contains_bad_word(self, message: str) -> bool:
+        """Check whether a message contains any bad word, stopping at the first hit"""
+        if not message or len(message) > MAX_MESSAGE_LENGTH:
+            return False
+        
+        snapshot = self.snapshot
+        message, _ = fold_confusables(message)
+        if self.engine == 'regex':
+            # A plain search per pattern is cheaper than merging finditer streams;
+            # a hit is only confirmed with the full scan when it may sit in a safe phrase
+            scripts = detect_scripts(message)
+            if any(
+                pattern.search(message) for bad_word, patterns in self._snapshot_patterns(snapshot).items()
+                if snapshot.word_scripts.get(bad_word, LATIN) in scripts for pattern in patterns
+            ):
+                if not snapshot.lexicon.safe_count or next(self._iter_exact_matches(snapshot, message), None) is not None:
+                    return True
+        else:
+            for _ in self._iter_exact_matches(snapshot, message):
+                return True
+        
+        if snapshot.phonetic_index is not None:
+            for _ in snapshot.phonetic_index.scan(message, []):
+                return True
+        if snapshot.fuzzy_index is not None:
+            for _ in snapshot.fuzzy_index.scan(message, [], self.fuzzy_budget):
+                return True
+        return False
+    
+    @staticmethod
+    def _rewrite(message: str, matches: List[Match]) -> str:
+        """
+        Replace the matched spans in a single left-to-right pass
+        Matches must be sorted by position and non-overlapping, as iter_matches yields them
+        """
+        segments = []
+        position = 0
+        for match in matches:
+            segments.append(message[position:match.start])
+            segments.append(match.replacement)
+            position = match.end
+        segments.append(message[position:])
+        return ''.join(segments)
     
     def filter_message(self, message: str) -> Tuple[str, bool]:
         """
         Filter a message and replace bad words with funny alternatives
         Returns (filtered_message, contains_bad_words)
         """
-        if not message or len(message) > 2000:  # Discord message limit
+        return self.rewrite(message, self.find_matches(message))
+    
+    def find_matches(self, message: str, snapshot: Optional[FilterSnapshot] = None) -> List[Match]:
+        """All bad words in a message; none when it is empty or longer than Discord allows"""
+        if not message or len(message) > MAX_MESSAGE_LENGTH:  # Discord message limit
+            return []
+        return list(self.iter_matches(message, snapshot=snapshot))
+    
+    def rewrite(self, message: str, matches: List[Match]) -> Tuple[str, bool]:
+        """Build the filter_message result from already found matches"""
+        if not matches:
             return message, False
         
-        # Find all bad words in the message
-        bad_words_found = self._find_bad_words_in_text(message)
+        filtered_message = self._rewrite(message, matches)
         
-        if not bad_words_found:
-            return message, False
+        logger.debug(f"Filtered message: {len(matches)} bad words replaced")
+        return filtered_message, True
+    
+    def scan_fields(self, fields: List[str]) -> List[List[Match]]:
+        """
+        Find the bad words in several short texts (content, embed titles, filenames, names)
+        with one scan: the fields are joined with FIELD_SEPARATOR, which no pattern can span
+        Returns the matches of each field, positioned within that field; like find_matches,
+        a field longer than MAX_MESSAGE_LENGTH is not scanned
+        """
+        offsets = []
+        parts = []
+        position = 0
+        for field in fields:
+            field = field or ''
+            if len(field) > MAX_MESSAGE_LENGTH:
+                field = ''
+            offsets.append(position)
+            parts.append(field.replace(FIELD_SEPARATOR, ' '))
+            position += len(field) + 1
         
-        # Replace bad words from right to left to maintain positions
-        filtered_message = message
-        for original, replacement, start_pos, end_pos in reversed(bad_words_found):
-            filtered_message = (
-                filtered_message[:start_pos] + 
-                replacement + 
-                filtered_message[end_pos:]
-            )
+        results = [[] for _ in fields]
+        if not any(parts):
+            return results
+        for match in self._find_bad_words_in_text(FIELD_SEPARATOR.join(parts)):
+            index = bisect_right(offsets, match.start) - 1
+            match.start -= offsets[index]
+            match.end -= offsets[index]
+            results[index].append(match)
+        return results
+    
+    def filter_fields(self, fields: List[str]) -> List[Tuple[str, bool]]:
+        """filter_message results for each of several texts, from a single scan_fields pass"""
+        return [self.rewrite(field, matches) for field, matches in zip(fields, self.scan_fields(fields))]
+    
+    def rescan_edit(self, old_message: str, new_message: str, old_matches: List[Match]) -> List[Match]:
+        """
+        Matches in an edited message, given the matches found in its previous version
+        Only the changed region plus lexicon.max_span characters on either side is rescanned;
+        matches outside that window are reused, shifted past the edit
+        """
+        if not new_message or len(new_message) > MAX_MESSAGE_LENGTH:
+            return []
+        if not old_message or len(old_message) > MAX_MESSAGE_LENGTH:
+            return self._find_bad_words_in_text(new_message)
+        if new_message == old_message:
+            return old_matches
         
-        logger.debug(f"Filtered message: {len(bad_words_found)} bad words replaced")
-        return filtered_message, True
+        # Common prefix and suffix; the edit replaced old[prefix:old_end] with new[prefix:new_end]
+        shortest = min(len(old_message), len(new_message))
+        prefix = 0
+        while prefix < shortest and old_message[prefix] == new_message[prefix]:
+            prefix += 1
+        suffix = 0
+        while suffix < shortest - prefix and old_message[-1 - suffix] == new_message[-1 - suffix]:
+            suffix += 1
+        shift = len(new_message) - len(old_message)
+        
+        # Widen by the longest span a pattern can cover, and never cut a reused match in two
+        snapshot = self.snapshot
+        span = max(lexicon.max_span for _, lexicon in snapshot.partitions())
+        window_start = max(0, prefix - span)
+        window_stop = min(len(new_message), len(new_message) - suffix + span)
+        for match in old_matches:
+            if match.start < window_start < match.end:
+                window_start = match.start
+        if window_stop - window_start + span >= len(new_message):
+            # Short message: the window and its safe phrase lookback cover it anyway
+            return self._find_bad_words_in_text(new_message)
+        
+        matches = [match for match in old_matches if match.end <= window_start]
+        matches.extend(self.iter_matches(new_message, window_start, window_stop, snapshot))
+        rescanned_end = matches[-1].end if matches else 0
+        for match in old_matches:
+            start = match.start + shift
+            if start >= window_stop and start >= rescanned_end:
+                matches.append(Match(new_message[start:match.end + shift], match.replacement,
+                                     start, match.end + shift, match.word, match.edits))
+        return matches
     
     def test_word_detection(self, test_word: str) -> Dict[str, bool]:
         """
@@ -203,12 +635,24 @@ class WordFilter:
     
     def get_statistics(self) -> Dict[str, int]:
         """Get statistics about the word filter"""
-        total_patterns = sum(len(patterns) for patterns in self.patterns.values())
+        snapshot = self.snapshot
+        partition_stats = [lexicon.get_statistics() for _, lexicon in snapshot.partitions()]
+        if self.engine == 'compiled':
+            # One trie path per lexicon word
+            total_patterns = sum(stats['words'] for stats in partition_stats)
+        else:
+            total_patterns = sum(len(patterns) for patterns in self._snapshot_patterns(snapshot).values())
+        lexicon_stats = partition_stats[0]
         
         return {
-            'total_bad_words': len(self.bad_words),
+            'total_bad_words': len(snapshot.bad_words),
             'total_patterns': total_patterns,
-            'average_patterns_per_word': total_patterns // len(self.bad_words) if self.bad_words else 0,
+            'average_patterns_per_word': total_patterns // len(snapshot.bad_words) if snapshot.bad_words else 0,
             'obfuscation_chars': len(self.obfuscation_chars),
-            'separators': len(self.separators)
+            'separators': len(self.separators),
+            'safe_phrases': lexicon_stats['safe_phrases'],
+            'script_partitions': len(partition_stats),
+            'phonetic_keys': len(snapshot.phonetic_index) if snapshot.phonetic_index is not None else 0,
+            'trie_nodes': sum(stats['nodes'] for stats in partition_stats),
+            'lexicon_bytes': sum(stats['bytes'] for stats in partition_stats)
         }